@@ -0,0 +1,598 @@
+import itertools
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+from foodgram.models import Ingredient, Recipe, Tag
+from foodgram.utils.dataset import (
+    DATASET_EMAIL_DOMAIN,
+    DATASET_JOB_NAME,
+    DATASET_PREFIX,
+    check_dataset_allowed,
+    get_dataset_users,
+    seed_dataset
+)
+from jobs.models import Job
+from users.models import Subscription, UserFavorite, UserShoppingCart
+from utils.benchmark import (
+    HTTPBenchmarkClient,
+    InProcessBenchmarkClient,
+    find_regressions,
+    get_query_count,
+    run_concurrently,
+    summarize
+)
+
+METRICS = (
+    'p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps', 'queries_per_request'
+)
+SAFE_METHODS = ('GET', 'HEAD')
+BULK_RECIPES_LENGTH = 10
+MATCH_INGREDIENTS_LENGTH = 10
+
+
+class Scenario:
+    """
+    Benchmarked endpoint, the build function returns the path, the body
+    and the authorization header of the request made on the iteration
+    """
+
+    def __init__(self, name, method, build, total=None, on_response=None):
+        self.name = name
+        self.method = method
+        self.build = build
+        self.total = total
+        self.on_response = on_response
+
+
+def static(path, authorization=None, data=None):
+    """Build function making the same request on every iteration"""
+
+    return lambda index: (path, data, authorization)
+
+
+def get_free_pairs(user_ids, target_ids, taken, count, exclude_self=False):
+    """
+    Getting the user and target pairs not related yet,
+    spread over all the users
+    """
+
+    pairs = (
+        (user_id, target_id)
+        for target_id, user_id in itertools.product(target_ids, user_ids)
+        if (user_id, target_id) not in taken
+        and not (exclude_self and user_id == target_id)
+    )
+
+    return list(itertools.islice(pairs, count))
+
+
+class BenchmarkDataset:
+    """Ids and tokens of the synthetic dataset used by the scenarios"""
+
+    def __init__(self):
+        users = list(
+            get_dataset_users().filter(is_staff=False).values_list(
+                'id', 'email'
+            )
+        )
+
+        if not users:
+            raise CommandError(
+                'Синтетический набор данных не найден, '
+                'запустите команду без --skip-seed'
+            )
+
+        self.user_ids = [user_id for user_id, _ in users]
+        self.emails = dict(users)
+        self.admin_id = get_dataset_users().filter(
+            is_staff=True
+        ).values_list('id', flat=True).first()
+        self.tokens = dict(
+            Token.objects.filter(
+                user_id__in=[*self.user_ids, self.admin_id]
+            ).values_list('user_id', 'key')
+        )
+        self.recipe_ids = list(
+            Recipe.objects.filter(
+                author__in=get_dataset_users()
+            ).order_by('id').values_list('id', flat=True)
+        )
+        self.tag_ids = list(
+            Tag.objects.filter(
+                slug__startswith=f'{DATASET_PREFIX}-'
+            ).values_list('id', flat=True)
+        )
+        self.ingredient_ids = list(
+            Ingredient.objects.filter(
+                name__startswith=f'{DATASET_PREFIX} '
+            ).order_by('id').values_list('id', flat=True)
+        )
+        self.job_id = Job.objects.filter(
+            name=DATASET_JOB_NAME
+        ).values_list('id', flat=True).first()
+        self.favorites = self.get_pairs(UserFavorite, 'recipe_id')
+        self.shopping_carts = self.get_pairs(UserShoppingCart, 'recipe_id')
+        self.subscriptions = self.get_pairs(Subscription, 'author_id')
+
+    def get_pairs(self, model, target_field):
+        """Getting the related user and target pairs of the dataset"""
+
+        return set(
+            model.objects.filter(user_id__in=self.user_ids).values_list(
+                'user_id', target_field
+            )
+        )
+
+    def user_id(self, index):
+        """Getting the user making the request on the given iteration"""
+
+        return self.user_ids[index % len(self.user_ids)]
+
+    def authorization(self, index, user_id=None):
+        """Getting the authorization header of the user of the iteration"""
+
+        return f'Token {self.tokens[user_id or self.user_id(index)]}'
+
+    def item(self, values, index):
+        """Getting the value used on the given iteration"""
+
+        return values[index % len(values)]
+
+
+def get_toggle_scenarios(name, path, dataset, pairs):
+    """Scenarios adding the relations and deleting them afterwards"""
+
+    def build(index):
+        user_id, target_id = dataset.item(pairs, index)
+        return (
+            path.format(id=target_id),
+            None,
+            dataset.authorization(index, user_id)
+        )
+
+    return [
+        Scenario(f'{name}-add', 'POST', build, total=len(pairs)),
+        Scenario(f'{name}-delete', 'DELETE', build, total=len(pairs)),
+    ]
+
+
+def get_scenarios(dataset, requests):
+    """
+    Getting the scenarios of every endpoint of the api,
+    the relations and recipes created by a scenario
+    are deleted by the following ones.
+    The metrics are only benchmarked when METRICS_TOKEN is set
+    """
+
+    authorization = dataset.authorization
+    admin = authorization(0, dataset.admin_id)
+    created_recipes = []
+
+    def remember_recipe(index, status_code, body):
+        if status_code == 201:
+            created_recipes.append((json.loads(body)['id'], index))
+
+    def build_recipe_data(index):
+        return {
+            'name': f'{DATASET_PREFIX} {index}',
+            'text': f'{DATASET_PREFIX} {index}',
+            'cooking_time': 10 + index % 50,
+            'ingredients': [
+                {'id': dataset.item(dataset.ingredient_ids, index + step),
+                 'amount': 100}
+                for step in range(5)
+            ],
+            'tags': [dataset.item(dataset.tag_ids, index)],
+        }
+
+    def build_created_recipe(index, data=None):
+        created_id, created_index = dataset.item(created_recipes, index)
+        path = f'/api/recipes/{created_id}/'
+        return path, data, authorization(created_index)
+
+    def bulk_scenarios(name):
+        def build(index):
+            recipe_ids = [
+                dataset.item(dataset.recipe_ids, index * length + step)
+                for step in range(length)
+            ]
+            return (
+                f'/api/recipes/{name}/',
+                {'recipes': recipe_ids},
+                authorization(index)
+            )
+
+        length = BULK_RECIPES_LENGTH
+
+        return [
+            Scenario(f'recipes-bulk-{name}-add', 'POST', build),
+            Scenario(f'recipes-bulk-{name}-delete', 'DELETE', build),
+        ]
+
+    def build_match(index):
+        ingredient_ids = ','.join(
+            str(dataset.item(dataset.ingredient_ids, index + step))
+            for step in range(MATCH_INGREDIENTS_LENGTH)
+        )
+        path = f'/api/recipes/match/?ingredients={ingredient_ids}'
+        return path, None, None
+
+    def build_login(index):
+        return (
+            '/api/auth/token/login/',
+            {
+                'email': dataset.emails[dataset.user_id(index)],
+                'password': settings.DATASET_PASSWORD
+            },
+            None
+        )
+
+    def build_user(index):
+        return (
+            '/api/users/',
+            {
+                'email': f'{DATASET_PREFIX}-new-{index}'
+                         f'@{DATASET_EMAIL_DOMAIN}',
+                'username': f'{DATASET_PREFIX}-new-{index}',
+                'first_name': 'Бенчмарк',
+                'last_name': str(index),
+                'password': settings.DATASET_PASSWORD,
+            },
+            None
+        )
+
+    def build_metrics(index):
+        return '/api/metrics/', None, f'Bearer {settings.METRICS_TOKEN}'
+
+    recipe_pairs = get_free_pairs(
+        dataset.user_ids, dataset.recipe_ids,
+        dataset.favorites | dataset.shopping_carts, requests
+    )
+    author_pairs = get_free_pairs(
+        dataset.user_ids, dataset.user_ids, dataset.subscriptions, requests,
+        exclude_self=True
+    )
+
+    return [
+        Scenario(
+            'api-root', 'GET',
+            lambda index: ('/api/', None, authorization(index))
+        ),
+        Scenario('tags-list', 'GET', static('/api/tags/')),
+        Scenario(
+            'tags-detail', 'GET',
+            lambda index: (
+                f'/api/tags/{dataset.item(dataset.tag_ids, index)}/',
+                None, None
+            )
+        ),
+        Scenario(
+            'ingredients-list', 'GET',
+            static(f'/api/ingredients/?name={DATASET_PREFIX}')
+        ),
+        Scenario(
+            'ingredients-detail', 'GET',
+            lambda index: (
+                '/api/ingredients/'
+                f'{dataset.item(dataset.ingredient_ids, index)}/',
+                None, None
+            )
+        ),
+        Scenario(
+            'recipes-list', 'GET',
+            lambda index: ('/api/recipes/', None, authorization(index))
+        ),
+        Scenario(
+            'recipes-list-cursor', 'GET',
+            lambda index: (
+                '/api/recipes/?pagination=cursor', None, authorization(index)
+            )
+        ),
+        Scenario(
+            'recipes-detail', 'GET',
+            lambda index: (
+                f'/api/recipes/{dataset.item(dataset.recipe_ids, index)}/',
+                None, authorization(index)
+            )
+        ),
+        Scenario('recipes-match', 'GET', build_match),
+        Scenario(
+            'recipes-create', 'POST',
+            lambda index: (
+                '/api/recipes/', build_recipe_data(index), authorization(index)
+            ),
+            on_response=remember_recipe
+        ),
+        Scenario(
+            'recipes-partial-update', 'PATCH',
+            lambda index: build_created_recipe(
+                index, {'cooking_time': 20 + index % 50}
+            )
+        ),
+        Scenario('recipes-delete', 'DELETE', build_created_recipe),
+        *get_toggle_scenarios(
+            'recipes-favorite', '/api/recipes/{id}/favorite/',
+            dataset, recipe_pairs
+        ),
+        *get_toggle_scenarios(
+            'recipes-shopping-cart', '/api/recipes/{id}/shopping_cart/',
+            dataset, recipe_pairs
+        ),
+        *bulk_scenarios('favorite'),
+        *bulk_scenarios('shopping_cart'),
+        Scenario(
+            'recipes-download-shopping-cart', 'GET',
+            lambda index: (
+                '/api/recipes/download_shopping_cart/',
+                None, authorization(index)
+            )
+        ),
+        Scenario(
+            'users-list', 'GET',
+            lambda index: ('/api/users/', None, authorization(index))
+        ),
+        Scenario(
+            'users-detail', 'GET',
+            lambda index: (
+                f'/api/users/{dataset.user_id(index + 1)}/',
+                None, authorization(index)
+            )
+        ),
+        Scenario(
+            'users-me', 'GET',
+            lambda index: ('/api/users/me/', None, authorization(index))
+        ),
+        Scenario(
+            'users-subscriptions', 'GET',
+            lambda index: (
+                '/api/users/subscriptions/', None, authorization(index)
+            )
+        ),
+        *get_toggle_scenarios(
+            'users-subscribe', '/api/users/{id}/subscribe/',
+            dataset, author_pairs
+        ),
+        Scenario('users-create', 'POST', build_user),
+        Scenario(
+            'users-set-password', 'POST',
+            lambda index: (
+                '/api/users/set_password/',
+                {
+                    'new_password': settings.DATASET_PASSWORD,
+                    'current_password': settings.DATASET_PASSWORD
+                },
+                authorization(index)
+            )
+        ),
+        Scenario('jobs-list', 'GET', static('/api/jobs/', admin)),
+        Scenario(
+            'jobs-detail', 'GET',
+            static(f'/api/jobs/{dataset.job_id}/', admin)
+        ),
+        Scenario(
+            'jobs-stats', 'GET', static('/api/jobs/stats/', admin)
+        ),
+        *(
+            [Scenario('metrics', 'GET', build_metrics)]
+            if settings.METRICS_TOKEN else []
+        ),
+        Scenario('auth-token-login', 'POST', build_login),
+        Scenario(
+            'recipes-shopping-cart-clear', 'DELETE',
+            lambda index: (
+                '/api/recipes/shopping_cart/clear/',
+                None, authorization(index)
+            ),
+            total=len(dataset.user_ids)
+        ),
+        Scenario(
+            'auth-token-logout', 'POST',
+            lambda index: (
+                '/api/auth/token/logout/', None, authorization(index)
+            ),
+            total=len(dataset.user_ids)
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Load benchmark of every endpoint of the api on the synthetic
+    dataset, in the current process or against a running server.
+    The results can be compared with a baseline, the command fails
+    if the chosen endpoints got slower than the threshold allows
+    """
+
+    help = 'Benchmarks every endpoint of the api on a synthetic dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            help='Url of a running server, the application is called '
+                 'in the current process if not set'
+        )
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--output', help='File to save the results to')
+        parser.add_argument(
+            '--skip-seed', action='store_true',
+            help='Use the dataset seeded by the previous run'
+        )
+        parser.add_argument(
+            '--allow-production', action='store_true',
+            help='Run the benchmark even if DEBUG is off'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--recipes', type=int, default=1000)
+        parser.add_argument('--ingredients', type=int, default=500)
+        parser.add_argument('--favorites', type=int, default=20)
+        parser.add_argument('--shopping-carts', type=int, default=5)
+        parser.add_argument('--subscriptions', type=int, default=5)
+        parser.add_argument(
+            '--compare',
+            help='File with the baseline results to compare with'
+        )
+        parser.add_argument(
+            '--input',
+            help='File with the results to compare instead of running'
+        )
+        parser.add_argument(
+            '--endpoint', action='append', dest='endpoints',
+            help='Endpoint checked by the comparison, all by default'
+        )
+        parser.add_argument('--metric', choices=METRICS, default='p95_ms')
+        parser.add_argument(
+            '--threshold', type=float, default=10,
+            help='Allowed regression in percent'
+        )
+
+    def seed(self, options):
+        """Seeding the synthetic dataset from the options"""
+
+        return seed_dataset(
+            users=options['users'],
+            recipes=options['recipes'],
+            ingredients=options['ingredients'],
+            favorites=options['favorites'],
+            shopping_carts=options['shopping_carts'],
+            subscriptions=options['subscriptions'],
+            seed=options['seed']
+        )
+
+    def run_scenario(self, client, scenario, requests, options):
+        """Running the scenario concurrently, returns its summary"""
+
+        counter = itertools.count()
+        query_counts = []
+
+        def call(index=None):
+            if index is None:
+                index = next(counter)
+
+            path, data, authorization = scenario.build(index)
+            headers = {'Accept': 'application/json'}
+
+            if authorization:
+                headers['Authorization'] = authorization
+
+            status_code, response_headers, body = client.request(
+                scenario.method, path, data, headers
+            )
+            query_count = get_query_count(response_headers)
+
+            if query_count is not None:
+                query_counts.append(query_count)
+
+            if scenario.on_response is not None:
+                scenario.on_response(index, status_code, body)
+
+            return status_code
+
+        if scenario.method in SAFE_METHODS:
+            for index in range(options['warmup']):
+                call(index)
+
+            query_counts.clear()
+
+        summary = summarize(*run_concurrently(
+            call, requests, options['concurrency']
+        ))
+        summary['queries_per_request'] = (
+            round(sum(query_counts) / len(query_counts), 2)
+            if query_counts else None
+        )
+        summary['method'] = scenario.method
+
+        return summary
+
+    def run(self, options):
+        """Running every scenario, returns the results"""
+
+        check_dataset_allowed(options['allow_production'])
+        dataset_info = None if options['skip_seed'] else self.seed(options)
+        dataset = BenchmarkDataset()
+        client = (
+            HTTPBenchmarkClient(options['url']) if options['url']
+            else InProcessBenchmarkClient()
+        )
+        endpoints = {}
+
+        for scenario in get_scenarios(dataset, options['requests']):
+            requests = min(
+                options['requests'], scenario.total or options['requests']
+            )
+            endpoints[scenario.name] = self.run_scenario(
+                client, scenario, requests, options
+            )
+            self.stderr.write(
+                f'{scenario.name}: '
+                f'p95 {endpoints[scenario.name]["p95_ms"]} ms'
+            )
+
+        return {
+            'target': options['url'] or 'in-process',
+            'dataset': dataset_info,
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'endpoints': endpoints,
+        }
+
+    def load(self, path):
+        """Loading the results saved by a previous run"""
+
+        try:
+            with open(path, encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError) as error:
+            raise CommandError(f'Не удалось прочитать {path}: {error}')
+
+    def handle(self, *args, **options):
+        if options['input']:
+            results = self.load(options['input'])
+        else:
+            results = self.run(options)
+
+        output = json.dumps(results, indent=4, ensure_ascii=False)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output)
+
+        self.stdout.write(output)
+
+        if not options['compare']:
+            return
+
+        baseline = self.load(options['compare'])['endpoints']
+        unknown = set(options['endpoints'] or ()) - set(baseline)
+
+        if unknown:
+            raise CommandError(
+                f'Эндпоинты не найдены в базовых результатах: '
+                f'{", ".join(sorted(unknown))}'
+            )
+
+        regressions = find_regressions(
+            baseline,
+            results['endpoints'],
+            options['metric'],
+            options['threshold'],
+            options['endpoints']
+        )
+
+        if regressions:
+            raise CommandError(
+                f'Регрессия {options["metric"]} больше '
+                f'{options["threshold"]}%: '
+                + json.dumps(regressions, ensure_ascii=False)
+            )
+
+        self.stderr.write(
+            f'Регрессий {options["metric"]} больше '
+            f'{options["threshold"]}% не найдено'
+        )
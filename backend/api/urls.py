@@ -4,13 +4,18 @@ from rest_framework import routers
 
 from foodgram.views import (
     IngredientViewSet,
+    RecipeMatchView,
     RecipeViewSet,
     TagViewSet
 )
+from jobs.views import JobViewSet
 from users.views import (
     AddDeleteRecipesShoppingCartView,
     AddDeleteUserSubscribeView,
+    BulkFavoriteView,
+    BulkShoppingCartView,
     ChangeUserPasswordView,
+    ClearShoppingCartView,
     CreateUserTokenView,
     DeleteUserTokenView,
     DownloadShoppingCartView,
@@ -19,6 +24,18 @@ from users.views import (
     UserViewSet,
     SubscriptionViewSet,
 )
+from utils.async_views import async_read_view
+from utils.metrics import metrics_view
+
+LIST_ACTIONS = {'get': 'list', 'post': 'create'}
+DETAIL_ACTIONS = {
+    'get': 'retrieve',
+    'put': 'update',
+    'patch': 'partial_update',
+    'delete': 'destroy'
+}
+READ_ONLY_LIST_ACTIONS = {'get': 'list'}
+READ_ONLY_DETAIL_ACTIONS = {'get': 'retrieve'}
 
 router = routers.DefaultRouter()
 
@@ -31,15 +48,72 @@ router.register(
     basename='subscriptions'
 )
 router.register('users', UserViewSet, basename='users')
+router.register('jobs', JobViewSet, basename='jobs')
 
 urlpatterns = [
 
+    path('tags/', include([
+        path(
+            '',
+            async_read_view(TagViewSet, READ_ONLY_LIST_ACTIONS),
+            name='tags-list'
+        ),
+        path(
+            '<int:pk>/',
+            async_read_view(TagViewSet, READ_ONLY_DETAIL_ACTIONS),
+            name='tags-detail'
+        ),
+    ])),
+
+    path('ingredients/', include([
+        path(
+            '',
+            async_read_view(IngredientViewSet, READ_ONLY_LIST_ACTIONS),
+            name='ingredients-list'
+        ),
+        path(
+            '<int:pk>/',
+            async_read_view(IngredientViewSet, READ_ONLY_DETAIL_ACTIONS),
+            name='ingredients-detail'
+        ),
+    ])),
+
     path('recipes/', include([
+        path(
+            '',
+            async_read_view(RecipeViewSet, LIST_ACTIONS),
+            name='recipes-list'
+        ),
+        path(
+            '<int:pk>/',
+            async_read_view(RecipeViewSet, DETAIL_ACTIONS),
+            name='recipes-detail'
+        ),
         path(
             'download_shopping_cart/',
             DownloadShoppingCartView.as_view(),
             name='download_shopping_cart'
         ),
+        path(
+            'favorite/',
+            BulkFavoriteView.as_view(),
+            name='recipes_bulk_favorite'
+        ),
+        path(
+            'shopping_cart/',
+            BulkShoppingCartView.as_view(),
+            name='bulk_shopping_cart'
+        ),
+        path(
+            'shopping_cart/clear/',
+            ClearShoppingCartView.as_view(),
+            name='clear_shopping_cart'
+        ),
+        path(
+            'match/',
+            RecipeMatchView.as_view(),
+            name='recipes_match'
+        ),
         path(
             '<int:id>/favorite/',
             FavoriteView.as_view(),
@@ -73,14 +147,25 @@ urlpatterns = [
         ),
         path(
             'me/',
-            UserMeAPIView.as_view(),
+            async_read_view(UserMeAPIView),
             name='user_me'
         ),
+        path(
+            'subscriptions/',
+            async_read_view(SubscriptionViewSet, READ_ONLY_LIST_ACTIONS),
+            name='subscriptions-list'
+        ),
+        path(
+            '<int:pk>/',
+            async_read_view(UserViewSet, DETAIL_ACTIONS),
+            name='users-detail'
+        ),
         path(
             '<int:id>/subscribe/',
             AddDeleteUserSubscribeView.as_view(),
             name='create_subscribe'
         ),
     ])),
+    path('metrics/', metrics_view, name='metrics'),
     path('', include(router.urls), name='api-root'),
 ]
@@ -27,10 +27,12 @@ INSTALLED_APPS = [
     'djoser',
     'api',
     'users',
-    'foodgram'
+    'foodgram',
+    'jobs'
 ]
 
 MIDDLEWARE = [
+    'utils.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -74,6 +76,23 @@ DATABASES = {
     }
 }
 
+CACHE_LOCATION = os.getenv('CACHE_LOCATION', '')
+
+# The version tokens and cached responses must be shared by all the
+# workers, the job worker and the management commands, so Redis is used
+# whenever its location is given and the local memory cache otherwise
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.redis.RedisCache'
+            if CACHE_LOCATION.startswith(('redis://', 'rediss://'))
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': CACHE_LOCATION,
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -94,7 +113,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS':
     'rest_framework.pagination.LimitOffsetPagination',
@@ -123,3 +142,34 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 CORS_ALLOW_ALL_ORIGINS = True
 
 CSRF_TRUSTED_ORIGINS = ['https://*.foodgramassistant.ddns.net//', 'http://*.foodgramassistant.ddns.net/']
+
+SHOPPING_CART_CACHE_TIMEOUT = int(
+    os.getenv('SHOPPING_CART_CACHE_TIMEOUT', 60 * 60 * 24)
+)
+
+SHOPPING_CART_PDF_FONT = os.getenv(
+    'SHOPPING_CART_PDF_FONT',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+)
+
+RECIPE_FRAGMENT_CACHE_TIMEOUT = int(
+    os.getenv('RECIPE_FRAGMENT_CACHE_TIMEOUT', 60 * 60)
+)
+
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+
+TOKEN_CACHE_TIMEOUT = int(os.getenv('TOKEN_CACHE_TIMEOUT', 60))
+
+TOKEN_CACHE_ALIAS = os.getenv('TOKEN_CACHE_ALIAS', 'default')
+
+TOKEN_SHARED_CACHE_TIMEOUT = int(
+    os.getenv('TOKEN_SHARED_CACHE_TIMEOUT', 60 * 10)
+)
+
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', 4))
+
+JOBS_STALE_TIMEOUT = int(os.getenv('JOBS_STALE_TIMEOUT', 60 * 30))
+
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+DATASET_PASSWORD = os.getenv('DATASET_PASSWORD', '')
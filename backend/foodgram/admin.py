@@ -70,7 +70,9 @@ class RecipeAdmin(admin.ModelAdmin):
         'image',
         'text',
         'cooking_time',
-        'pub_date'
+        'pub_date',
+        'updated_at',
+        'favorites_count'
     )
 
     def display_ingredient(self, obj):
@@ -95,7 +97,10 @@ class RecipeAdmin(admin.ModelAdmin):
     display_tag.short_description = 'Теги'
     list_display_links = ('name',)
     search_fields = ('name', 'author', 'pub_date')
-    list_filter = ('name', 'pub_date')
+    list_filter = ('name', 'pub_date', 'created_at')
+    readonly_fields = (
+        'created_at', 'updated_at', 'favorites_count', 'shopping_carts_count'
+    )
     empty_value_display = 'пусто'
     inlines = [RecipeIngredientInline, RecipeTagInline]
 
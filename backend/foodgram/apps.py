@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class FoodgramConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'foodgram'
+
+    def ready(self):
+        """Connecting the signal receivers and the system checks"""
+
+        from django.db.models.signals import post_migrate
+
+        from foodgram import checks, signals  # noqa: F401
+        from foodgram.utils.search import setup_search_index
+
+        post_migrate.connect(setup_search_index, sender=self)
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Checking that the default cache is shared by the processes:
+    the data versions bumped by one worker or management command
+    must be seen by all the others
+    """
+
+    if settings.CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHE_BACKENDS:
+        return [Warning(
+            'Кеш по умолчанию не общий для процессов, '
+            'версии данных не будут видны другим воркерам',
+            hint='Укажите CACHE_LOCATION=redis://host:6379/0',
+            id='foodgram.W001'
+        )]
+
+    return []
@@ -1,12 +1,16 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter
 
-from foodgram.models import Ingredient, Recipe
+from foodgram.models import Recipe, RecipeTag
+from foodgram.utils.search import search_recipes
 
 
 class RecipeFilterSet(filters.FilterSet):
     """
     Custom filterset for filtering by fields:
-    author, tags, is_in_shopping_cart, is_favorited.
+    author, tags (any or all of them), is_in_shopping_cart, is_favorited
+    and the full-text search by name, ingredients and description.
     """
 
     is_favorited = filters.NumberFilter(
@@ -17,19 +21,29 @@ class RecipeFilterSet(filters.FilterSet):
         field_name='user_shopping_cart_recipe__user',
         method='filter_is_in_shopping_cart'
     )
-    tags = filters.CharFilter(field_name='tags__slug')
+    tags = filters.CharFilter(method='filter_tags')
+    tags_mode = filters.ChoiceFilter(
+        choices=(('any', 'any'), ('all', 'all')),
+        method='filter_tags_mode'
+    )
     author = filters.NumberFilter(field_name='author__id')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         """Fields settings."""
 
         model = Recipe
-        fields = ('author', 'tags', 'is_in_shopping_cart', 'is_favorited')
+        fields = (
+            'author', 'tags', 'tags_mode',
+            'is_in_shopping_cart', 'is_favorited', 'search'
+        )
 
     def filter_is_favorited(self, queryset, name, value):
         """Method for filtering by an additional field."""
 
         if value:
+            if self.request.user.is_anonymous:
+                return queryset.none()
             return queryset.filter(
                 user_favorites_recipe__user=self.request.user
             )
@@ -39,24 +53,77 @@ class RecipeFilterSet(filters.FilterSet):
         """Method for filtering by an additional field."""
 
         if value:
+            if self.request.user.is_anonymous:
+                return queryset.none()
             return queryset.filter(
                 user_shopping_cart_recipe__user=self.request.user
             )
         return queryset
 
+    def filter_tags(self, queryset, name, value):
+        """
+        Method for filtering by several tag slugs:
+        recipes with any of the tags, or with all of them
+        if tags_mode=all is passed. Tags are checked by EXISTS
+        subqueries, so recipes are not duplicated by the join.
+        """
+
+        slugs = set(self.data.getlist(name))
+
+        if self.data.get('tags_mode') == 'all':
+            for slug in slugs:
+                queryset = queryset.filter(Exists(
+                    RecipeTag.objects.filter(
+                        recipe=OuterRef('pk'), tag__slug=slug
+                    )
+                ))
+            return queryset
+
+        return queryset.filter(Exists(
+            RecipeTag.objects.filter(
+                recipe=OuterRef('pk'), tag__slug__in=slugs
+            )
+        ))
 
-class IngredientFilterSet(filters.FilterSet):
-    """Custom filterset for filtering by name."""
+    def filter_tags_mode(self, queryset, name, value):
+        """Mode of the tags filter, applied by the filter_tags."""
 
-    name = filters.CharFilter(field_name='name', method='filter_name')
+        return queryset
 
-    def filter_name(self, queryset, name, value):
-        """Method for filtering by partial occurrence."""
+    def filter_search(self, queryset, name, value):
+        """Method for the ranked full-text search."""
 
-        return queryset.filter(name__istartswith=value)
+        return search_recipes(queryset, value)
 
-    class Meta:
-        """Fields settings."""
 
-        model = Ingredient
-        fields = ('name', )
+class RecipeOrderingFilter(OrderingFilter):
+    """
+    Ordering filter that sorts the search results by rank
+    unless another ordering is requested.
+    Equal values are ordered by the id, newest first,
+    so pages never share or skip recipes.
+    """
+
+    tie_breaker = '-id'
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Method for getting the ordering by rank for the search.
+        Only the queryset filtered by the search has the rank,
+        a blank search query is not applied.
+        """
+
+        if (
+            not request.query_params.get(self.ordering_param)
+            and 'rank' in queryset.query.annotations
+        ):
+            return ('-rank', self.tie_breaker)
+
+        ordering = super().get_ordering(request, queryset, view)
+
+        if not ordering or any(
+            field.lstrip('-') == 'id' for field in ordering
+        ):
+            return ordering
+
+        return (*ordering, self.tie_breaker)
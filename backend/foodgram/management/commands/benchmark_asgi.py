@@ -0,0 +1,70 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from foodgram.models import Recipe
+from utils.benchmark import run_concurrently, send_request, summarize
+
+
+class Command(BaseCommand):
+    """
+    Comparing the latency and throughput of the read endpoints
+    served by the WSGI and the ASGI server side by side
+    """
+
+    help = 'Benchmarks the read endpoints under WSGI and ASGI'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://localhost:8001')
+        parser.add_argument('--asgi-url', default='http://localhost:8000')
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument(
+            '--token',
+            help='Token of a user for the endpoints requiring authentication'
+        )
+
+    def get_paths(self, options):
+        """Getting the read endpoints to benchmark"""
+
+        recipe = Recipe.objects.order_by('-id').only('id', 'author').first()
+        paths = [
+            '/api/recipes/', '/api/tags/', '/api/ingredients/?name=%D0%B0'
+        ]
+
+        if recipe is not None:
+            paths.extend((
+                f'/api/recipes/{recipe.id}/',
+                f'/api/users/{recipe.author_id}/',
+            ))
+
+        if options['token']:
+            paths.extend(('/api/users/me/', '/api/users/subscriptions/'))
+
+        return paths
+
+    def handle(self, *args, **options):
+        headers = {'Accept': 'application/json'}
+
+        if options['token']:
+            headers['Authorization'] = f'Token {options["token"]}'
+
+        results = {}
+
+        for path in self.get_paths(options):
+            results[path] = {}
+
+            for server in ('wsgi', 'asgi'):
+                url = options[f'{server}_url'].rstrip('/') + path
+
+                def get():
+                    status_code, _ = send_request(url, headers=headers)
+                    return status_code
+
+                results[path][server] = summarize(*run_concurrently(
+                    get, options['requests'], options['concurrency']
+                ))
+
+        self.stdout.write(
+            json.dumps(results, indent=4, ensure_ascii=False)
+        )
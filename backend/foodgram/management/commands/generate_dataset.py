@@ -0,0 +1,89 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from foodgram.utils.dataset import (
+    DEFAULT_ZIPF_EXPONENT,
+    check_dataset_allowed,
+    clear_dataset,
+    seed_dataset
+)
+
+
+class Command(BaseCommand):
+    """
+    Generating the synthetic dataset of the production size:
+    users, recipes with ingredients and tags, favorites,
+    shopping carts and subscriptions. The same seed
+    always gives the same dataset. The users get the DATASET_PASSWORD,
+    without DEBUG the command needs --allow-production
+    """
+
+    help = 'Generates a large synthetic dataset for scale testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--recipes', type=int, default=1000000)
+        parser.add_argument('--ingredients', type=int, default=2000)
+        parser.add_argument('--tags', type=int, default=10)
+        parser.add_argument(
+            '--favorites', type=int, default=20,
+            help='Mean number of the favorite recipes of a user'
+        )
+        parser.add_argument(
+            '--shopping-carts', type=int, default=5,
+            help='Mean number of the recipes in the shopping cart of a user'
+        )
+        parser.add_argument(
+            '--subscriptions', type=int, default=10,
+            help='Mean number of the subscriptions of a user'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--zipf', type=float, default=DEFAULT_ZIPF_EXPONENT,
+            help='Exponent of the Zipf distributions'
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Only delete the previously generated dataset'
+        )
+        parser.add_argument(
+            '--allow-production', action='store_true',
+            help='Generate the dataset even if DEBUG is off'
+        )
+
+    def handle(self, *args, **options):
+        started_at = time.perf_counter()
+
+        if options['clear']:
+            clear_dataset()
+            self.stdout.write('Синтетический набор данных удален')
+            return
+
+        check_dataset_allowed(options['allow_production'])
+
+        if options['users'] < 1 or options['recipes'] < 1:
+            raise CommandError(
+                'Нужен хотя бы один пользователь и один рецепт'
+            )
+
+        if options['ingredients'] < 1 or options['tags'] < 1:
+            raise CommandError('Нужен хотя бы один ингредиент и один тег')
+
+        summary = seed_dataset(
+            users=options['users'],
+            recipes=options['recipes'],
+            ingredients=options['ingredients'],
+            tags=options['tags'],
+            favorites=options['favorites'],
+            shopping_carts=options['shopping_carts'],
+            subscriptions=options['subscriptions'],
+            seed=options['seed'],
+            zipf_exponent=options['zipf']
+        )
+        summary['elapsed_seconds'] = round(
+            time.perf_counter() - started_at, 2
+        )
+
+        self.stdout.write(json.dumps(summary, indent=4))
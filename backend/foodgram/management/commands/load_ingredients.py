@@ -0,0 +1,142 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from foodgram.models import Ingredient
+from foodgram.utils.versions import INGREDIENTS_VERSION_NAME, bump_version
+
+DATA_DIR = Path(settings.BASE_DIR).parent / 'data'
+DEFAULT_FILES = (DATA_DIR / 'ingredients.csv', DATA_DIR / 'ingredients.json')
+CSV_HEADER = ['name', 'measurement_unit']
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+def read_csv(file):
+    """Reading ingredients from a csv file row by row"""
+
+    for row in csv.reader(file):
+        if row and row != CSV_HEADER:
+            yield row[0], row[1]
+
+
+def read_json(file):
+    """
+    Reading ingredients from a json array object by object,
+    the file is read in chunks instead of being loaded at once
+    """
+
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+
+    for chunk in iter(lambda: file.read(JSON_CHUNK_SIZE), ''):
+        buffer = buffer[position:] + chunk
+        position = 0
+
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+
+            if not started and buffer[position:position + 1] == '[':
+                started = True
+                position += 1
+                continue
+
+            if buffer[position:position + 1] in ('', ']'):
+                break
+
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break
+
+            yield item['name'], item['measurement_unit']
+
+    if buffer[position:].strip() not in ('', ']'):
+        raise CommandError('Некорректный json файл')
+
+
+READERS = {
+    '.csv': read_csv,
+    '.json': read_json,
+}
+
+
+class Command(BaseCommand):
+    """
+    Loading ingredients from csv and json files in batches.
+    Existing ingredients are skipped, so the command can be rerun.
+    By default the files of the data directory next to the backend
+    are loaded, it is mounted to /data in the containers
+    """
+
+    help = 'Loads ingredients from csv and json files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files',
+            nargs='*',
+            type=Path,
+            default=DEFAULT_FILES,
+            help='csv or json files with ingredients'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='number of ingredients inserted by one query'
+        )
+
+    def load_file(self, path, batch_size):
+        """Inserting the ingredients of the file batch by batch"""
+
+        reader = READERS.get(path.suffix.lower())
+
+        if reader is None:
+            raise CommandError(f'Неподдерживаемый формат файла: {path}')
+
+        read = 0
+
+        with open(path, encoding='utf-8') as file:
+            rows = (
+                Ingredient(name=name.strip(), measurement_unit=unit.strip())
+                for name, unit in reader(file)
+                if name.strip()
+            )
+
+            while batch := list(islice(rows, batch_size)):
+                Ingredient.objects.bulk_create(batch, ignore_conflicts=True)
+                read += len(batch)
+
+        return read
+
+    def handle(self, *args, **options):
+        count_before = Ingredient.objects.count()
+        start = time.monotonic()
+        read = 0
+        missing = [path for path in options['files'] if not path.is_file()]
+
+        if missing:
+            raise CommandError(
+                'Файлы не найдены: {}'.format(
+                    ', '.join(str(path) for path in missing)
+                )
+            )
+
+        for path in options['files']:
+            read += self.load_file(path, options['batch_size'])
+
+        elapsed = time.monotonic() - start
+        created = Ingredient.objects.count() - count_before
+        bump_version(INGREDIENTS_VERSION_NAME)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Прочитано {read}, добавлено {created} ингредиентов '
+            f'за {elapsed:.2f} с ({read / max(elapsed, 1e-6):.0f} в секунду)'
+        ))
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from foodgram.models import Recipe
+from users.models import Subscription, UserFavorite, UserShoppingCart
+
+User = get_user_model()
+
+
+def count_subquery(queryset, field):
+    """Subquery counting the rows related to the outer object"""
+
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef('pk')}).order_by().values(
+                field
+            ).annotate(count=Count('pk')).values('count')
+        ),
+        0
+    )
+
+
+COUNTERS = (
+    (
+        Recipe,
+        'favorites_count',
+        count_subquery(UserFavorite.objects, 'recipe')
+    ),
+    (
+        Recipe,
+        'shopping_carts_count',
+        count_subquery(UserShoppingCart.objects, 'recipe')
+    ),
+    (User, 'recipes_count', count_subquery(Recipe.objects, 'author')),
+    (
+        User,
+        'subscribers_count',
+        count_subquery(Subscription.objects, 'author')
+    ),
+)
+
+
+class Command(BaseCommand):
+    """
+    Recomputing the denormalized counters of recipes and users
+    and repairing the ones that went out of sync
+    """
+
+    help = 'Recomputes the recipe and user counters and repairs them'
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        for model, field, actual in COUNTERS:
+            broken = model.objects.annotate(actual=actual).exclude(
+                **{field: F('actual')}
+            ).values('pk')
+            repaired = model.objects.filter(pk__in=Subquery(broken)).update(
+                **{field: actual}
+            )
+            self.stdout.write(
+                f'{model._meta.model_name}.{field}: repaired {repaired}'
+            )
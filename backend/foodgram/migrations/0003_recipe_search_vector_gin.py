@@ -0,0 +1,82 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce
+
+SEARCH_CONFIG = 'russian'
+INDEX_NAME = 'recipe_search_vector_gin'
+# Created by the post_migrate hook before the index was declared
+OLD_INDEX_NAME = 'foodgram_recipe_search_vector_gin'
+
+
+def get_index():
+    return GinIndex(fields=['search_vector'], name=INDEX_NAME)
+
+
+def add_search_index(apps, schema_editor):
+    """
+    Creating the GIN index and filling the search vectors
+    of the recipes that were not indexed yet, the fts5 fallback
+    used on SQLite does not need them
+    """
+
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    Recipe = apps.get_model('foodgram', 'Recipe')
+    RecipeIngredient = apps.get_model('foodgram', 'RecipeIngredient')
+    schema_editor.execute(
+        f'ALTER INDEX IF EXISTS {OLD_INDEX_NAME} RENAME TO {INDEX_NAME}'
+    )
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} '
+        f'ON {Recipe._meta.db_table} USING gin (search_vector)'
+    )
+
+    ingredient_names = Subquery(
+        RecipeIngredient.objects.filter(
+            recipe=OuterRef('pk')
+        ).order_by().values('recipe').annotate(
+            names=StringAgg('ingredient__name', ' ')
+        ).values('names')
+    )
+    Recipe.objects.filter(search_vector__isnull=True).update(
+        search_vector=(
+            SearchVector('name', weight='A', config=SEARCH_CONFIG)
+            + SearchVector(
+                Coalesce(
+                    ingredient_names, Value(''), output_field=TextField()
+                ),
+                weight='B',
+                config=SEARCH_CONFIG
+            )
+            + SearchVector('text', weight='C', config=SEARCH_CONFIG)
+        )
+    )
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodgram', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='recipe', index=get_index()),
+            ],
+            database_operations=[
+                migrations.RunPython(add_search_index, remove_search_index),
+            ],
+        ),
+    ]
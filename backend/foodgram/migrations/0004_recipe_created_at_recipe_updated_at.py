@@ -0,0 +1,40 @@
+# Generated by Django 4.2.4 on 2026-10-18 04:30
+
+from django.db import migrations, models
+from django.db.models.functions import Cast
+import django.utils.timezone
+
+
+def backfill_created_at(apps, schema_editor):
+    """
+    Filling the creation time of the existing recipes
+    from their publication date instead of the migration time
+    """
+
+    Recipe = apps.get_model('foodgram', 'Recipe')
+    Recipe.objects.update(
+        created_at=Cast('pub_date', output_field=models.DateTimeField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodgram', '0003_recipe_search_vector_gin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='Дата создания'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Дата изменения'),
+        ),
+        migrations.RunPython(
+            backfill_created_at, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, field):
+    """Subquery counting the rows related to the outer object"""
+
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field: OuterRef('pk')}).order_by().values(
+                field
+            ).annotate(count=Count('pk')).values('count')
+        ),
+        0
+    )
+
+
+def backfill_counters(apps, schema_editor):
+    """
+    Filling the denormalized counters of the existing recipes
+    and users, so decrementing them never goes below zero
+    """
+
+    Recipe = apps.get_model('foodgram', 'Recipe')
+    User = apps.get_model('users', 'User')
+    UserFavorite = apps.get_model('users', 'UserFavorite')
+    UserShoppingCart = apps.get_model('users', 'UserShoppingCart')
+    Subscription = apps.get_model('users', 'Subscription')
+
+    Recipe.objects.update(
+        favorites_count=count_subquery(UserFavorite, 'recipe'),
+        shopping_carts_count=count_subquery(UserShoppingCart, 'recipe')
+    )
+    User.objects.update(
+        recipes_count=count_subquery(Recipe, 'author'),
+        subscribers_count=count_subquery(Subscription, 'author')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodgram', '0004_recipe_created_at_recipe_updated_at'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_counters, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,459 @@
+import gzip
+import hashlib
+import re
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from foodgram.utils.recipe_cache import (
+    build_absolute_image_urls,
+    get_fragment_prefix,
+    get_fragments,
+    get_viewer_flags,
+    set_fragments
+)
+from foodgram.utils.versions import (
+    aget_version,
+    get_version,
+    get_version_timestamp
+)
+from utils.async_views import apaginate_queryset, render_json
+
+ACCEPTS_GZIP_RE = re.compile(r'\bgzip\b')
+
+
+def add_validators(response, etag, last_modified):
+    """
+    Adding the ETag and Last-Modified to the response,
+    the Last-Modified is omitted when it is None
+    """
+
+    response['ETag'] = etag
+
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+class AsyncReadMixin:
+    """
+    Mixin for viewsets served by async_read_view:
+    list and retrieve are fetched with the async ORM.
+    The queryset must load everything the serializer needs,
+    so serialization makes no queries
+    """
+
+    async def alist(self, request, *args, **kwargs):
+        """Method for getting the list with the async ORM"""
+
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.paginator
+
+        if paginator is None:
+            objects = [obj async for obj in queryset]
+            return render_json(self.get_serializer(objects, many=True).data)
+
+        page = await apaginate_queryset(paginator, queryset, request, self)
+
+        return render_json(
+            paginator.get_paginated_response(
+                self.get_serializer(page, many=True).data
+            ).data
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """Method for getting the object with the async ORM"""
+
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = await queryset.filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).afirst()
+
+        if obj is None:
+            raise Http404
+
+        self.check_object_permissions(request, obj)
+
+        return render_json(self.get_serializer(obj).data)
+
+
+class VersionedCacheMixin:
+    """
+    Mixin for viewsets with nearly static reference data.
+    Responses carry ETag and Last-Modified derived from the data version
+    and conditional requests are answered with 304.
+    The unfiltered json list is kept serialized and compressed
+    in the memory of the worker until the version changes
+    """
+
+    version_name = None
+    _cached_list = None
+
+    def get_list_data(self, request):
+        """Method for getting the list data"""
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.get_serializer(queryset, many=True).data
+
+    async def aget_list_data(self, request):
+        """Method for getting the list data with the async ORM"""
+
+        queryset = self.filter_queryset(self.get_queryset())
+        objects = [obj async for obj in queryset]
+        return self.get_serializer(objects, many=True).data
+
+    def set_cached_list(self, version, data):
+        """Method for keeping the serialized and compressed list"""
+
+        content = JSONRenderer().render(data)
+        cached_list = (version, content, gzip.compress(content, mtime=0))
+        type(self)._cached_list = cached_list
+
+        return cached_list[1:]
+
+    def get_cached_list(self, request, version):
+        """Method for getting the serialized and compressed list"""
+
+        cached_list = type(self)._cached_list
+
+        if cached_list is None or cached_list[0] != version:
+            return self.set_cached_list(version, self.get_list_data(request))
+
+        return cached_list[1:]
+
+    async def aget_cached_list(self, request, version):
+        """Method for getting the cached list with the async ORM"""
+
+        cached_list = type(self)._cached_list
+
+        if cached_list is None or cached_list[0] != version:
+            return self.set_cached_list(
+                version, await self.aget_list_data(request)
+            )
+
+        return cached_list[1:]
+
+    def get_cached_list_response(self, request, cached_list):
+        """Method for sending the cached list, compressed if accepted"""
+
+        content, compressed_content = cached_list
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+        if ACCEPTS_GZIP_RE.search(accept_encoding):
+            response = HttpResponse(
+                compressed_content, content_type='application/json'
+            )
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(content, content_type='application/json')
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    def get_validators(self, request, version):
+        """Method for getting the ETag and Last-Modified of the version"""
+
+        etag = 'W/"{}"'.format(
+            hashlib.md5(
+                f'{version}:{request.get_full_path()}'.encode()
+            ).hexdigest()
+        )
+
+        return etag, get_version_timestamp(version)
+
+    def conditional_response(self, request, get_response):
+        """
+        Method for answering conditional requests with 304
+        and adding the validators to the response
+        """
+
+        version = get_version(self.version_name)
+        etag, last_modified = self.get_validators(request, version)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+
+        if response is None:
+            response = get_response(version)
+
+        return add_validators(response, etag, last_modified)
+
+    async def aconditional_response(self, request, get_response):
+        """Method for answering conditional requests in the async views"""
+
+        version = await aget_version(self.version_name)
+        etag, last_modified = self.get_validators(request, version)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+
+        if response is None:
+            response = await get_response(version)
+
+        return add_validators(response, etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        """Method for getting the list with conditional GET support"""
+
+        is_cached = (
+            not request.query_params
+            and request.accepted_renderer.format == 'json'
+        )
+
+        def get_response(version):
+            if is_cached:
+                return self.get_cached_list_response(
+                    request, self.get_cached_list(request, version)
+                )
+            return Response(self.get_list_data(request))
+
+        return self.conditional_response(request, get_response)
+
+    async def alist(self, request, *args, **kwargs):
+        """Method for getting the list in the async views"""
+
+        async def get_response(version):
+            if not request.query_params:
+                return self.get_cached_list_response(
+                    request, await self.aget_cached_list(request, version)
+                )
+            return render_json(await self.aget_list_data(request))
+
+        return await self.aconditional_response(request, get_response)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Method for getting the object with conditional GET support"""
+
+        return self.conditional_response(
+            request,
+            lambda version: super(VersionedCacheMixin, self).retrieve(
+                request, *args, **kwargs
+            )
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """Method for getting the object in the async views"""
+
+        return await self.aconditional_response(
+            request,
+            lambda version: super(VersionedCacheMixin, self).aretrieve(
+                request, *args, **kwargs
+            )
+        )
+
+
+class RecipeFragmentCacheMixin:
+    """
+    Mixin for the recipe viewset: the part of the recipe that is
+    the same for every viewer is cached per recipe with its author
+    under a key that moves with the updated_at of the recipe,
+    the viewer flags are loaded for the whole page by one query.
+    Responses carry an ETag of the recipes of the page with their
+    updated_at, counters and viewer flags, conditional requests
+    are answered with 304 before anything is serialized.
+    No Last-Modified is sent, since the counters and the flags
+    change without moving any time.
+    The viewset defines get_page_queryset with the id, author_id,
+    favorites_count and timestamps of the recipes only
+    and get_fragment_queryset with the recipes as seen by anyone
+    """
+
+    def serialize_fragments(self, recipe_ids):
+        """
+        Method for serializing the missing recipes with their authors
+        without the request, so nothing depends on the viewer
+        """
+
+        if not recipe_ids:
+            return []
+
+        serializer_class = self.get_serializer_class()
+        fragments = []
+
+        for recipe in self.get_fragment_queryset().filter(id__in=recipe_ids):
+            data = serializer_class(recipe).data
+            fragments.append(
+                (recipe, dict(data, author=dict(data['author'])))
+            )
+
+        return fragments
+
+    def get_recipes_data(self, recipes, flags, prefix):
+        """
+        Method for getting the serialized recipes of the page
+        from the cached fragments and the flags of the viewer
+        """
+
+        recipes_data = get_fragments(prefix, recipes)
+        fragments = self.serialize_fragments([
+            recipe.id for recipe in recipes if recipe.id not in recipes_data
+        ])
+        set_fragments(prefix, fragments)
+        recipes_data.update(
+            (recipe.id, data) for recipe, data in fragments
+        )
+
+        favorites, shopping_carts, subscriptions = flags
+        request = self.get_serializer_context().get('request')
+        data = []
+
+        for recipe in recipes:
+            recipe_data = dict(recipes_data[recipe.id])
+            recipe_data['author'] = dict(
+                recipe_data['author'],
+                is_subscribed=recipe.author_id in subscriptions
+            )
+            recipe_data['is_favorited'] = recipe.id in favorites
+            recipe_data['is_in_shopping_cart'] = recipe.id in shopping_carts
+            recipe_data['favorites_count'] = recipe.favorites_count
+            data.append(build_absolute_image_urls(recipe_data, request))
+
+        return data
+
+    def get_recipes_etag(self, request, recipes, flags, state):
+        """Method for getting the ETag of everything shown with the recipes"""
+
+        favorites, shopping_carts, subscriptions = flags
+        prefix, page_count = state
+        etag_state = [request.build_absolute_uri(), prefix, page_count]
+
+        for recipe in recipes:
+            etag_state.append((
+                recipe.id,
+                recipe.updated_at.isoformat(),
+                recipe.favorites_count,
+                recipe.id in favorites,
+                recipe.id in shopping_carts,
+                recipe.author_id in subscriptions
+            ))
+
+        return 'W/"{}"'.format(
+            hashlib.md5(repr(etag_state).encode()).hexdigest()
+        )
+
+    def get_conditional_data(self, request, recipes):
+        """
+        Method for getting the ETag of the recipes and
+        either the 304 response or the data of the recipes
+        """
+
+        flags = get_viewer_flags(
+            request.user,
+            [recipe.id for recipe in recipes],
+            {recipe.author_id for recipe in recipes}
+        )
+        prefix = get_fragment_prefix()
+        django_paginator = getattr(
+            getattr(self.paginator, 'page', None), 'paginator', None
+        )
+        page_count = getattr(django_paginator, 'count', None)
+        etag = self.get_recipes_etag(
+            request, recipes, flags, (prefix, page_count)
+        )
+        response = get_conditional_response(request, etag=etag)
+
+        if response is not None:
+            return etag, response, None
+
+        return etag, None, self.get_recipes_data(recipes, flags, prefix)
+
+    def finish_response(self, response, etag):
+        """Method for adding the ETag of the recipes"""
+
+        patch_vary_headers(response, ('Authorization',))
+        return add_validators(response, etag, None)
+
+    def get_page_object(self, queryset):
+        """Method for getting the recipe by the lookup of the url"""
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+
+        return queryset.filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+
+    def list(self, request, *args, **kwargs):
+        """Method for getting the list with conditional GET support"""
+
+        queryset = self.filter_queryset(self.get_page_queryset())
+        page = self.paginate_queryset(queryset)
+        recipes = list(queryset) if page is None else page
+        etag, response, data = self.get_conditional_data(request, recipes)
+
+        if response is None:
+            response = (
+                Response(data) if page is None
+                else self.get_paginated_response(data)
+            )
+
+        return self.finish_response(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Method for getting the recipe with conditional GET support"""
+
+        obj = self.get_page_object(
+            self.filter_queryset(self.get_page_queryset())
+        ).first()
+
+        if obj is None:
+            raise Http404
+
+        self.check_object_permissions(request, obj)
+        etag, response, data = self.get_conditional_data(request, [obj])
+
+        if response is None:
+            response = Response(data[0])
+
+        return self.finish_response(response, etag)
+
+    async def alist(self, request, *args, **kwargs):
+        """Method for getting the list in the async views"""
+
+        queryset = self.filter_queryset(self.get_page_queryset())
+        paginator = self.paginator
+
+        if paginator is None:
+            recipes = [recipe async for recipe in queryset]
+        else:
+            recipes = await apaginate_queryset(
+                paginator, queryset, request, self
+            )
+
+        etag, response, data = await sync_to_async(
+            self.get_conditional_data
+        )(request, recipes)
+
+        if response is None:
+            response = render_json(
+                data if paginator is None
+                else paginator.get_paginated_response(data).data
+            )
+
+        return self.finish_response(response, etag)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """Method for getting the recipe in the async views"""
+
+        obj = await self.get_page_object(
+            self.filter_queryset(self.get_page_queryset())
+        ).afirst()
+
+        if obj is None:
+            raise Http404
+
+        self.check_object_permissions(request, obj)
+        etag, response, data = await sync_to_async(
+            self.get_conditional_data
+        )(request, [obj])
+
+        if response is None:
+            response = render_json(data[0])
+
+        return self.finish_response(response, etag)
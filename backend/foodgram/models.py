@@ -1,7 +1,11 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core import validators
 from django.core.validators import RegexValidator
 from django.db import models
+from django.utils import timezone
 
+from foodgram.storages import ContentHashStorage
 from utils.validators import hex_name_color_validator
 
 
@@ -159,10 +163,18 @@ class Recipe(models.Model):
 
     image = models.ImageField(
         upload_to='foodgram/images/',
+        storage=ContentHashStorage(),
         null=False,
         default=None,
     )
 
+    image_hash = models.CharField(
+        max_length=64,
+        verbose_name='Хеш обработанного изображения',
+        blank=True,
+        editable=False
+    )
+
     name = models.CharField(
         max_length=200,
         verbose_name='Название рецепта',
@@ -205,11 +217,44 @@ class Recipe(models.Model):
         auto_now=True,
     )
 
+    created_at = models.DateTimeField(
+        verbose_name='Дата создания',
+        default=timezone.now,
+        editable=False,
+        db_index=True
+    )
+
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
+
+    favorites_count = models.PositiveIntegerField(
+        verbose_name='Количество добавлений в избранное',
+        default=0,
+        db_index=True
+    )
+
+    shopping_carts_count = models.PositiveIntegerField(
+        verbose_name='Количество добавлений в список покупок',
+        default=0
+    )
+
+    search_vector = SearchVectorField(
+        verbose_name='Поисковый вектор рецепта',
+        null=True,
+        editable=False
+    )
+
     class Meta:
         """User model settings."""
 
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='recipe_search_vector_gin')
+        ]
 
     def __str__(self) -> str:
         """String representation of the class"""
@@ -295,6 +340,13 @@ class RecipeTag(models.Model):
             )
         ]
 
+        indexes = [
+            models.Index(
+                fields=['tag', 'recipe'],
+                name='recipe_tag_tag_recipe_idx'
+            )
+        ]
+
         verbose_name = 'Тег рецепта'
         verbose_name_plural = 'Тег рецептов'
 
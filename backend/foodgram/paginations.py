@@ -1,7 +1,51 @@
-from rest_framework import pagination
+from rest_framework import pagination, serializers
+
+CURSOR_ORDERING_ERROR_MESSAGE = (
+    'Эта сортировка недоступна при выдаче рецептов по курсору'
+)
 
 
 class RecipePageNumberPagination(pagination.PageNumberPagination):
     """Custom paginator that accepts the limit parameter in the request"""
 
     page_size_query_param = 'limit'
+
+
+class RecipeCursorPagination(pagination.CursorPagination):
+    """
+    Keyset paginator for infinite scroll: pages are fetched
+    by the position of the last recipe instead of an offset
+    and without counting the recipes, so every page costs the same.
+    Next and previous links contain opaque cursors.
+    The ordering parameter of the view is respected,
+    except for the fields with many equal values:
+    the cursor keeps the position of the first field only,
+    so their pages would be fetched by offsets again
+    """
+
+    ordering = ('-id',)
+    offset_ordering_fields = ('favorites_count',)
+    page_size_query_param = 'limit'
+    pagination_query_param = 'pagination'
+    pagination_query_value = 'cursor'
+
+    def is_requested(self, request):
+        """Checking if the client opted into the cursor pagination"""
+
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.pagination_query_param)
+            == self.pagination_query_value
+        )
+
+    def get_ordering(self, request, queryset, view):
+        """Method for rejecting the orderings fetched by offsets"""
+
+        ordering = super().get_ordering(request, queryset, view)
+
+        if ordering[0].lstrip('-') in self.offset_ordering_fields:
+            raise serializers.ValidationError(
+                {'ordering': CURSOR_ORDERING_ERROR_MESSAGE}
+            )
+
+        return ordering
@@ -2,7 +2,8 @@ import base64
 from django.core.files.base import ContentFile
 from rest_framework import serializers
 
-from foodgram.models import Ingredient, Recipe, Tag
+from foodgram.models import Ingredient, Recipe, RecipeIngredient, Tag
+from foodgram.utils.images import get_image_urls
 from users.models import UserFavorite, UserShoppingCart
 from users.serializers import UserGetSerializer
 from utils.validators import (
@@ -22,27 +23,23 @@ class IngredientSerializer(serializers.ModelSerializer):
 
 
 class IngredientWithAmountSerializer(serializers.ModelSerializer):
-    """Serializer for processing GET requests from the RecipeSerializer"""
+    """
+    Serializer for processing GET requests from the RecipeSerializer.
+    Works with the recipe's RecipeIngredient rows,
+    so the amount always belongs to the recipe being shown
+    """
 
-    amount = serializers.SerializerMethodField()
+    id = serializers.ReadOnlyField(source='ingredient.id')
+    name = serializers.ReadOnlyField(source='ingredient.name')
+    measurement_unit = serializers.ReadOnlyField(
+        source='ingredient.measurement_unit'
+    )
 
     class Meta():
         """Setting input and output fields"""
 
         fields = ('id', 'name', 'measurement_unit', 'amount')
-        model = Ingredient
-
-    def get_amount(self, obj):
-        """
-        Method for getting an additional field
-        for the resipe's amount of ingredient
-        """
-
-        recipe_ingredient = obj.recipeingredient_set.first()
-
-        if recipe_ingredient:
-            return recipe_ingredient.amount
-        return None
+        model = RecipeIngredient
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -101,10 +98,13 @@ class RecipeSerializer(serializers.ModelSerializer):
 
     tags = TagSerializer(read_only=True, many=True)
     author = UserGetSerializer(read_only=True)
-    ingredients = IngredientWithAmountSerializer(read_only=True, many=True)
+    ingredients = IngredientWithAmountSerializer(
+        source='recipeingredient_set', read_only=True, many=True
+    )
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
     image = Base64ImageField(required=False, allow_null=True)
+    image_sizes = serializers.SerializerMethodField()
 
     class Meta:
         """Setting input and output fields"""
@@ -112,16 +112,29 @@ class RecipeSerializer(serializers.ModelSerializer):
         fields = (
             'id', 'tags', 'author', 'ingredients',
             'is_favorited', 'is_in_shopping_cart',
-            'name', 'image', 'text', 'cooking_time'
+            'name', 'image', 'image_sizes', 'text', 'cooking_time',
+            'favorites_count'
         )
+        read_only_fields = ('favorites_count',)
         model = Recipe
 
+    def get_image_sizes(self, obj):
+        """
+        Method for getting an additional field
+        with the urls of the resized recipe images
+        """
+
+        return get_image_urls(obj, self.context.get('request'))
+
     def get_is_favorited(self, obj):
         """
         Method for getting an additional field
         for the user's favorites
         """
 
+        if hasattr(obj, 'is_favorited'):
+            return obj.is_favorited
+
         request = self.context.get('request')
         user = request.user
 
@@ -139,6 +152,9 @@ class RecipeSerializer(serializers.ModelSerializer):
         for the user's shopping_cart
         """
 
+        if hasattr(obj, 'is_in_shopping_cart'):
+            return obj.is_in_shopping_cart
+
         request = self.context.get('request')
         user = request.user
 
@@ -0,0 +1,106 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from foodgram.models import (
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    RecipeTag,
+    Tag
+)
+from foodgram.utils.images import has_image_variants, process_recipe_image
+from foodgram.utils.recipe_match_index import update_recipe_match_index
+from foodgram.utils.search import update_search_index
+from foodgram.utils.versions import (
+    INGREDIENTS_VERSION_NAME,
+    TAGS_VERSION_NAME,
+    bump_version
+)
+
+
+def touch_recipe(recipe_id):
+    """
+    Marking the recipe as changed when its related rows change,
+    which also moves the key of its cached fragment
+    """
+
+    Recipe.objects.filter(pk=recipe_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def change_ingredient(sender, instance, **kwargs):
+    """
+    Changing the ingredients version to rebuild the autocomplete index
+    and the cached ingredient responses
+    """
+
+    bump_version(INGREDIENTS_VERSION_NAME)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def change_tag(sender, instance, **kwargs):
+    """Changing the tags version to rebuild the cached tag responses"""
+
+    bump_version(TAGS_VERSION_NAME)
+
+
+@receiver(post_save, sender=Recipe)
+def change_recipe(sender, instance, created, **kwargs):
+    """
+    Updating the search index of the changed recipe
+    and resizing its new image
+    """
+
+    update_search_index(instance.pk)
+
+    if instance.image and not has_image_variants(instance):
+        process_recipe_image.enqueue_on_commit(instance.pk)
+
+
+@receiver(post_delete, sender=Recipe)
+def delete_recipe(sender, instance, **kwargs):
+    """
+    Removing the deleted recipe from the search and match indexes
+    """
+
+    update_search_index(instance.pk)
+    update_recipe_match_index(instance.pk)
+
+
+@receiver(post_save, sender=RecipeIngredient)
+@receiver(post_delete, sender=RecipeIngredient)
+def change_recipe_ingredient(sender, instance, **kwargs):
+    """Updating the indexes when the recipe ingredients change"""
+
+    update_search_index(instance.recipe_id)
+    update_recipe_match_index(instance.recipe_id)
+    touch_recipe(instance.recipe_id)
+
+
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def change_recipe_ingredients(sender, instance, action, reverse, **kwargs):
+    """Updating the indexes when the recipe ingredients are cleared"""
+
+    if action.startswith('post_') and not reverse:
+        update_search_index(instance.pk)
+        update_recipe_match_index(instance.pk)
+        touch_recipe(instance.pk)
+
+
+@receiver(post_save, sender=RecipeTag)
+@receiver(post_delete, sender=RecipeTag)
+def change_recipe_tag(sender, instance, **kwargs):
+    """Marking the recipe as changed when its tags change"""
+
+    touch_recipe(instance.recipe_id)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def change_recipe_tags(sender, instance, action, reverse, **kwargs):
+    """Marking the recipe as changed when its tags are cleared"""
+
+    if action.startswith('post_') and not reverse:
+        touch_recipe(instance.pk)
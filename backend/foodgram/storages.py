@@ -0,0 +1,38 @@
+import hashlib
+import posixpath
+
+from django.core.files.storage import FileSystemStorage
+
+
+def get_content_hash(content):
+    """Getting the sha256 hash of the file content"""
+
+    content_hash = hashlib.sha256()
+
+    for chunk in content.chunks():
+        content_hash.update(chunk)
+
+    content.seek(0)
+
+    return content_hash.hexdigest()
+
+
+class ContentHashStorage(FileSystemStorage):
+    """
+    Storage saving files under the hash of their content,
+    so duplicate uploads share one file
+    """
+
+    def save(self, name, content, max_length=None):
+        """Saving the file only if a file with the same content is missing"""
+
+        directory, file_name = posixpath.split(name)
+        extension = posixpath.splitext(file_name)[1].lower()
+        name = posixpath.join(
+            directory, get_content_hash(content) + extension
+        )
+
+        if self.exists(name):
+            return name
+
+        return super().save(name, content, max_length)
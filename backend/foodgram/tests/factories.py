@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+
+from foodgram.models import (
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    RecipeTag,
+    Tag
+)
+
+User = get_user_model()
+
+RECIPE_IMAGE = 'foodgram/images/recipe.png'
+
+
+def create_user(username, **kwargs):
+    """Creating the user with the required fields filled"""
+
+    kwargs.setdefault('email', f'{username}@example.com')
+    kwargs.setdefault('first_name', 'Имя')
+    kwargs.setdefault('last_name', 'Фамилия')
+    kwargs.setdefault('password', 'password-for-tests')
+
+    return User.objects.create_user(username=username, **kwargs)
+
+
+def create_tag(slug, **kwargs):
+    """Creating the tag with the slug as the name"""
+
+    kwargs.setdefault('name', slug)
+    kwargs.setdefault('color', '#FF0000')
+
+    return Tag.objects.create(slug=slug, **kwargs)
+
+
+def create_ingredient(name, measurement_unit='г'):
+    """Creating the ingredient"""
+
+    return Ingredient.objects.create(
+        name=name, measurement_unit=measurement_unit
+    )
+
+
+def create_recipe(author, name='Рецепт', ingredients=(), tags=(), **kwargs):
+    """
+    Creating the recipe with the ingredients
+    given as (ingredient, amount) pairs and the tags
+    """
+
+    kwargs.setdefault('text', 'Описание')
+    kwargs.setdefault('cooking_time', 10)
+    kwargs.setdefault('image', RECIPE_IMAGE)
+    recipe = Recipe.objects.create(author=author, name=name, **kwargs)
+
+    for ingredient, amount in ingredients:
+        RecipeIngredient.objects.create(
+            recipe=recipe, ingredient=ingredient, amount=amount
+        )
+
+    for tag in tags:
+        RecipeTag.objects.create(recipe=recipe, tag=tag)
+
+    return recipe
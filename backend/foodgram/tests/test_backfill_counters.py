@@ -0,0 +1,42 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.test import TestCase
+
+from foodgram.models import Recipe
+from foodgram.tests.factories import create_recipe, create_user
+from users.models import Subscription, User, UserFavorite, UserShoppingCart
+
+backfill_counters = import_module(
+    'foodgram.migrations.0005_backfill_counters'
+).backfill_counters
+
+
+class BackfillCountersTests(TestCase):
+    """The migration fills the counters of the existing rows"""
+
+    def test_backfill(self):
+        """The counters are set from the related rows"""
+
+        user = create_user('user')
+        author = create_user('author')
+        recipe = create_recipe(author, name='Рецепт')
+        create_recipe(author, name='Другой рецепт')
+        UserFavorite.objects.create(user=user, recipe=recipe)
+        UserShoppingCart.objects.create(user=user, recipe=recipe)
+        Subscription.objects.create(user=user, author=author)
+        Recipe.objects.update(favorites_count=0, shopping_carts_count=0)
+        User.objects.update(recipes_count=0, subscribers_count=0)
+
+        backfill_counters(apps, None)
+
+        recipe.refresh_from_db()
+        author.refresh_from_db()
+        user.refresh_from_db()
+        self.assertEqual(
+            (recipe.favorites_count, recipe.shopping_carts_count), (1, 1)
+        )
+        self.assertEqual(
+            (author.recipes_count, author.subscribers_count), (2, 1)
+        )
+        self.assertEqual((user.recipes_count, user.subscribers_count), (0, 0))
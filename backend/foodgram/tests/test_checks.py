@@ -0,0 +1,32 @@
+from django.test import SimpleTestCase, override_settings
+
+from foodgram.checks import check_shared_cache
+
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+}
+REDIS_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://redis:6379/0',
+    }
+}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    """The deploy check warns about the cache local to the process"""
+
+    @override_settings(CACHES=LOCAL_CACHES)
+    def test_local_cache(self):
+        """The local memory cache is reported"""
+
+        self.assertEqual(
+            [error.id for error in check_shared_cache(None)],
+            ['foodgram.W001']
+        )
+
+    @override_settings(CACHES=REDIS_CACHES)
+    def test_shared_cache(self):
+        """Redis is shared by the processes"""
+
+        self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,162 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from foodgram.tests.factories import (
+    create_ingredient,
+    create_recipe,
+    create_tag,
+    create_user
+)
+from foodgram.utils.relations import add_relation
+from users.models import UserFavorite
+
+RECIPES_URL = '/api/recipes/'
+RECIPE_URL = '/api/recipes/{id}/'
+FAR_FUTURE = http_date(4102444800)
+
+
+class RecipeConditionalGetTests(TestCase):
+    """
+    The recipe list and detail answer conditional requests with 304
+    by the ETag only, the counters and the viewer flags change
+    without moving any time, so no Last-Modified is sent
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = create_user('viewer')
+        cls.author = create_user('author')
+        tag = create_tag('breakfast')
+        ingredient = create_ingredient('Мука')
+        cls.recipes = [
+            create_recipe(
+                cls.author,
+                name=f'Рецепт {index}',
+                ingredients=[(ingredient, 100)],
+                tags=[tag]
+            )
+            for index in range(2)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.anonymous_client = APIClient()
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def test_anonymous_validators(self):
+        """Anonymous responses carry the ETag only and are revalidated"""
+
+        for url in (RECIPES_URL, RECIPE_URL.format(id=self.recipes[0].id)):
+            with self.subTest(url=url):
+                response = self.anonymous_client.get(url)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('ETag', response)
+                self.assertNotIn('Last-Modified', response)
+
+                response = self.anonymous_client.get(
+                    url, HTTP_IF_NONE_MATCH=response['ETag']
+                )
+                self.assertEqual(response.status_code, 304)
+
+                response = self.anonymous_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=FAR_FUTURE
+                )
+                self.assertEqual(response.status_code, 200)
+
+    def test_anonymous_favorites_count(self):
+        """
+        A favorite of another user changes the counter and the order
+        by it, the anonymous validators are no longer matched
+        """
+
+        urls = (
+            RECIPE_URL.format(id=self.recipes[0].id),
+            f'{RECIPES_URL}?ordering=-favorites_count',
+        )
+        etags = {
+            url: self.anonymous_client.get(url)['ETag'] for url in urls
+        }
+
+        add_relation(
+            UserFavorite, 'recipe', 'favorites_count', self.viewer.id,
+            self.recipes[0].id
+        )
+
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.anonymous_client.get(
+                    url,
+                    HTTP_IF_NONE_MATCH=etags[url],
+                    HTTP_IF_MODIFIED_SINCE=FAR_FUTURE
+                )
+
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn('Last-Modified', response)
+
+        response = self.anonymous_client.get(urls[0])
+        self.assertEqual(response.json()['favorites_count'], 1)
+
+        response = self.anonymous_client.get(urls[1])
+        self.assertEqual(
+            response.json()['results'][0]['id'], self.recipes[0].id
+        )
+
+    def test_authenticated_validators(self):
+        """
+        The viewer flags are covered by the ETag,
+        so a favorite of the viewer is not answered with 304
+        """
+
+        url = RECIPE_URL.format(id=self.recipes[0].id)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=FAR_FUTURE)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        UserFavorite.objects.create(user=self.viewer, recipe=self.recipes[0])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['is_favorited'])
+
+    def test_per_user_filters_validators(self):
+        """The per-user filters are revalidated by the ETag only"""
+
+        for query in ('is_favorited=1', 'is_in_shopping_cart=1'):
+            with self.subTest(query=query):
+                response = self.anonymous_client.get(
+                    f'{RECIPES_URL}?{query}'
+                )
+
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('ETag', response)
+                self.assertNotIn('Last-Modified', response)
+
+    def test_filtered_list_changes(self):
+        """Favoriting changes the ETag of the favorites of the viewer"""
+
+        url = f'{RECIPES_URL}?is_favorited=1'
+        response = self.client.get(url)
+        self.assertEqual(response.json()['count'], 0)
+
+        UserFavorite.objects.create(user=self.viewer, recipe=self.recipes[1])
+        response = self.client.get(
+            url,
+            HTTP_IF_NONE_MATCH=response['ETag'],
+            HTTP_IF_MODIFIED_SINCE=FAR_FUTURE
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 1)
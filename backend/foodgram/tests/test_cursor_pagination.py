@@ -0,0 +1,117 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from foodgram.tests.factories import create_recipe, create_user
+
+RECIPES_URL = '/api/recipes/'
+
+
+class CursorPaginationTests(TestCase):
+    """
+    The recipe feed is paginated by cursors when the client opts in,
+    pages follow the ordering without gaps or repeats
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = create_user('author')
+        cls.recipes = [
+            create_recipe(author, name=f'Рецепт {index}', cooking_time=index)
+            for index in range(1, 8)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get_all(self, url):
+        """Following the next links, returning the ids and the pages"""
+
+        ids, pages = [], 0
+
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertNotIn('count', data)
+            ids.extend(recipe['id'] for recipe in data['results'])
+            url = data['next']
+            pages += 1
+
+        return ids, pages
+
+    def test_opt_in(self):
+        """The page number pagination stays the default"""
+
+        data = self.client.get(f'{RECIPES_URL}?limit=3').json()
+
+        self.assertEqual(data['count'], 7)
+        self.assertIn('page=2', data['next'])
+
+    def test_pages(self):
+        """All recipes are returned once in the default order"""
+
+        ids, pages = self.get_all(f'{RECIPES_URL}?pagination=cursor&limit=3')
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(
+            ids, sorted((recipe.id for recipe in self.recipes), reverse=True)
+        )
+
+    def test_ordering(self):
+        """The ordering parameter is followed across the pages"""
+
+        ids, _ = self.get_all(
+            f'{RECIPES_URL}?pagination=cursor&limit=2&ordering=created_at'
+        )
+
+        self.assertEqual(ids, [recipe.id for recipe in self.recipes])
+
+    def test_new_recipe_between_pages(self):
+        """A recipe added after the first page does not shift the next"""
+
+        response = self.client.get(f'{RECIPES_URL}?pagination=cursor&limit=3')
+        data = response.json()
+        first_page = [recipe['id'] for recipe in data['results']]
+
+        create_recipe(self.recipes[0].author, name='Новый рецепт')
+        ids, _ = self.get_all(data['next'])
+
+        self.assertEqual(
+            first_page + ids,
+            sorted((recipe.id for recipe in self.recipes), reverse=True)
+        )
+
+    def test_previous(self):
+        """The previous link returns the first page again"""
+
+        data = self.client.get(
+            f'{RECIPES_URL}?pagination=cursor&limit=3'
+        ).json()
+        next_data = self.client.get(data['next']).json()
+        previous_data = self.client.get(next_data['previous']).json()
+
+        self.assertEqual(previous_data['results'], data['results'])
+
+    def test_favorites_count_rejected(self):
+        """The ordering with many equal values is not paged by cursors"""
+
+        response = self.client.get(
+            f'{RECIPES_URL}?pagination=cursor&ordering=-favorites_count'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.json())
+
+    def test_tie_breaker(self):
+        """Recipes with equal counters are ordered by the id, newest first"""
+
+        data = self.client.get(
+            f'{RECIPES_URL}?ordering=-favorites_count&limit=10'
+        ).json()
+
+        self.assertEqual(
+            [recipe['id'] for recipe in data['results']],
+            sorted((recipe.id for recipe in self.recipes), reverse=True)
+        )
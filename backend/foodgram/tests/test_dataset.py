@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from foodgram.utils.dataset import get_dataset_users
+
+DATASET_OPTIONS = {
+    'users': 3, 'recipes': 5, 'ingredients': 5, 'tags': 2,
+    'favorites': 1, 'shopping_carts': 1, 'subscriptions': 1,
+}
+
+
+class GenerateDatasetTests(TestCase):
+    """
+    The synthetic dataset is only generated with DATASET_PASSWORD set
+    and with DEBUG or an explicit permission, its staff user
+    can not log in with a password
+    """
+
+    def generate(self, **options):
+        """Running the command with the small dataset"""
+
+        call_command(
+            'generate_dataset', stdout=StringIO(),
+            **DATASET_OPTIONS, **options
+        )
+
+    @override_settings(DEBUG=True, DATASET_PASSWORD='dataset-password')
+    def test_passwords(self):
+        """The users get the password, the staff user none"""
+
+        self.generate()
+        staff, *users = get_dataset_users()
+
+        self.assertTrue(staff.is_staff)
+        self.assertFalse(staff.has_usable_password())
+
+        for user in users:
+            self.assertFalse(user.is_staff)
+            self.assertTrue(user.check_password('dataset-password'))
+
+    @override_settings(DEBUG=False, DATASET_PASSWORD='dataset-password')
+    def test_production(self):
+        """Without DEBUG the dataset needs --allow-production"""
+
+        with self.assertRaises(CommandError):
+            self.generate()
+
+        self.assertFalse(get_dataset_users().exists())
+
+        self.generate(allow_production=True)
+        self.assertEqual(get_dataset_users().count(), 3)
+
+    @override_settings(DEBUG=True, DATASET_PASSWORD='')
+    def test_password_required(self):
+        """The dataset is not generated without DATASET_PASSWORD"""
+
+        with self.assertRaises(CommandError):
+            self.generate()
+
+        self.assertFalse(get_dataset_users().exists())
@@ -0,0 +1,39 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from foodgram.models import Ingredient
+
+
+class LoadIngredientsTests(TestCase):
+    """The ingredients are loaded once, missing files are reported"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'ingredients.csv'
+        self.path.write_text(
+            'name,measurement_unit\nСоль,г\nСахар,г\n', encoding='utf-8'
+        )
+
+    def test_load(self):
+        """Rerunning the command adds nothing"""
+
+        for _ in range(2):
+            call_command('load_ingredients', self.path, stdout=StringIO())
+
+        self.assertEqual(Ingredient.objects.count(), 2)
+
+    def test_missing_file(self):
+        """A missing file is reported before anything is loaded"""
+
+        missing = self.path.with_name('missing.json')
+
+        with self.assertRaisesMessage(CommandError, str(missing)):
+            call_command('load_ingredients', self.path, missing)
+
+        self.assertFalse(Ingredient.objects.exists())
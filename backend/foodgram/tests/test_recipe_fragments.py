@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from foodgram.tests.factories import (
+    create_ingredient,
+    create_recipe,
+    create_tag,
+    create_user
+)
+
+RECIPE_URL = '/api/recipes/{id}/'
+
+
+class RecipeFragmentTests(TestCase):
+    """
+    The cached recipe fragments follow the changes of the recipe
+    and its author without any invalidation, the on_commit callbacks
+    are never run in these tests
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user('author')
+        cls.tag = create_tag('breakfast')
+        cls.ingredient = create_ingredient('Мука')
+        cls.recipe = create_recipe(
+            cls.author,
+            name='Блины',
+            ingredients=[(cls.ingredient, 100)],
+            tags=[cls.tag]
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = RECIPE_URL.format(id=self.recipe.id)
+
+    def get(self):
+        """Getting the recipe"""
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cached(self):
+        """The second response is built from the cached fragment"""
+
+        data = self.get()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get(), data)
+
+    def test_recipe_change(self):
+        """A saved recipe is served changed"""
+
+        self.get()
+        self.recipe.name = 'Оладьи'
+        self.recipe.save()
+
+        self.assertEqual(self.get()['name'], 'Оладьи')
+
+    def test_author_change(self):
+        """A saved author is served changed with the recipe"""
+
+        self.get()
+        self.author.first_name = 'Новое имя'
+        self.author.save()
+
+        self.assertEqual(self.get()['author']['first_name'], 'Новое имя')
+
+    def test_relations_change(self):
+        """Changed tags and ingredients of the recipe are served"""
+
+        self.get()
+        self.recipe.tags.clear()
+        self.assertEqual(self.get()['tags'], [])
+
+        recipe_ingredient = self.recipe.recipeingredient_set.get()
+        recipe_ingredient.amount = 200
+        recipe_ingredient.save()
+        self.assertEqual(self.get()['ingredients'][0]['amount'], 200)
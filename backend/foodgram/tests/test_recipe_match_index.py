@@ -0,0 +1,105 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from foodgram.models import RecipeIngredient
+from foodgram.tests.factories import (
+    create_ingredient,
+    create_recipe,
+    create_user
+)
+from foodgram.utils.recipe_match_index import CHANGES_KEY, RecipeMatchIndex
+from foodgram.utils.versions import (
+    RECIPE_INGREDIENTS_VERSION_NAME,
+    get_version
+)
+
+
+class RecipeMatchIndexTests(TestCase):
+    """
+    Changes made by one worker are applied by the others
+    from the changelog in the cache without rebuilding the index
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = create_user('author')
+        cls.salt = create_ingredient('Соль')
+        cls.sugar = create_ingredient('Сахар')
+        cls.soup = create_recipe(author, 'Суп', ingredients=[(cls.salt, 5)])
+        cls.cake = create_recipe(
+            author, 'Торт', ingredients=[(cls.sugar, 100), (cls.salt, 1)]
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.worker = RecipeMatchIndex()
+        self.other_worker = RecipeMatchIndex()
+
+    def match_ids(self, index, ingredient_ids):
+        """Getting the ids of the matched recipes"""
+
+        return [
+            recipe_id for recipe_id, _, _ in index.match(ingredient_ids, 10)
+        ]
+
+    def add_sugar_to_soup(self):
+        """Changing the ingredients of the soup by the first worker"""
+
+        RecipeIngredient.objects.create(
+            recipe=self.soup, ingredient=self.sugar, amount=7
+        )
+        self.worker.update_recipes(self.soup.id)
+
+    def test_changes_applied_incrementally(self):
+        """The other worker applies the change without a rebuild"""
+
+        for index in (self.worker, self.other_worker):
+            self.assertEqual(
+                self.match_ids(index, [self.sugar.id]), [self.cake.id]
+            )
+
+        self.add_sugar_to_soup()
+
+        for index in (self.worker, self.other_worker):
+            with mock.patch.object(index, '_build') as build:
+                self.assertEqual(
+                    sorted(self.match_ids(index, [self.sugar.id])),
+                    sorted([self.soup.id, self.cake.id])
+                )
+
+            build.assert_not_called()
+
+    def test_lost_changes_rebuilt(self):
+        """A change lost from the cache makes the other worker rebuild"""
+
+        self.match_ids(self.other_worker, [self.sugar.id])
+        self.add_sugar_to_soup()
+        cache.delete(CHANGES_KEY.format(
+            version=get_version(RECIPE_INGREDIENTS_VERSION_NAME), number=1
+        ))
+
+        with mock.patch.object(
+            self.other_worker, '_build', wraps=self.other_worker._build
+        ) as build:
+            self.assertIn(
+                self.soup.id,
+                self.match_ids(self.other_worker, [self.sugar.id])
+            )
+
+        build.assert_called_once()
+
+    def test_changes_copied(self):
+        """A change leaves the index taken by a running match intact"""
+
+        self.match_ids(self.worker, [self.salt.id])
+        recipes, ingredients = self.worker._recipes, self.worker._ingredients
+        self.add_sugar_to_soup()
+
+        self.assertEqual(list(recipes[self.soup.id]), [self.salt.id])
+        self.assertEqual(list(ingredients[self.sugar.id]), [self.cake.id])
+        self.assertEqual(
+            list(self.worker._ingredients[self.sugar.id]),
+            sorted([self.soup.id, self.cake.id])
+        )
@@ -0,0 +1,114 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from foodgram.tests.factories import (
+    create_ingredient,
+    create_recipe,
+    create_tag,
+    create_user
+)
+from users.models import Subscription, UserFavorite, UserShoppingCart
+
+RECIPES_URL = '/api/recipes/'
+RECIPE_URL = '/api/recipes/{id}/'
+
+
+class RecipeQueryCountTests(TestCase):
+    """
+    The recipe list and detail take a fixed number of queries
+    for anonymous and authenticated viewers, however large the page is
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = create_user('viewer')
+        cls.authors = [create_user(f'author{index}') for index in range(3)]
+        tags = [create_tag(f'tag{index}') for index in range(3)]
+        ingredients = [
+            create_ingredient(f'Ингредиент {index}') for index in range(5)
+        ]
+        cls.recipes = [
+            create_recipe(
+                cls.authors[index % 3],
+                name=f'Рецепт {index}',
+                ingredients=[
+                    (ingredient, index + 1) for ingredient in ingredients
+                ],
+                tags=tags
+            )
+            for index in range(10)
+        ]
+        UserFavorite.objects.create(user=cls.viewer, recipe=cls.recipes[0])
+        UserShoppingCart.objects.create(
+            user=cls.viewer, recipe=cls.recipes[1]
+        )
+        Subscription.objects.create(user=cls.viewer, author=cls.authors[0])
+
+    def setUp(self):
+        cache.clear()
+        self.anonymous_client = APIClient()
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def get(self, client, url, queries):
+        """Getting the url and checking the number of queries"""
+
+        with self.assertNumQueries(queries):
+            response = client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_list_anonymous(self):
+        """
+        Count and page, then the recipe rows with the author,
+        ingredients and tags of the page, nothing once cached
+        """
+
+        self.get(self.anonymous_client, f'{RECIPES_URL}?limit=2', 6)
+        cache.clear()
+        self.get(self.anonymous_client, f'{RECIPES_URL}?limit=10', 6)
+        self.get(self.anonymous_client, f'{RECIPES_URL}?limit=10', 2)
+
+    def test_list_authenticated(self):
+        """The viewer flags of the whole page take one more query"""
+
+        self.get(self.client, f'{RECIPES_URL}?limit=2', 7)
+        cache.clear()
+        data = self.get(self.client, f'{RECIPES_URL}?limit=10', 7)
+        self.get(self.client, f'{RECIPES_URL}?limit=10', 3)
+
+        results = {recipe['id']: recipe for recipe in data['results']}
+        favorited = results[self.recipes[0].id]
+        in_shopping_cart = results[self.recipes[1].id]
+        other = results[self.recipes[2].id]
+
+        self.assertTrue(favorited['is_favorited'])
+        self.assertFalse(favorited['is_in_shopping_cart'])
+        self.assertTrue(favorited['author']['is_subscribed'])
+        self.assertTrue(in_shopping_cart['is_in_shopping_cart'])
+        self.assertFalse(in_shopping_cart['is_favorited'])
+        self.assertFalse(other['author']['is_subscribed'])
+        self.assertEqual(len(favorited['ingredients']), 5)
+        self.assertEqual(len(favorited['tags']), 3)
+
+    def test_detail_anonymous(self):
+        """The recipe row, then the recipe with its relations"""
+
+        url = RECIPE_URL.format(id=self.recipes[0].id)
+        data = self.get(self.anonymous_client, url, 5)
+        self.get(self.anonymous_client, url, 1)
+
+        self.assertFalse(data['is_favorited'])
+        self.assertFalse(data['author']['is_subscribed'])
+
+    def test_detail_authenticated(self):
+        """The viewer flags take one more query"""
+
+        url = RECIPE_URL.format(id=self.recipes[0].id)
+        data = self.get(self.client, url, 6)
+        self.get(self.client, url, 2)
+
+        self.assertTrue(data['is_favorited'])
+        self.assertTrue(data['author']['is_subscribed'])
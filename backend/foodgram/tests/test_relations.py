@@ -0,0 +1,175 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from foodgram.models import Recipe
+from foodgram.tests.factories import create_recipe, create_user
+from foodgram.utils.relations import (
+    add_relation,
+    add_relations,
+    delete_relation,
+    delete_relations
+)
+from users.models import Subscription, User, UserFavorite, UserShoppingCart
+
+MISSING_ID = 10 ** 6
+
+
+class RelationTests(TestCase):
+    """
+    The relations are added and removed once, the counters
+    follow the rows that were changed and missing targets are reported
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        cls.author = create_user('author')
+        cls.recipes = [
+            create_recipe(cls.author, name=f'Рецепт {index}')
+            for index in range(2)
+        ]
+
+    def get_counter(self, model, pk, field):
+        """Getting the counter of the target"""
+
+        return model.objects.values_list(field, flat=True).get(pk=pk)
+
+    def test_add(self):
+        """Created, duplicate and missing targets of every relation"""
+
+        relations = (
+            (UserFavorite, 'recipe', 'favorites_count', Recipe,
+             self.recipes[0].id),
+            (UserShoppingCart, 'recipe', 'shopping_carts_count', Recipe,
+             self.recipes[0].id),
+            (Subscription, 'author', 'subscribers_count', User,
+             self.author.id),
+        )
+
+        for model, field, counter, target_model, target_id in relations:
+            with self.subTest(model=model.__name__):
+                self.assertEqual(
+                    tuple(add_relation(
+                        model, field, counter, self.user.id, target_id
+                    )),
+                    (True, True)
+                )
+                self.assertEqual(
+                    tuple(add_relation(
+                        model, field, counter, self.user.id, target_id
+                    )),
+                    (True, False)
+                )
+                self.assertEqual(
+                    tuple(add_relation(
+                        model, field, counter, self.user.id, MISSING_ID
+                    )),
+                    (False, False)
+                )
+
+                row = model.objects.get(
+                    user=self.user, **{f'{field}_id': target_id}
+                )
+                self.assertEqual(row.pub_date, timezone.now().date())
+                self.assertEqual(
+                    self.get_counter(target_model, target_id, counter), 1
+                )
+
+    def test_delete(self):
+        """Only the deleted row drops the counter"""
+
+        recipe_id = self.recipes[0].id
+        add_relation(
+            UserFavorite, 'recipe', 'favorites_count', self.user.id,
+            recipe_id
+        )
+
+        for expected in ((True, True), (True, False)):
+            self.assertEqual(
+                tuple(delete_relation(
+                    UserFavorite, 'recipe', 'favorites_count',
+                    self.user.id, recipe_id
+                )),
+                expected
+            )
+
+        self.assertEqual(
+            tuple(delete_relation(
+                UserFavorite, 'recipe', 'favorites_count',
+                self.user.id, MISSING_ID
+            )),
+            (False, False)
+        )
+        self.assertEqual(
+            self.get_counter(Recipe, recipe_id, 'favorites_count'), 0
+        )
+
+    def test_bulk(self):
+        """The bulk statements report and count every target once"""
+
+        first, second = (recipe.id for recipe in self.recipes)
+        add_relation(
+            UserShoppingCart, 'recipe', 'shopping_carts_count',
+            self.user.id, second
+        )
+
+        self.assertEqual(
+            add_relations(
+                UserShoppingCart, 'recipe', 'shopping_carts_count',
+                self.user.id, [first, second, MISSING_ID]
+            ),
+            {first: True, second: False}
+        )
+        self.assertEqual(
+            self.get_counter(Recipe, first, 'shopping_carts_count'), 1
+        )
+        self.assertEqual(
+            self.get_counter(Recipe, second, 'shopping_carts_count'), 1
+        )
+        self.assertTrue(
+            UserShoppingCart.objects.filter(
+                user=self.user, recipe_id=first,
+                pub_date=timezone.now().date()
+            ).exists()
+        )
+
+        UserShoppingCart.objects.filter(
+            user=self.user, recipe_id=second
+        ).delete()
+
+        self.assertEqual(
+            delete_relations(
+                UserShoppingCart, 'recipe', 'shopping_carts_count',
+                self.user.id, [first, second, MISSING_ID]
+            ),
+            {first: True, second: False}
+        )
+        self.assertEqual(
+            self.get_counter(Recipe, first, 'shopping_carts_count'), 0
+        )
+        self.assertEqual(
+            self.get_counter(Recipe, second, 'shopping_carts_count'), 1
+        )
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Needs PostgreSQL')
+class PostgreSQLRelationTests(RelationTests):
+    """The relation statements of PostgreSQL, one query per change"""
+
+    def test_single_statement(self):
+        """Adding and removing many relations take one query each"""
+
+        recipe_ids = [recipe.id for recipe in self.recipes]
+
+        for function in (add_relations, delete_relations):
+            with CaptureQueriesContext(connection) as context:
+                function(
+                    UserFavorite, 'recipe', 'favorites_count',
+                    self.user.id, recipe_ids
+                )
+
+            self.assertEqual(len(context.captured_queries), 1)
@@ -0,0 +1,87 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from foodgram.tests.factories import (
+    create_ingredient,
+    create_recipe,
+    create_user
+)
+
+RECIPES_URL = '/api/recipes/'
+
+
+class RecipeSearchTests(TestCase):
+    """Ranked full-text search of the recipes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = create_user('cook')
+        tomato = create_ingredient('Томат')
+        cls.by_name = create_recipe(author, 'Томатный суп')
+        cls.by_ingredient = create_recipe(
+            author, 'Салат', ingredients=[(tomato, 2)]
+        )
+        cls.by_text = create_recipe(
+            author, 'Паста', text='Подавать с томатным соусом'
+        )
+        cls.other = create_recipe(author, 'Омлет')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def search(self, query, **params):
+        """Getting the ids of the found recipes in their order"""
+
+        response = self.client.get(RECIPES_URL, {'search': query, **params})
+        self.assertEqual(response.status_code, 200)
+
+        return [recipe['id'] for recipe in response.json()['results']]
+
+    def test_ranked_by_name_ingredients_text(self):
+        """The name weighs more than the ingredients, then the text"""
+
+        self.assertEqual(
+            self.search('томат'),
+            [self.by_name.id, self.by_ingredient.id, self.by_text.id]
+        )
+
+    def test_explicit_ordering(self):
+        """The requested ordering replaces the rank"""
+
+        self.assertEqual(
+            self.search('томат', ordering='id'),
+            [self.by_name.id, self.by_ingredient.id, self.by_text.id]
+        )
+        self.assertEqual(
+            self.search('томат', ordering='-id'),
+            [self.by_text.id, self.by_ingredient.id, self.by_name.id]
+        )
+
+    def test_blank_query(self):
+        """A blank query is not applied and the list is not ranked"""
+
+        everything = [
+            self.other.id, self.by_text.id,
+            self.by_ingredient.id, self.by_name.id
+        ]
+
+        self.assertEqual(self.search(' '), everything)
+        self.assertEqual(self.search(''), everything)
+
+    def test_punctuation_query(self):
+        """A query without words finds nothing instead of failing"""
+
+        for query in ('"', '!!!', '" "', '*', '-'):
+            with self.subTest(query=query):
+                self.assertEqual(self.search(query), [])
+
+    def test_cursor_pagination(self):
+        """The search results are ranked with the cursor pagination too"""
+
+        self.assertEqual(
+            self.search('томат', pagination='cursor'),
+            [self.by_name.id, self.by_ingredient.id, self.by_text.id]
+        )
+        self.assertEqual(self.search('"', pagination='cursor'), [])
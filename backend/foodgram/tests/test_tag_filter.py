@@ -0,0 +1,121 @@
+from django.core.cache import cache
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from foodgram.filters import RecipeFilterSet
+from foodgram.models import Recipe
+from foodgram.tests.factories import create_recipe, create_tag, create_user
+
+RECIPES_URL = '/api/recipes/'
+
+
+class TagFilterTests(TestCase):
+    """
+    Recipes are filtered by any or all of the passed tags
+    with EXISTS subqueries, without duplicates or DISTINCT
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = create_user('author')
+        cls.breakfast = create_tag('breakfast')
+        cls.lunch = create_tag('lunch')
+        cls.dinner = create_tag('dinner')
+        cls.both = create_recipe(
+            author, name='Оба тега', tags=[cls.breakfast, cls.lunch]
+        )
+        cls.breakfast_only = create_recipe(
+            author, name='Завтрак', tags=[cls.breakfast]
+        )
+        cls.lunch_only = create_recipe(
+            author, name='Обед', tags=[cls.lunch]
+        )
+        cls.untagged = create_recipe(author, name='Без тегов')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get_ids(self, query):
+        """Getting the ids of the recipes found by the query"""
+
+        response = self.client.get(f'{RECIPES_URL}?limit=100&{query}')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        ids = [recipe['id'] for recipe in data['results']]
+        self.assertEqual(data['count'], len(ids))
+        return ids
+
+    def test_any(self):
+        """Recipes with any of the tags, each of them once"""
+
+        ids = self.get_ids('tags=breakfast&tags=lunch')
+
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(
+            set(ids),
+            {self.both.id, self.breakfast_only.id, self.lunch_only.id}
+        )
+
+    def test_all(self):
+        """Recipes with each of the tags"""
+
+        ids = self.get_ids('tags=breakfast&tags=lunch&tags_mode=all')
+
+        self.assertEqual(ids, [self.both.id])
+
+    def test_single_and_unknown(self):
+        """A single tag and a tag no recipe has"""
+
+        self.assertEqual(
+            set(self.get_ids('tags=breakfast')),
+            {self.both.id, self.breakfast_only.id}
+        )
+        self.assertEqual(self.get_ids('tags=dinner'), [])
+        self.assertEqual(
+            self.get_ids('tags=dinner&tags=lunch&tags_mode=all'), []
+        )
+
+    def test_query_plan(self):
+        """
+        The page query checks the tags by EXISTS subqueries,
+        the recipe table is neither joined with the tags nor DISTINCT
+        """
+
+        with CaptureQueriesContext(connection) as context:
+            self.get_ids('tags=breakfast&tags=lunch&tags_mode=all')
+
+        table = Recipe._meta.db_table
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if f'FROM "{table}"' in query['sql']
+            and 'EXISTS' in query['sql']
+        ]
+
+        self.assertTrue(queries)
+
+        for sql in queries:
+            self.assertNotIn('DISTINCT', sql)
+            self.assertEqual(sql.count('EXISTS'), 2)
+            self.assertNotIn('JOIN "foodgram_recipetag"', sql)
+
+    def test_index_used(self):
+        """
+        The plan needs no DISTINCT step and the tags of a recipe
+        are searched by an index instead of scanning them
+        """
+
+        filterset = RecipeFilterSet(
+            QueryDict('tags=breakfast&tags=lunch&tags_mode=all'),
+            queryset=Recipe.objects.all()
+        )
+        plan = filterset.qs.explain()
+
+        self.assertNotIn('DISTINCT', plan.upper())
+
+        if connection.vendor == 'sqlite':
+            self.assertNotRegex(plan, r'SCAN (U\d+|foodgram_recipetag)')
+            self.assertIn('foodgram_recipetag', plan)
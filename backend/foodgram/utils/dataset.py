@@ -0,0 +1,582 @@
+import random
+from array import array
+from datetime import timedelta
+from io import StringIO
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from foodgram.models import (
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    RecipeTag,
+    Tag
+)
+from foodgram.utils.search import is_postgresql, update_search_index
+from foodgram.utils.versions import (
+    INGREDIENTS_VERSION_NAME,
+    RECIPE_FRAGMENTS_VERSION_NAME,
+    RECIPE_INGREDIENTS_VERSION_NAME,
+    TAGS_VERSION_NAME,
+    bump_version
+)
+from jobs.models import Job
+from users.models import Subscription, UserFavorite, UserShoppingCart
+
+User = get_user_model()
+
+DATASET_PREFIX = 'benchmark'
+DATASET_EMAIL_DOMAIN = 'benchmark.local'
+DATASET_JOB_NAME = 'benchmark.job'
+DATASET_IMAGE = 'foodgram/images/benchmark.png'
+DATASET_TAG_COLORS = ('#FF0000', '#008000', '#0000FF', '#FFA500', '#800080')
+DATASET_WORDS = (
+    'курица', 'говядина', 'рыба', 'рис', 'гречка', 'картофель', 'сыр',
+    'томат', 'лук', 'чеснок', 'грибы', 'суп', 'салат', 'пирог', 'соус',
+    'запеканка', 'блины', 'каша', 'десерт', 'паста'
+)
+DEFAULT_ZIPF_EXPONENT = 1.1
+RECIPE_INGREDIENTS_MIN = 5
+RECIPE_INGREDIENTS_MAX = 30
+RECIPE_TAGS_MAX = 3
+RECIPE_TEXT_WORDS = 30
+MAX_FAVORITES_PER_USER = 2000
+MAX_SHOPPING_CARTS_PER_USER = 100
+MAX_SUBSCRIPTIONS_PER_USER = 1000
+DISTINCT_SAMPLE_ATTEMPTS = 10
+BATCH_SIZE = 1000
+COPY_BATCH_SIZE = 100000
+SEARCH_INDEX_BATCH_SIZE = 5000
+COPY_ESCAPES = str.maketrans({
+    '\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'
+})
+
+
+def get_zipf_weights(count, exponent):
+    """Getting the normalized Zipf weights of the ranks"""
+
+    weights = [1 / rank ** exponent for rank in range(1, count + 1)]
+    total = sum(weights)
+
+    return [weight / total for weight in weights]
+
+
+class ZipfSampler:
+    """
+    Sampling the values by the Zipf law: the value of the rank k
+    is picked with the weight 1 / k ** exponent.
+    The values are shuffled before getting their ranks,
+    so the popular ones are spread over the whole table
+    """
+
+    def __init__(self, rng, values, exponent=DEFAULT_ZIPF_EXPONENT):
+        self.rng = rng
+        self.values = list(values)
+        rng.shuffle(self.values)
+        self.cum_weights = []
+        total = 0
+
+        for weight in get_zipf_weights(len(self.values), exponent):
+            total += weight
+            self.cum_weights.append(total)
+
+    def sample(self, count):
+        """Getting the values, the same value can be picked many times"""
+
+        return self.rng.choices(
+            self.values, cum_weights=self.cum_weights, k=count
+        )
+
+    def sample_distinct(self, count, exclude=None):
+        """
+        Getting the distinct values, after a few attempts
+        the rest is completed by the uniformly picked values
+        """
+
+        chosen = {}
+        count = min(count, len(self.values) - (exclude is not None))
+
+        for _ in range(DISTINCT_SAMPLE_ATTEMPTS):
+            if len(chosen) >= count:
+                break
+
+            for value in self.sample(count - len(chosen)):
+                if value != exclude:
+                    chosen[value] = None
+
+        while len(chosen) < count:
+            value = self.rng.choice(self.values)
+
+            if value != exclude:
+                chosen[value] = None
+
+        return list(islice(chosen, count))
+
+
+def get_zipf_counts(rng, count, mean, limit, exponent):
+    """
+    Getting how many relations every user has: the total
+    is split by the Zipf weights of the users in a random order,
+    the most active users are capped by the limit
+    """
+
+    total = mean * count
+    counts = [
+        min(limit, round(total * weight))
+        for weight in get_zipf_weights(count, exponent)
+    ]
+    rng.shuffle(counts)
+
+    return counts
+
+
+def sample_relations(rng, counts, targets, target_counts, exclude_self=False):
+    """
+    Getting the distinct targets of every user as two arrays
+    of the user and the target indexes, the relations
+    of every target are counted into the target counts
+    """
+
+    user_indexes = array('q')
+    target_indexes = array('q')
+
+    for user_index, count in enumerate(counts):
+        for target_index in targets.sample_distinct(
+            count, user_index if exclude_self else None
+        ):
+            user_indexes.append(user_index)
+            target_indexes.append(target_index)
+            target_counts[target_index] += 1
+
+    return user_indexes, target_indexes
+
+
+def get_dataset_users():
+    """Getting the users of the synthetic dataset ordered by id"""
+
+    return User.objects.filter(
+        email__endswith=f'@{DATASET_EMAIL_DOMAIN}'
+    ).order_by('id')
+
+
+def format_copy_value(value):
+    """Formatting the value for the text format of COPY"""
+
+    if value is None:
+        return '\\N'
+
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+
+    if isinstance(value, str):
+        return value.translate(COPY_ESCAPES)
+
+    return str(value)
+
+
+def insert_rows(model, fields, rows):
+    """
+    Writing the rows into the table of the model:
+    with COPY on PostgreSQL and batched inserts on other databases.
+    Signals are not sent and the rows are not validated
+    """
+
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ', '.join(
+        connection.ops.quote_name(model._meta.get_field(field).column)
+        for field in fields
+    )
+    rows = iter(rows)
+
+    with connection.cursor() as cursor:
+        if is_postgresql():
+            sql = f'COPY {table} ({columns}) FROM STDIN'
+
+            while batch := list(islice(rows, COPY_BATCH_SIZE)):
+                buffer = StringIO()
+                buffer.writelines(
+                    '\t'.join(map(format_copy_value, row)) + '\n'
+                    for row in batch
+                )
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+
+            return
+
+        placeholders = ', '.join(['%s'] * len(fields))
+        sql = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+
+        while batch := list(islice(rows, BATCH_SIZE)):
+            cursor.executemany(sql, batch)
+
+
+def delete_rows(model, condition, params):
+    """Deleting the rows of the model by a single query"""
+
+    table = connection.ops.quote_name(model._meta.db_table)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {condition}', params)
+
+
+def get_next_id(model):
+    """Getting the first id free for the rows with explicit ids"""
+
+    return (model.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+
+
+def reset_sequences(*models):
+    """Moving the id sequences past the rows inserted with explicit ids"""
+
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+
+
+def update_search_index_in_batches(recipe_ids):
+    """Updating the search index of the recipes batch by batch"""
+
+    for start in range(0, len(recipe_ids), SEARCH_INDEX_BATCH_SIZE):
+        update_search_index(
+            *recipe_ids[start:start + SEARCH_INDEX_BATCH_SIZE]
+        )
+
+
+@transaction.atomic
+def clear_dataset():
+    """
+    Deleting the synthetic dataset with everything that refers to it,
+    the large tables are cleared by single queries without signals
+    """
+
+    email = f'%@{DATASET_EMAIL_DOMAIN}'
+    users_sql = f'SELECT id FROM {User._meta.db_table} WHERE email LIKE %s'
+    recipes_sql = (
+        f'SELECT id FROM {Recipe._meta.db_table} '
+        f'WHERE author_id IN ({users_sql})'
+    )
+    recipe_ids = list(
+        Recipe.objects.filter(
+            author__email__endswith=f'@{DATASET_EMAIL_DOMAIN}'
+        ).values_list('id', flat=True)
+    )
+
+    for model in (RecipeIngredient, RecipeTag):
+        delete_rows(model, f'recipe_id IN ({recipes_sql})', [email])
+
+    for model in (UserFavorite, UserShoppingCart):
+        delete_rows(
+            model,
+            f'user_id IN ({users_sql}) OR recipe_id IN ({recipes_sql})',
+            [email, email]
+        )
+
+    delete_rows(
+        Subscription,
+        f'user_id IN ({users_sql}) OR author_id IN ({users_sql})',
+        [email, email]
+    )
+    delete_rows(Recipe, f'author_id IN ({users_sql})', [email])
+    delete_rows(Token, f'user_id IN ({users_sql})', [email])
+    get_dataset_users().delete()
+    Tag.objects.filter(slug__startswith=f'{DATASET_PREFIX}-').delete()
+    Ingredient.objects.filter(
+        name__startswith=f'{DATASET_PREFIX} '
+    ).delete()
+    Job.objects.filter(name=DATASET_JOB_NAME).delete()
+
+    if not is_postgresql():
+        update_search_index_in_batches(recipe_ids)
+
+    transaction.on_commit(lambda: bump_version(
+        INGREDIENTS_VERSION_NAME,
+        TAGS_VERSION_NAME,
+        RECIPE_INGREDIENTS_VERSION_NAME,
+        RECIPE_FRAGMENTS_VERSION_NAME
+    ))
+
+
+def generate_users(count, first_id, recipes_counts, subscribers_counts):
+    """
+    Rows of the users with the DATASET_PASSWORD, the first one
+    is a staff user without a usable password, only its token is used
+    """
+
+    password = make_password(settings.DATASET_PASSWORD)
+    staff_password = make_password(None)
+    date_joined = timezone.now().isoformat()
+
+    for index in range(count):
+        yield (
+            first_id + index,
+            staff_password if index == 0 else password,
+            False,
+            f'{DATASET_PREFIX}{index}',
+            'Бенчмарк',
+            str(index),
+            f'{DATASET_PREFIX}{index}@{DATASET_EMAIL_DOMAIN}',
+            index == 0,
+            True,
+            date_joined,
+            recipes_counts[index],
+            subscribers_counts[index],
+        )
+
+
+def generate_recipes(rng, authors, first_id, first_user_id,
+                     favorites_counts, shopping_carts_counts):
+    """
+    Rows of the recipes, the texts are made of random words.
+    The recipes are created a second apart in the order of their ids
+    """
+
+    now = timezone.now()
+    pub_date = now.date().isoformat()
+    started_at = now - timedelta(seconds=len(authors))
+
+    for index, author in enumerate(authors):
+        created_at = (started_at + timedelta(seconds=index)).isoformat()
+        yield (
+            first_id + index,
+            first_user_id + author,
+            DATASET_IMAGE,
+            '',
+            ' '.join(rng.sample(DATASET_WORDS, 2)).capitalize(),
+            ' '.join(rng.choices(DATASET_WORDS, k=RECIPE_TEXT_WORDS)),
+            rng.randint(5, 180),
+            pub_date,
+            created_at,
+            created_at,
+            favorites_counts[index],
+            shopping_carts_counts[index],
+        )
+
+
+def generate_recipe_ingredients(rng, recipe_ids, ingredients):
+    """Rows of the recipe ingredients, from 5 to 30 for every recipe"""
+
+    for recipe_id in recipe_ids:
+        count = rng.randint(RECIPE_INGREDIENTS_MIN, RECIPE_INGREDIENTS_MAX)
+
+        for ingredient_id in ingredients.sample_distinct(count):
+            yield recipe_id, ingredient_id, rng.randint(1, 1000)
+
+
+def generate_recipe_tags(rng, recipe_ids, tags):
+    """Rows of the recipe tags, from one to three for every recipe"""
+
+    for recipe_id in recipe_ids:
+        for tag_id in tags.sample_distinct(rng.randint(1, RECIPE_TAGS_MAX)):
+            yield recipe_id, tag_id
+
+
+def generate_relations(relations, first_user_id, first_target_id):
+    """Rows of the relations sampled by the sample_relations"""
+
+    pub_date = timezone.now().date().isoformat()
+
+    for user_index, target_index in zip(*relations):
+        yield (
+            first_user_id + user_index,
+            first_target_id + target_index,
+            pub_date
+        )
+
+
+def check_dataset_allowed(allow_production=False):
+    """
+    Checking that the synthetic dataset may be generated:
+    its users share the DATASET_PASSWORD, so it must be set,
+    and outside of DEBUG the generation must be allowed explicitly
+    """
+
+    if not settings.DATASET_PASSWORD:
+        raise CommandError(
+            'Задайте пароль пользователей синтетического набора данных '
+            'в переменной окружения DATASET_PASSWORD'
+        )
+
+    if not settings.DEBUG and not allow_production:
+        raise CommandError(
+            'Синтетический набор данных создается только при DEBUG, '
+            'добавьте --allow-production, чтобы создать его без DEBUG'
+        )
+
+
+@transaction.atomic
+def seed_dataset(users=100, recipes=1000, ingredients=500, tags=5,
+                 favorites=20, shopping_carts=5, subscriptions=5, seed=0,
+                 zipf_exponent=DEFAULT_ZIPF_EXPONENT):
+    """
+    Replacing the synthetic dataset with a new one generated
+    from the seed, so every run gets the same data.
+    Authors, ingredients, favorite recipes and the activity of users
+    follow the Zipf law. The relations are sampled in memory first,
+    so the counters are written together with the rows,
+    and the rows are written by COPY instead of a query per object.
+    The search index and the cached versions are updated at the end
+    """
+
+    rng = random.Random(seed)
+
+    clear_dataset()
+
+    first_user_id = get_next_id(User)
+    first_recipe_id = get_next_id(Recipe)
+    recipe_ids = range(first_recipe_id, first_recipe_id + recipes)
+
+    tag_ids = [
+        tag.id for tag in Tag.objects.bulk_create([
+            Tag(
+                name=f'{DATASET_PREFIX} {index}',
+                color=DATASET_TAG_COLORS[index % len(DATASET_TAG_COLORS)],
+                slug=f'{DATASET_PREFIX}-{index}'
+            )
+            for index in range(tags)
+        ])
+    ]
+    ingredient_ids = [
+        ingredient.id for ingredient in Ingredient.objects.bulk_create(
+            [
+                Ingredient(
+                    name=f'{DATASET_PREFIX} {rng.choice(DATASET_WORDS)} '
+                         f'{index}',
+                    measurement_unit='г'
+                )
+                for index in range(ingredients)
+            ],
+            batch_size=BATCH_SIZE
+        )
+    ]
+
+    authors = ZipfSampler(rng, range(users), zipf_exponent).sample(recipes)
+    popular_recipes = ZipfSampler(rng, range(recipes), zipf_exponent)
+    popular_authors = ZipfSampler(rng, range(users), zipf_exponent)
+    recipes_counts = array('q', bytes(8 * users))
+    subscribers_counts = array('q', bytes(8 * users))
+    favorites_counts = array('q', bytes(8 * recipes))
+    shopping_carts_counts = array('q', bytes(8 * recipes))
+
+    for author in authors:
+        recipes_counts[author] += 1
+
+    favorite_relations = sample_relations(
+        rng,
+        get_zipf_counts(
+            rng, users, favorites,
+            min(MAX_FAVORITES_PER_USER, recipes), zipf_exponent
+        ),
+        popular_recipes,
+        favorites_counts
+    )
+    shopping_cart_relations = sample_relations(
+        rng,
+        get_zipf_counts(
+            rng, users, shopping_carts,
+            min(MAX_SHOPPING_CARTS_PER_USER, recipes), zipf_exponent
+        ),
+        popular_recipes,
+        shopping_carts_counts
+    )
+    subscription_relations = sample_relations(
+        rng,
+        get_zipf_counts(
+            rng, users, subscriptions,
+            min(MAX_SUBSCRIPTIONS_PER_USER, users - 1), zipf_exponent
+        ),
+        popular_authors,
+        subscribers_counts,
+        exclude_self=True
+    )
+
+    insert_rows(
+        User,
+        (
+            'id', 'password', 'is_superuser', 'username', 'first_name',
+            'last_name', 'email', 'is_staff', 'is_active', 'date_joined',
+            'recipes_count', 'subscribers_count'
+        ),
+        generate_users(
+            users, first_user_id, recipes_counts, subscribers_counts
+        )
+    )
+    created = timezone.now().isoformat()
+    insert_rows(
+        Token,
+        ('key', 'user', 'created'),
+        (
+            (Token.generate_key(), first_user_id + index, created)
+            for index in range(users)
+        )
+    )
+    insert_rows(
+        Recipe,
+        (
+            'id', 'author', 'image', 'image_hash', 'name', 'text',
+            'cooking_time', 'pub_date', 'created_at', 'updated_at',
+            'favorites_count', 'shopping_carts_count'
+        ),
+        generate_recipes(
+            rng, authors, first_recipe_id, first_user_id,
+            favorites_counts, shopping_carts_counts
+        )
+    )
+    reset_sequences(User, Recipe)
+
+    insert_rows(
+        RecipeIngredient,
+        ('recipe', 'ingredient', 'amount'),
+        generate_recipe_ingredients(
+            rng, recipe_ids, ZipfSampler(rng, ingredient_ids, zipf_exponent)
+        )
+    )
+    insert_rows(
+        RecipeTag,
+        ('recipe', 'tag'),
+        generate_recipe_tags(
+            rng, recipe_ids, ZipfSampler(rng, tag_ids, zipf_exponent)
+        )
+    )
+    insert_rows(
+        UserFavorite,
+        ('user', 'recipe', 'pub_date'),
+        generate_relations(favorite_relations, first_user_id, first_recipe_id)
+    )
+    insert_rows(
+        UserShoppingCart,
+        ('user', 'recipe', 'pub_date'),
+        generate_relations(
+            shopping_cart_relations, first_user_id, first_recipe_id
+        )
+    )
+    insert_rows(
+        Subscription,
+        ('user', 'author', 'pub_date'),
+        generate_relations(
+            subscription_relations, first_user_id, first_user_id
+        )
+    )
+
+    Job.objects.create(name=DATASET_JOB_NAME, status=Job.DONE)
+    update_search_index_in_batches(recipe_ids)
+
+    return {
+        'users': users,
+        'recipes': recipes,
+        'ingredients': len(ingredient_ids),
+        'tags': len(tag_ids),
+        'favorites': len(favorite_relations[0]),
+        'shopping_carts': len(shopping_cart_relations[0]),
+        'subscriptions': len(subscription_relations[0]),
+        'seed': seed,
+        'zipf_exponent': zipf_exponent,
+    }
@@ -0,0 +1,158 @@
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from foodgram.models import Recipe
+from foodgram.storages import get_content_hash
+from jobs.tasks import task
+
+IMAGE_VARIANTS_PATH = 'foodgram/images/{image_hash}/{size}.{extension}'
+IMAGE_SIZES = {
+    'small': 320,
+    'medium': 640,
+    'large': 1280,
+}
+IMAGE_FORMATS = {
+    'jpeg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+}
+
+
+def get_image_variant_name(image_hash, size, extension):
+    """Getting the storage name of the image variant"""
+
+    return IMAGE_VARIANTS_PATH.format(
+        image_hash=image_hash, size=size, extension=extension
+    )
+
+
+def get_image_name_hash(name):
+    """Getting the content hash from the name of the stored image"""
+
+    return posixpath.splitext(posixpath.basename(name))[0]
+
+
+def has_image_variants(recipe):
+    """Checking if the variants of the current recipe image are ready"""
+
+    return bool(recipe.image) and (
+        recipe.image_hash == get_image_name_hash(recipe.image.name)
+    )
+
+
+def normalize_image(image):
+    """Applying the EXIF orientation and flattening to RGB"""
+
+    image = ImageOps.exif_transpose(image)
+
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+
+    return image.convert('RGB')
+
+
+def save_image_variants(image, image_hash):
+    """
+    Saving the resized variants of the image in every format,
+    variants already stored for the same content are reused
+    """
+
+    for size, max_side in IMAGE_SIZES.items():
+        resized = None
+
+        for extension, (image_format, options) in IMAGE_FORMATS.items():
+            name = get_image_variant_name(image_hash, size, extension)
+
+            if default_storage.exists(name):
+                continue
+
+            if resized is None:
+                resized = image.copy()
+                resized.thumbnail(
+                    (max_side, max_side), Image.Resampling.LANCZOS
+                )
+
+            buffer = BytesIO()
+            resized.save(buffer, image_format, **options)
+            default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+@task()
+def process_recipe_image(recipe_id):
+    """
+    Resizing the recipe image and storing it under its content hash,
+    the recipe is marked as processed only if its image was not
+    replaced in the meantime
+    """
+
+    recipe = Recipe.objects.filter(pk=recipe_id).only('image').first()
+
+    if recipe is None or not recipe.image:
+        return
+
+    image_field = recipe.image
+    name = image_field.name
+
+    with image_field.open('rb'):
+        image_hash = get_content_hash(image_field)
+
+        with Image.open(image_field) as image:
+            image.load()
+            image = normalize_image(image)
+
+    save_image_variants(image, image_hash)
+
+    if get_image_name_hash(name) != image_hash:
+        with image_field.open('rb'):
+            new_name = image_field.storage.save(name, image_field)
+    else:
+        new_name = name
+
+    Recipe.objects.filter(pk=recipe_id, image=name).update(
+        image=new_name, image_hash=image_hash, updated_at=timezone.now()
+    )
+
+
+def get_image_urls(recipe, request=None):
+    """
+    Getting the urls of the recipe image variants,
+    the original image is used until the variants are ready
+    """
+
+    if not recipe.image:
+        return None
+
+    if has_image_variants(recipe):
+        urls = {
+            size: {
+                extension: default_storage.url(
+                    get_image_variant_name(recipe.image_hash, size, extension)
+                )
+                for extension in IMAGE_FORMATS
+            }
+            for size in IMAGE_SIZES
+        }
+    else:
+        url = recipe.image.url
+        urls = {
+            size: {extension: url for extension in IMAGE_FORMATS}
+            for size in IMAGE_SIZES
+        }
+
+    if request is not None:
+        urls = {
+            size: {
+                extension: request.build_absolute_uri(url)
+                for extension, url in variants.items()
+            }
+            for size, variants in urls.items()
+        }
+
+    return urls
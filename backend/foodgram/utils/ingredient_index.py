@@ -0,0 +1,105 @@
+import threading
+from bisect import bisect_left
+
+from foodgram.models import Ingredient
+from foodgram.serializers import IngredientSerializer
+from foodgram.utils.versions import INGREDIENTS_VERSION_NAME, get_version
+
+
+def normalize_name(name):
+    """Case folding the name, the letter ё is searched as е"""
+
+    return name.casefold().replace('ё', 'е')
+
+
+class IngredientIndex:
+    """
+    Ingredient autocomplete index kept in the memory of the worker.
+    Serialized ingredients are sorted by the normalized name,
+    so prefix matches are found by a binary search.
+    The index is rebuilt when the ingredients version changes
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._names = []
+        self._ingredients = []
+        self._ingredients_by_id = {}
+
+    def _build(self, version):
+        """Loading the ingredients from the database"""
+
+        ingredients = IngredientSerializer(
+            Ingredient.objects.all(), many=True
+        ).data
+        entries = sorted(
+            (normalize_name(ingredient['name']), ingredient['id'], ingredient)
+            for ingredient in ingredients
+        )
+
+        self._names = [name for name, _, _ in entries]
+        self._ingredients = [ingredient for _, _, ingredient in entries]
+        self._ingredients_by_id = {
+            ingredient['id']: ingredient for ingredient in ingredients
+        }
+        self._version = version
+
+    def _refresh(self):
+        """Rebuilding the index if the ingredients have changed"""
+
+        version = get_version(INGREDIENTS_VERSION_NAME)
+
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._build(version)
+
+        return self._names, self._ingredients
+
+    def get_many(self, ingredient_ids):
+        """Getting the serialized ingredients by their ids"""
+
+        self._refresh()
+        ingredients_by_id = self._ingredients_by_id
+
+        return [
+            ingredients_by_id[ingredient_id]
+            for ingredient_id in ingredient_ids
+            if ingredient_id in ingredients_by_id
+        ]
+
+    def search(self, query='', limit=None):
+        """
+        Searching ingredients whose names start with the query,
+        followed by the ones containing it, earlier occurrences first
+        """
+
+        names, ingredients = self._refresh()
+        query = normalize_name(query)
+
+        if not query:
+            return ingredients[:limit]
+
+        start = bisect_left(names, query)
+        end = start
+
+        while end < len(names) and names[end].startswith(query):
+            end += 1
+
+        result = ingredients[start:end]
+
+        if limit is not None and len(result) >= limit:
+            return result[:limit]
+
+        contains = sorted(
+            (position, len(name), number)
+            for number, name in enumerate(names)
+            if (position := name.find(query)) > 0
+        )
+        result += [ingredients[number] for _, _, number in contains]
+
+        return result[:limit]
+
+
+ingredient_index = IngredientIndex()
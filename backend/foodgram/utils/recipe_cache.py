@@ -0,0 +1,143 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import IntegerField, Value
+
+from foodgram.utils.versions import (
+    INGREDIENTS_VERSION_NAME,
+    RECIPE_FRAGMENTS_VERSION_NAME,
+    TAGS_VERSION_NAME,
+    get_versions
+)
+from users.models import Subscription, UserFavorite, UserShoppingCart
+
+RECIPE_FRAGMENT_KEY = 'recipe_fragment:{prefix}:{recipe_id}:{updated_at}'
+FAVORITE_FLAG = 0
+SHOPPING_CART_FLAG = 1
+SUBSCRIPTION_FLAG = 2
+
+
+def get_fragment_prefix():
+    """
+    Prefix of the recipe fragment keys, changed with
+    the tags and ingredients, which are shared by many recipes
+    """
+
+    versions = get_versions(
+        TAGS_VERSION_NAME,
+        INGREDIENTS_VERSION_NAME,
+        RECIPE_FRAGMENTS_VERSION_NAME
+    )
+
+    return hashlib.md5(':'.join(versions).encode()).hexdigest()
+
+
+def get_fragment_key(prefix, recipe):
+    """
+    Key of the viewer independent part of the recipe with its author.
+    Changes of the recipe, its relations and its author move
+    the updated_at of the recipe and so the key, stale fragments
+    are never read and need no invalidation
+    """
+
+    return RECIPE_FRAGMENT_KEY.format(
+        prefix=prefix,
+        recipe_id=recipe.id,
+        updated_at=recipe.updated_at.timestamp()
+    )
+
+
+def get_fragments(prefix, recipes):
+    """
+    Getting the cached recipes by one cache query,
+    the missing ones are absent from the returned dict
+    """
+
+    keys = {get_fragment_key(prefix, recipe): recipe.id for recipe in recipes}
+
+    return {
+        keys[key]: value for key, value in cache.get_many(keys).items()
+    }
+
+
+def set_fragments(prefix, fragments):
+    """
+    Caching the serialized recipes by one cache query,
+    the fragments are pairs of the recipe and its data
+    """
+
+    values = {
+        get_fragment_key(prefix, recipe): data for recipe, data in fragments
+    }
+
+    if values:
+        cache.set_many(values, settings.RECIPE_FRAGMENT_CACHE_TIMEOUT)
+
+
+def get_viewer_flags(user, recipe_ids, author_ids):
+    """
+    Getting the recipes favorited and put into the shopping cart
+    by the user and the authors the user is subscribed to,
+    all of them by one query
+    """
+
+    favorites, shopping_carts, subscriptions = set(), set(), set()
+
+    if user.is_anonymous or not recipe_ids:
+        return favorites, shopping_carts, subscriptions
+
+    def flag(value):
+        return Value(value, output_field=IntegerField())
+
+    rows = UserFavorite.objects.filter(
+        user=user, recipe_id__in=recipe_ids
+    ).annotate(flag=flag(FAVORITE_FLAG)).values_list(
+        'recipe_id', 'flag'
+    ).order_by().union(
+        UserShoppingCart.objects.filter(
+            user=user, recipe_id__in=recipe_ids
+        ).annotate(flag=flag(SHOPPING_CART_FLAG)).values_list(
+            'recipe_id', 'flag'
+        ).order_by(),
+        Subscription.objects.filter(
+            user=user, author_id__in=author_ids
+        ).annotate(flag=flag(SUBSCRIPTION_FLAG)).values_list(
+            'author_id', 'flag'
+        ).order_by(),
+        all=True
+    )
+    flags = {
+        FAVORITE_FLAG: favorites,
+        SHOPPING_CART_FLAG: shopping_carts,
+        SUBSCRIPTION_FLAG: subscriptions,
+    }
+
+    for object_id, kind in rows:
+        flags[kind].add(object_id)
+
+    return favorites, shopping_carts, subscriptions
+
+
+def build_absolute_image_urls(data, request):
+    """
+    Making the image urls of the cached recipe absolute,
+    the fragments are serialized without the request
+    """
+
+    if request is None:
+        return data
+
+    if data['image']:
+        data['image'] = request.build_absolute_uri(data['image'])
+
+    if data['image_sizes']:
+        data['image_sizes'] = {
+            size: {
+                extension: request.build_absolute_uri(url)
+                for extension, url in variants.items()
+            }
+            for size, variants in data['image_sizes'].items()
+        }
+
+    return data
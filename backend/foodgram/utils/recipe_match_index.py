@@ -0,0 +1,270 @@
+import heapq
+import threading
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+
+from foodgram.models import RecipeIngredient
+from foodgram.utils.versions import (
+    RECIPE_INGREDIENTS_VERSION_NAME,
+    bump_version,
+    get_version
+)
+
+CHANGES_COUNT_KEY = 'recipe_match_index:{version}:count'
+CHANGES_KEY = 'recipe_match_index:{version}:{number}'
+CHANGES_TIMEOUT = 60 * 60
+MAX_CHANGES = 100
+
+
+def remove_sorted(values, value):
+    """Removing the value from the sorted array"""
+
+    position = bisect_left(values, value)
+
+    if position < len(values) and values[position] == value:
+        del values[position]
+
+
+def get_rows(recipe_ids):
+    """Loading the ingredients of the recipes from the database"""
+
+    return list(RecipeIngredient.objects.filter(
+        recipe_id__in=recipe_ids
+    ).order_by('recipe_id', 'ingredient_id').values_list(
+        'recipe_id', 'ingredient_id'
+    ))
+
+
+def get_changes_count(version):
+    """
+    Getting the number of changes made to the index of the version,
+    None if the counter was lost from the cache
+    """
+
+    return cache.get(CHANGES_COUNT_KEY.format(version=version))
+
+
+def get_changes(version, first, last):
+    """
+    Getting the ids of the recipes changed by the changes
+    from first to last, None if any of them was lost from the cache
+    """
+
+    keys = [
+        CHANGES_KEY.format(version=version, number=number)
+        for number in range(first, last + 1)
+    ]
+    changes = cache.get_many(keys)
+
+    if len(changes) != len(keys):
+        return None
+
+    return {
+        recipe_id
+        for recipe_ids in changes.values()
+        for recipe_id in recipe_ids
+    }
+
+
+def add_changes(version, recipe_ids):
+    """
+    Adding the changed recipes to the changelog of the version,
+    returning the number of the change.
+    A lost counter starts a new version, so every worker rebuilds
+    """
+
+    try:
+        number = cache.incr(CHANGES_COUNT_KEY.format(version=version))
+    except ValueError:
+        bump_version(RECIPE_INGREDIENTS_VERSION_NAME)
+        return None
+
+    cache.set(
+        CHANGES_KEY.format(version=version, number=number),
+        recipe_ids,
+        CHANGES_TIMEOUT
+    )
+
+    return number
+
+
+class RecipeMatchIndex:
+    """
+    Inverted index from ingredients to recipes kept in the memory
+    of the worker, for ranking recipes by the available ingredients.
+    Both the recipes of an ingredient and the ingredients of a recipe
+    are stored as sorted integer arrays.
+    Changed recipes are logged in the cache by numbered changes
+    of the version, every worker applies the changes it missed
+    incrementally and rebuilds the index only when the log is lost
+    or too long. Changes are applied to copies which are swapped
+    in at once, so a match never sees a half applied change
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._changes_count = None
+        self._recipes = {}
+        self._ingredients = {}
+
+    def _build(self, version):
+        """Loading the ingredients of all recipes from the database"""
+
+        cache.add(CHANGES_COUNT_KEY.format(version=version), 0, None)
+        changes_count = get_changes_count(version)
+        recipes = {}
+        ingredients = {}
+        rows = RecipeIngredient.objects.order_by(
+            'recipe_id', 'ingredient_id'
+        ).values_list('recipe_id', 'ingredient_id')
+
+        for recipe_id, ingredient_id in rows.iterator():
+            recipes.setdefault(recipe_id, array('q')).append(ingredient_id)
+            ingredients.setdefault(ingredient_id, array('q')).append(
+                recipe_id
+            )
+
+        self._recipes = recipes
+        self._ingredients = ingredients
+        self._version = version
+        self._changes_count = changes_count
+
+    def _refresh(self):
+        """Applying the changes made by other workers"""
+
+        version = get_version(RECIPE_INGREDIENTS_VERSION_NAME)
+        changes_count = get_changes_count(version)
+
+        if (version, changes_count) == (self._version, self._changes_count):
+            return
+
+        with self._lock:
+            if (
+                version != self._version
+                or changes_count is None
+                or self._changes_count is None
+                or changes_count < self._changes_count
+                or changes_count - self._changes_count > MAX_CHANGES
+            ):
+                self._build(version)
+                return
+
+            recipe_ids = get_changes(
+                version, self._changes_count + 1, changes_count
+            )
+
+            if recipe_ids is None:
+                self._build(version)
+                return
+
+            self._apply(recipe_ids, get_rows(recipe_ids))
+            self._changes_count = changes_count
+
+    def _apply(self, recipe_ids, rows):
+        """
+        Replacing the ingredients of the recipes with the loaded ones
+        in copies of the index, which are swapped in together
+        """
+
+        recipes = dict(self._recipes)
+        ingredients = dict(self._ingredients)
+        copied = set()
+
+        def get_recipes(ingredient_id):
+            """Getting the copy of the recipes of the ingredient"""
+
+            if ingredient_id not in copied:
+                copied.add(ingredient_id)
+                ingredients[ingredient_id] = array(
+                    'q', ingredients.get(ingredient_id, ())
+                )
+
+            return ingredients[ingredient_id]
+
+        for recipe_id in recipe_ids:
+            for ingredient_id in recipes.pop(recipe_id, ()):
+                remove_sorted(get_recipes(ingredient_id), recipe_id)
+
+        for recipe_id, ingredient_id in rows:
+            recipes.setdefault(recipe_id, array('q')).append(ingredient_id)
+            insort(get_recipes(ingredient_id), recipe_id)
+
+        self._recipes = recipes
+        self._ingredients = ingredients
+
+    def update_recipes(self, *recipe_ids):
+        """
+        Replacing the ingredients of the recipes in the index
+        with the ones stored in the database
+        and logging the change for the other workers
+        """
+
+        rows = get_rows(recipe_ids)
+
+        with self._lock:
+            self._apply(recipe_ids, rows)
+            version = get_version(RECIPE_INGREDIENTS_VERSION_NAME)
+            number = add_changes(version, recipe_ids)
+
+            if (
+                number is not None
+                and version == self._version
+                and self._changes_count == number - 1
+            ):
+                self._changes_count = number
+
+    def match(self, ingredient_ids, limit):
+        """
+        Ranking the recipes by the share of their ingredients
+        that are available, then by the number of missing ones.
+        Returns recipe ids with the coverage and the missing ingredients
+        """
+
+        self._refresh()
+
+        with self._lock:
+            recipes, ingredients = self._recipes, self._ingredients
+
+        available = set(ingredient_ids)
+        matched = Counter()
+
+        for ingredient_id in available:
+            matched.update(ingredients.get(ingredient_id, ()))
+
+        best = heapq.nlargest(
+            limit,
+            matched.items(),
+            key=lambda item: (
+                item[1] / len(recipes[item[0]]),
+                item[1] - len(recipes[item[0]]),
+                item[0]
+            )
+        )
+
+        return [
+            (
+                recipe_id,
+                count / len(recipes[recipe_id]),
+                [
+                    ingredient_id for ingredient_id in recipes[recipe_id]
+                    if ingredient_id not in available
+                ]
+            )
+            for recipe_id, count in best
+        ]
+
+
+recipe_match_index = RecipeMatchIndex()
+
+
+def update_recipe_match_index(recipe_id):
+    """Updating the recipe in the index after the transaction is committed"""
+
+    transaction.on_commit(
+        lambda: recipe_match_index.update_recipes(recipe_id)
+    )
@@ -0,0 +1,216 @@
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+
+from foodgram.utils.search import is_postgresql
+
+ADD_RELATION_SQL = '''
+WITH changed AS (
+    INSERT INTO {table} ({user_column}, {target_column}, {date_column})
+    SELECT %s, {target_pk}, CURRENT_DATE
+    FROM {target_table} WHERE {target_pk} = %s
+    ON CONFLICT DO NOTHING
+    RETURNING {target_column}
+), counted AS (
+    UPDATE {target_table} SET {counter} = {counter} + 1
+    WHERE {target_pk} IN (SELECT {target_column} FROM changed)
+)
+SELECT
+    EXISTS (SELECT 1 FROM {target_table} WHERE {target_pk} = %s),
+    EXISTS (SELECT 1 FROM changed)
+'''
+DELETE_RELATION_SQL = '''
+WITH changed AS (
+    DELETE FROM {table}
+    WHERE {user_column} = %s AND {target_column} = %s
+    RETURNING {target_column}
+), counted AS (
+    UPDATE {target_table} SET {counter} = {counter} - 1
+    WHERE {target_pk} IN (SELECT {target_column} FROM changed)
+)
+SELECT
+    EXISTS (SELECT 1 FROM {target_table} WHERE {target_pk} = %s),
+    EXISTS (SELECT 1 FROM changed)
+'''
+ADD_RELATIONS_SQL = '''
+WITH changed AS (
+    INSERT INTO {table} ({user_column}, {target_column}, {date_column})
+    SELECT %s, {target_pk}, CURRENT_DATE
+    FROM {target_table} WHERE {target_pk} = ANY(%s)
+    ON CONFLICT DO NOTHING
+    RETURNING {target_column}
+), counted AS (
+    UPDATE {target_table} SET {counter} = {counter} + 1
+    WHERE {target_pk} IN (SELECT {target_column} FROM changed)
+)
+SELECT {target_pk}, {target_pk} IN (SELECT {target_column} FROM changed)
+FROM {target_table} WHERE {target_pk} = ANY(%s)
+'''
+DELETE_RELATIONS_SQL = '''
+WITH changed AS (
+    DELETE FROM {table}
+    WHERE {user_column} = %s AND {target_column} = ANY(%s)
+    RETURNING {target_column}
+), counted AS (
+    UPDATE {target_table} SET {counter} = {counter} - 1
+    WHERE {target_pk} IN (SELECT {target_column} FROM changed)
+)
+SELECT {target_pk}, {target_pk} IN (SELECT {target_column} FROM changed)
+FROM {target_table} WHERE {target_pk} = ANY(%s)
+'''
+
+
+def execute_relation_sql(sql, model, target_field, counter_field,
+                         user_id, target_id, fetch_all=False):
+    """
+    Running the relation statement built for the model,
+    the target id may be a list of them for the bulk statements
+    """
+
+    quote_name = connection.ops.quote_name
+    target = model._meta.get_field(target_field)
+    target_model = target.related_model
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql.format(
+                table=quote_name(model._meta.db_table),
+                user_column=quote_name(model._meta.get_field('user').column),
+                target_column=quote_name(target.column),
+                date_column=quote_name(
+                    model._meta.get_field('pub_date').column
+                ),
+                target_table=quote_name(target_model._meta.db_table),
+                target_pk=quote_name(target_model._meta.pk.column),
+                counter=quote_name(
+                    target_model._meta.get_field(counter_field).column
+                )
+            ),
+            [user_id, target_id, target_id]
+        )
+
+        return cursor.fetchall() if fetch_all else cursor.fetchone()
+
+
+def add_relation(model, target_field, counter_field, user_id, target_id):
+    """
+    Adding the user's recipe or author to the list in one statement
+    that is safe against concurrent requests,
+    the counter of the target grows only if the row was inserted.
+    Returns whether the target exists and whether it was added
+    """
+
+    if is_postgresql():
+        return execute_relation_sql(
+            ADD_RELATION_SQL, model, target_field, counter_field,
+            user_id, target_id
+        )
+
+    target_model = model._meta.get_field(target_field).related_model
+
+    with transaction.atomic():
+        if not target_model.objects.filter(pk=target_id).exists():
+            return False, False
+
+        try:
+            with transaction.atomic():
+                model.objects.create(
+                    user_id=user_id, **{f'{target_field}_id': target_id}
+                )
+        except (IntegrityError, ValidationError):
+            return True, False
+
+        target_model.objects.filter(pk=target_id).update(
+            **{counter_field: F(counter_field) + 1}
+        )
+
+    return True, True
+
+
+def delete_relation(model, target_field, counter_field, user_id, target_id):
+    """
+    Removing the user's recipe or author from the list in one statement,
+    the counter of the target drops only if the row was deleted.
+    Returns whether the target exists and whether it was removed
+    """
+
+    if is_postgresql():
+        return execute_relation_sql(
+            DELETE_RELATION_SQL, model, target_field, counter_field,
+            user_id, target_id
+        )
+
+    target_model = model._meta.get_field(target_field).related_model
+
+    with transaction.atomic():
+        if not target_model.objects.filter(pk=target_id).exists():
+            return False, False
+
+        deleted, _ = model.objects.filter(
+            user_id=user_id, **{f'{target_field}_id': target_id}
+        ).delete()
+
+        if not deleted:
+            return True, False
+
+        target_model.objects.filter(pk=target_id).update(
+            **{counter_field: F(counter_field) - 1}
+        )
+
+    return True, True
+
+
+def add_relations(model, target_field, counter_field, user_id, target_ids):
+    """
+    Adding many recipes or authors to the user's list,
+    the counters grow only for the rows that were inserted
+    by this request, whatever concurrent requests do.
+    Returns whether each existing target was added
+    """
+
+    if is_postgresql():
+        return dict(execute_relation_sql(
+            ADD_RELATIONS_SQL, model, target_field, counter_field,
+            user_id, list(target_ids), fetch_all=True
+        ))
+
+    results = {}
+
+    with transaction.atomic():
+        for target_id in target_ids:
+            exists, added = add_relation(
+                model, target_field, counter_field, user_id, target_id
+            )
+
+            if exists:
+                results[target_id] = added
+
+    return results
+
+
+def delete_relations(model, target_field, counter_field, user_id,
+                     target_ids):
+    """
+    Removing many recipes or authors from the user's list,
+    the counters drop only for the rows deleted by this request.
+    Returns whether each existing target was removed
+    """
+
+    if is_postgresql():
+        return dict(execute_relation_sql(
+            DELETE_RELATIONS_SQL, model, target_field, counter_field,
+            user_id, list(target_ids), fetch_all=True
+        ))
+
+    results = {}
+
+    with transaction.atomic():
+        for target_id in target_ids:
+            exists, deleted = delete_relation(
+                model, target_field, counter_field, user_id, target_id
+            )
+
+            if exists:
+                results[target_id] = deleted
+
+    return results
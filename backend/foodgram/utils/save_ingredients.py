@@ -1,8 +1,13 @@
 from foodgram.models import RecipeIngredient
+from foodgram.utils.recipe_match_index import update_recipe_match_index
+from foodgram.utils.search import update_search_index
 
 
 def save_ingredients_for_recipe(ingredients_data, recipe):
-    """Saving recipe ingredients"""
+    """
+    Saving recipe ingredients and updating the recipe search
+    and ingredient match indexes
+    """
 
     recipe_ingredients_to_create = []
 
@@ -17,3 +22,5 @@ def save_ingredients_for_recipe(ingredients_data, recipe):
         )
 
     RecipeIngredient.objects.bulk_create(recipe_ingredients_to_create)
+    update_search_index(recipe.pk)
+    update_recipe_match_index(recipe.pk)
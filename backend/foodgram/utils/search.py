@@ -0,0 +1,159 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector
+)
+from django.db import connection
+from django.db.models import (
+    F,
+    FloatField,
+    OuterRef,
+    Subquery,
+    TextField,
+    Value
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+from foodgram.models import Ingredient, Recipe, RecipeIngredient
+
+SEARCH_CONFIG = 'russian'
+FTS_TABLE = 'foodgram_recipe_fts'
+FTS_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def is_postgresql():
+    """Checking if the database supports tsvector search"""
+
+    return connection.vendor == 'postgresql'
+
+
+def postgresql_search_vector():
+    """
+    Search vector of the recipe weighted by
+    the name, then the ingredients, then the description
+    """
+
+    ingredient_names = Subquery(
+        RecipeIngredient.objects.filter(
+            recipe=OuterRef('pk')
+        ).order_by().values('recipe').annotate(
+            names=StringAgg('ingredient__name', ' ')
+        ).values('names')
+    )
+
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(
+            Coalesce(ingredient_names, Value(''), output_field=TextField()),
+            weight='B',
+            config=SEARCH_CONFIG
+        )
+        + SearchVector('text', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def sqlite_fts_insert_sql(condition):
+    """Query copying the recipes into the fts5 table"""
+
+    return (
+        f'INSERT INTO {FTS_TABLE} (rowid, name, ingredients, text) '
+        f'SELECT recipe.id, recipe.name, COALESCE(('
+        f'SELECT group_concat(ingredient.name, \' \') '
+        f'FROM {RecipeIngredient._meta.db_table} recipe_ingredient '
+        f'JOIN {Ingredient._meta.db_table} ingredient '
+        f'ON ingredient.id = recipe_ingredient.ingredient_id '
+        f'WHERE recipe_ingredient.recipe_id = recipe.id'
+        f'), \'\'), recipe.text '
+        f'FROM {Recipe._meta.db_table} recipe WHERE {condition}'
+    )
+
+
+def update_search_index(*recipe_ids):
+    """Updating the search index of the recipes after they were changed"""
+
+    if is_postgresql():
+        Recipe.objects.filter(pk__in=recipe_ids).update(
+            search_vector=postgresql_search_vector()
+        )
+        return
+
+    placeholders = ', '.join(['%s'] * len(recipe_ids))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})',
+            recipe_ids
+        )
+        cursor.execute(
+            sqlite_fts_insert_sql(f'recipe.id IN ({placeholders})'),
+            recipe_ids
+        )
+
+
+def setup_search_index(**kwargs):
+    """
+    Creating the fts5 table of the search fallback on SQLite
+    after the migrations, recipes that are not indexed yet are indexed.
+    On PostgreSQL the search vector and its GIN index
+    are managed by the migrations
+    """
+
+    if is_postgresql():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+            f'USING fts5(name, ingredients, text, tokenize=\'unicode61\')'
+        )
+        cursor.execute(sqlite_fts_insert_sql(
+            f'recipe.id NOT IN (SELECT rowid FROM {FTS_TABLE})'
+        ))
+
+
+def sqlite_fts_query(value):
+    """Query of the fts5 table: every word is searched as a prefix"""
+
+    words = value.replace('"', ' ').split()
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_recipes(queryset, value):
+    """
+    Filtering the recipes by the search query
+    and annotating them with the rank, the higher the better
+    """
+
+    if is_postgresql():
+        query = SearchQuery(
+            value, config=SEARCH_CONFIG, search_type='websearch'
+        )
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query)
+        )
+
+    fts_query = sqlite_fts_query(value)
+
+    if not fts_query:
+        return queryset.none().annotate(
+            rank=Value(0.0, output_field=FloatField())
+        )
+
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+
+    return queryset.filter(
+        id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (fts_query,)
+        )
+    ).annotate(
+        rank=RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s '
+            f'AND rowid = {Recipe._meta.db_table}.id',
+            (fts_query,),
+            output_field=FloatField()
+        )
+    )
@@ -0,0 +1,213 @@
+import csv
+import hashlib
+import json
+from io import BytesIO
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from foodgram.models import RecipeIngredient
+from foodgram.utils.versions import INGREDIENTS_VERSION_NAME, get_version
+from users.models import UserShoppingCart
+
+PDF_FONT_NAME = 'ShoppingCartFont'
+PDF_FONT_SIZE = 12
+PDF_MARGIN = 50
+PDF_LINE_HEIGHT = 18
+SHOPPING_CART_STREAM_BATCH_SIZE = 100
+SHOPPING_CART_CONTENT_KEY = 'shopping_cart:{user_id}:{version}:{format}'
+
+
+def get_shopping_cart_ingredients(user):
+    """
+    Ingredients from the user's shopping cart,
+    summed up by name and measurement unit in the database
+    """
+
+    return RecipeIngredient.objects.filter(
+        recipe__user_shopping_cart_recipe__user=user
+    ).values(
+        'ingredient__name', 'ingredient__measurement_unit'
+    ).annotate(
+        amount=Sum('amount')
+    ).order_by('ingredient__name', 'ingredient__measurement_unit')
+
+
+def generate_shopping_cart_text(ingredients):
+    """Generating the lines of the shopping list text file"""
+
+    yield 'Shopping list:\n'
+
+    for ingredient in ingredients.iterator():
+        yield (
+            f' - {ingredient["ingredient__name"]} '
+            f'({ingredient["ingredient__measurement_unit"]}) '
+            f'— {ingredient["amount"]}\n'
+        )
+
+
+class Echo:
+    """Pseudo-buffer returning the written value instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+def generate_shopping_cart_csv(ingredients):
+    """Generating the rows of the shopping list csv file"""
+
+    writer = csv.writer(Echo())
+
+    yield writer.writerow(('name', 'measurement_unit', 'amount'))
+
+    for ingredient in ingredients.iterator():
+        yield writer.writerow((
+            ingredient['ingredient__name'],
+            ingredient['ingredient__measurement_unit'],
+            ingredient['amount']
+        ))
+
+
+def generate_shopping_cart_json(ingredients):
+    """Generating the shopping list json file as an array of objects"""
+
+    yield '['
+
+    for number, ingredient in enumerate(ingredients.iterator()):
+        item = json.dumps(
+            {
+                'name': ingredient['ingredient__name'],
+                'measurement_unit': ingredient['ingredient__measurement_unit'],
+                'amount': ingredient['amount']
+            },
+            ensure_ascii=False
+        )
+        yield f',{item}' if number else item
+
+    yield ']'
+
+
+def generate_shopping_cart_pdf(ingredients):
+    """Generating the shopping list pdf file"""
+
+    if PDF_FONT_NAME not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(
+            TTFont(PDF_FONT_NAME, settings.SHOPPING_CART_PDF_FONT)
+        )
+
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    pdf.setFont(PDF_FONT_NAME, PDF_FONT_SIZE)
+    position = height - PDF_MARGIN
+
+    for line in generate_shopping_cart_text(ingredients):
+        if position < PDF_MARGIN:
+            pdf.showPage()
+            pdf.setFont(PDF_FONT_NAME, PDF_FONT_SIZE)
+            position = height - PDF_MARGIN
+
+        pdf.drawString(PDF_MARGIN, position, line.rstrip('\n'))
+        position -= PDF_LINE_HEIGHT
+
+    pdf.save()
+    yield buffer.getvalue()
+
+
+SHOPPING_CART_GENERATORS = {
+    'txt': generate_shopping_cart_text,
+    'csv': generate_shopping_cart_csv,
+    'json': generate_shopping_cart_json,
+    'pdf': generate_shopping_cart_pdf,
+}
+
+
+def get_shopping_cart_version(user_id):
+    """
+    Getting the current version of the user's shopping cart
+    from the cart rows: adding a recipe raises the last id,
+    removing one lowers the count, changing the ingredients
+    of a recipe moves its updated_at.
+    Every worker gets the same version without shared state
+    """
+
+    state = UserShoppingCart.objects.filter(user_id=user_id).aggregate(
+        count=Count('id'),
+        last_id=Max('id'),
+        changed_at=Max('recipe__updated_at')
+    )
+    changed_at = state['changed_at']
+    version = ':'.join((
+        str(state['count']),
+        str(state['last_id']),
+        changed_at.isoformat() if changed_at else '',
+        get_version(INGREDIENTS_VERSION_NAME)
+    ))
+
+    return hashlib.md5(version.encode()).hexdigest()
+
+
+def get_shopping_cart_cache_key(user_id, file_format):
+    """Key of the shopping list file for the current cart version"""
+
+    return SHOPPING_CART_CONTENT_KEY.format(
+        user_id=user_id,
+        version=get_shopping_cart_version(user_id),
+        format=file_format
+    )
+
+
+def cache_shopping_cart_content(chunks, cache_key):
+    """
+    Passing through the generated chunks of the file
+    and caching the whole file once it has been sent
+    """
+
+    content = []
+
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        content.append(chunk)
+        yield chunk
+
+    cache.set(
+        cache_key,
+        b''.join(content),
+        settings.SHOPPING_CART_CACHE_TIMEOUT
+    )
+
+
+def next_shopping_cart_chunks(chunks):
+    """Taking the next batch of the generated chunks"""
+
+    return list(islice(chunks, SHOPPING_CART_STREAM_BATCH_SIZE))
+
+
+async def acache_shopping_cart_content(chunks, cache_key):
+    """
+    Passing through the generated chunks of the file for ASGI servers,
+    which buffer sync iterators: the chunks are generated in batches
+    in the thread of the database connection, the whole file
+    is cached once it has been sent
+    """
+
+    chunks = cache_shopping_cart_content(chunks, cache_key)
+    next_chunks = sync_to_async(next_shopping_cart_chunks)
+
+    while True:
+        batch = await next_chunks(chunks)
+
+        if not batch:
+            return
+
+        for chunk in batch:
+            yield chunk
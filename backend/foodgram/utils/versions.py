@@ -0,0 +1,62 @@
+import time
+from uuid import uuid4
+
+from django.core.cache import cache
+
+VERSION_KEY = 'version:{name}'
+INGREDIENTS_VERSION_NAME = 'ingredients'
+TAGS_VERSION_NAME = 'tags'
+RECIPE_INGREDIENTS_VERSION_NAME = 'recipe_ingredients'
+RECIPE_FRAGMENTS_VERSION_NAME = 'recipe_fragments'
+
+
+def new_version():
+    """
+    Version token: time of the change and a random part,
+    so a version lost from the cache never matches
+    the one stored with the outdated data
+    """
+
+    return f'{int(time.time())}.{uuid4().hex}'
+
+
+def get_version_timestamp(version):
+    """Getting the time of the change from the version token"""
+
+    return int(version.split('.', 1)[0])
+
+
+def get_version(name):
+    """Getting the current version of the named data"""
+
+    return cache.get_or_set(VERSION_KEY.format(name=name), new_version, None)
+
+
+async def aget_version(name):
+    """Getting the current version of the named data in the async views"""
+
+    return await cache.aget_or_set(
+        VERSION_KEY.format(name=name), new_version, None
+    )
+
+
+def get_versions(*names):
+    """Getting the current versions of the named data by one cache query"""
+
+    keys = [VERSION_KEY.format(name=name) for name in names]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            versions[key] = cache.get_or_set(key, new_version, None)
+
+    return [versions[key] for key in keys]
+
+
+def bump_version(*names):
+    """Changing the version of the named data after it was modified"""
+
+    cache.set_many(
+        {VERSION_KEY.format(name=name): new_version() for name in names},
+        None
+    )
@@ -1,43 +1,100 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
 from django.db import transaction
+from django.db.models import (
+    BooleanField,
+    Exists,
+    F,
+    OuterRef,
+    Prefetch,
+    Value
+)
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from foodgram.filters import IngredientFilterSet, RecipeFilterSet
+from foodgram.filters import RecipeFilterSet, RecipeOrderingFilter
+from foodgram.mixins import (
+    AsyncReadMixin,
+    RecipeFragmentCacheMixin,
+    VersionedCacheMixin
+)
 from foodgram.permissions import ChangeObjectIfAuthorOrAdmin
+from foodgram.utils.ingredient_index import ingredient_index
+from foodgram.utils.recipe_match_index import recipe_match_index
 from foodgram.utils.save_ingredients import save_ingredients_for_recipe
 from foodgram.utils.save_tags import save_tags_for_recipe
+from foodgram.utils.versions import (
+    INGREDIENTS_VERSION_NAME,
+    TAGS_VERSION_NAME
+)
 from foodgram.serializers import (
     IngredientSerializer,
     RecipeSerializer,
     TagSerializer
 )
-from foodgram.models import Ingredient, Recipe, Tag
-from foodgram.paginations import RecipePageNumberPagination
+from foodgram.models import Ingredient, Recipe, RecipeIngredient, Tag
+from foodgram.paginations import (
+    RecipeCursorPagination,
+    RecipePageNumberPagination
+)
+from users.models import Subscription, UserFavorite, UserShoppingCart
+from users.serializers import RecipeMinifiedSerializer
+from utils.validators import (
+    positive_integer_list_query_param,
+    positive_integer_query_param
+)
 
 
 User = get_user_model()
 
+RECIPE_MATCH_DEFAULT_LIMIT = 10
+RECIPE_MATCH_MAX_LIMIT = 100
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+
+class IngredientViewSet(
+    VersionedCacheMixin, AsyncReadMixin, viewsets.ReadOnlyModelViewSet
+):
     """
     Viewset for processing requests:
     a list of ingredients GET /api/ingredients/
+    search ingredients GET /api/ingredients/?name=name&limit=10
     get ingredient by id GET /api/ingredients/id/
     """
 
     serializer_class = IngredientSerializer
-    filter_backends = (DjangoFilterBackend,)
-    filterset_class = IngredientFilterSet
     permission_classes = [AllowAny, ]
     queryset = Ingredient.objects.all()
     pagination_class = None
+    version_name = INGREDIENTS_VERSION_NAME
+
+    def get_list_data(self, request):
+        """
+        Method for searching ingredients by name
+        in the in-memory autocomplete index
+        """
+
+        return ingredient_index.search(
+            request.query_params.get('name', ''),
+            positive_integer_query_param(request, 'limit')
+        )
+
+    async def aget_list_data(self, request):
+        """
+        Method for searching ingredients in the async views,
+        the index may be rebuilt from the database, so it runs in a thread
+        """
+
+        return await sync_to_async(self.get_list_data)(request)
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(
+    VersionedCacheMixin, AsyncReadMixin, viewsets.ReadOnlyModelViewSet
+):
     """
     Viewset for processing requests:
     a list of tags GET /api/tags/
@@ -48,29 +105,113 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [AllowAny, ]
     serializer_class = TagSerializer
     pagination_class = None
+    version_name = TAGS_VERSION_NAME
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(
+    RecipeFragmentCacheMixin, AsyncReadMixin, viewsets.ModelViewSet
+):
     """
     Viewset for processing requests:
     a list of recipes GET /api/recipes/
+    a list of recipes by cursor GET /api/recipes/?pagination=cursor
+    a list of popular recipes GET /api/recipes/?ordering=-favorites_count
+    search recipes GET /api/recipes/?search=text
     get recipe by id GET /api/recipes/id/
     create recipe POST /api/recipes/
     delete recipe by id DELETE /api/recipes/id/
     """
 
-    queryset = Recipe.objects.all()
     serializer_class = RecipeSerializer
     pagination_class = RecipePageNumberPagination
-    filter_backends = (DjangoFilterBackend,)
+    cursor_pagination_class = RecipeCursorPagination
+    filter_backends = (DjangoFilterBackend, RecipeOrderingFilter)
     filterset_class = RecipeFilterSet
+    ordering_fields = ('id', 'favorites_count', 'created_at', 'updated_at')
+    ordering = ('-id',)
     permission_classes = [ChangeObjectIfAuthorOrAdmin, ]
 
+    @property
+    def paginator(self):
+        """
+        Selecting the paginator: the cursor one if the client
+        opted into it, the page number one otherwise
+        """
+
+        if not hasattr(self, '_paginator'):
+            paginator = self.cursor_pagination_class()
+
+            if not paginator.is_requested(self.request):
+                paginator = self.pagination_class()
+
+            self._paginator = paginator
+
+        return self._paginator
+
+    def get_recipes_queryset(self, user):
+        """
+        Method for getting recipes with related objects prefetched
+        and the user's flags annotated, so that serializing a page
+        takes a fixed number of queries
+        """
+
+        if user.is_authenticated:
+            is_favorited = Exists(
+                UserFavorite.objects.filter(user=user, recipe=OuterRef('pk'))
+            )
+            is_in_shopping_cart = Exists(
+                UserShoppingCart.objects.filter(
+                    user=user, recipe=OuterRef('pk')
+                )
+            )
+            is_subscribed = Exists(
+                Subscription.objects.filter(user=user, author=OuterRef('pk'))
+            )
+        else:
+            is_favorited = Value(False, output_field=BooleanField())
+            is_in_shopping_cart = Value(False, output_field=BooleanField())
+            is_subscribed = Value(False, output_field=BooleanField())
+
+        return Recipe.objects.defer('search_vector').prefetch_related(
+            Prefetch(
+                'author',
+                queryset=User.objects.annotate(is_subscribed=is_subscribed)
+            ),
+            Prefetch(
+                'recipeingredient_set',
+                queryset=RecipeIngredient.objects.select_related('ingredient')
+            ),
+            'tags',
+        ).annotate(
+            is_favorited=is_favorited,
+            is_in_shopping_cart=is_in_shopping_cart
+        )
+
+    def get_queryset(self):
+        """Method for getting recipes as seen by the current user"""
+
+        return self.get_recipes_queryset(self.request.user)
+
+    def get_page_queryset(self):
+        """Method for getting the recipes of the page without relations"""
+
+        return Recipe.objects.only(
+            'id', 'author_id', 'favorites_count', 'created_at', 'updated_at'
+        )
+
+    def get_fragment_queryset(self):
+        """Method for getting recipes to cache as seen by anyone"""
+
+        return self.get_recipes_queryset(AnonymousUser())
+
     @transaction.atomic
     def perform_create(self, serializer):
         """Method creates a recipe with ingredients and tags"""
 
         recipe = serializer.save(author=self.request.user)
+        User.objects.filter(id=recipe.author_id).update(
+            recipes_count=F('recipes_count') + 1
+        )
 
         ingredients_data = self.request.data.get('ingredients')
         tags_data = self.request.data.get('tags')
@@ -81,6 +222,15 @@ class RecipeViewSet(viewsets.ModelViewSet):
         if tags_data:
             save_tags_for_recipe(tags_data, recipe)
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        """Method deletes a recipe and updates the author's recipe count"""
+
+        instance.delete()
+        User.objects.filter(id=instance.author_id).update(
+            recipes_count=F('recipes_count') - 1
+        )
+
     @transaction.atomic
     def partial_update(self, request, *args, **kwargs):
         """Method changes a recipe with ingredients and tags"""
@@ -102,4 +252,48 @@ class RecipeViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
 
+        if getattr(recipe, '_prefetched_objects_cache', None):
+            recipe._prefetched_objects_cache = {}
+
         return Response(serializer.data)
+
+
+class RecipeMatchView(APIView):
+    """
+    View for processing requests:
+    recipes that can be cooked from the available ingredients
+    GET /api/recipes/match/?ingredients=1&ingredients=2&limit=10
+    """
+
+    permission_classes = [AllowAny, ]
+
+    def get(self, request):
+        """
+        Method for ranking recipes by the share of their ingredients
+        that are available, with the missing ingredients of each recipe
+        """
+
+        ingredient_ids = positive_integer_list_query_param(
+            request, 'ingredients'
+        )
+        limit = min(
+            positive_integer_query_param(request, 'limit')
+            or RECIPE_MATCH_DEFAULT_LIMIT,
+            RECIPE_MATCH_MAX_LIMIT
+        )
+        matches = recipe_match_index.match(ingredient_ids, limit)
+        recipes = Recipe.objects.defer('search_vector').in_bulk(
+            [recipe_id for recipe_id, _, _ in matches]
+        )
+
+        return Response([
+            {
+                'recipe': RecipeMinifiedSerializer(
+                    recipes[recipe_id], context={'request': request}
+                ).data,
+                'coverage': round(coverage, 2),
+                'missing_ingredients': ingredient_index.get_many(missing)
+            }
+            for recipe_id, coverage, missing in matches
+            if recipe_id in recipes
+        ])
@@ -0,0 +1,21 @@
+import os
+import shutil
+
+
+def on_starting(server):
+    """Clearing the metrics left by the workers of the previous run"""
+
+    directory = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Marking the metrics files of the exited worker as dead"""
+
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,27 @@
+from django.contrib import admin
+
+from jobs.models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    """Job administration"""
+
+    list_display = (
+        'pk',
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+        'finished_at'
+    )
+    list_filter = ('status', 'name')
+    readonly_fields = (
+        'attempts',
+        'last_error',
+        'created_at',
+        'started_at',
+        'finished_at'
+    )
+
+
+admin.site.register(Job, JobAdmin)
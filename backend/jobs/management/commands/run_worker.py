@@ -0,0 +1,46 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs.worker import run_worker
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class Command(BaseCommand):
+    """
+    Running the background jobs from the database queue,
+    several workers can be started to process jobs in parallel
+    """
+
+    help = 'Runs the queued background jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=DEFAULT_POLL_INTERVAL,
+            help='Seconds to wait when the queue is empty'
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit when the queue is empty'
+        )
+
+    def handle(self, *args, **options):
+        stopping = []
+
+        def stop(signum, frame):
+            stopping.append(signum)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        processed = run_worker(
+            options['poll_interval'],
+            burst=options['burst'],
+            should_stop=lambda: bool(stopping)
+        )
+
+        self.stdout.write(f'Processed jobs: {processed}')
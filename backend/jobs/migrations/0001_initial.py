@@ -0,0 +1,38 @@
+# Generated by Django 4.2.4 on 2026-10-18 04:29
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, verbose_name='Задача')),
+                ('args', models.JSONField(default=list, verbose_name='Аргументы задачи')),
+                ('status', models.CharField(choices=[('queued', 'В очереди'), ('running', 'Выполняется'), ('done', 'Выполнена'), ('failed', 'Завершилась с ошибкой')], default='queued', max_length=16, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Количество попыток')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='Максимальное количество попыток')),
+                ('retry_delay', models.PositiveIntegerField(default=10, help_text='Удваивается после каждой неудачной попытки', verbose_name='Задержка перед повтором в секундах')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Время запуска')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Время создания')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Время начала выполнения')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Время завершения')),
+            ],
+            options={
+                'verbose_name': 'Фоновая задача',
+                'verbose_name_plural': 'Фоновые задачи',
+                'ordering': ('-id',),
+                'indexes': [models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx')],
+            },
+        ),
+    ]
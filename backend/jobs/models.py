@@ -0,0 +1,100 @@
+from django.db import models
+from django.utils import timezone
+
+MAX_LENGTH_16 = 16
+MAX_LENGTH_255 = 255
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 10
+
+
+class Job(models.Model):
+    """Background job stored in the database until a worker runs it"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Завершилась с ошибкой'),
+    )
+
+    name = models.CharField(
+        max_length=MAX_LENGTH_255,
+        verbose_name='Задача'
+    )
+
+    args = models.JSONField(
+        verbose_name='Аргументы задачи',
+        default=list
+    )
+
+    status = models.CharField(
+        max_length=MAX_LENGTH_16,
+        verbose_name='Статус',
+        choices=STATUS_CHOICES,
+        default=QUEUED
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Количество попыток',
+        default=0
+    )
+
+    max_attempts = models.PositiveSmallIntegerField(
+        verbose_name='Максимальное количество попыток',
+        default=DEFAULT_MAX_ATTEMPTS
+    )
+
+    retry_delay = models.PositiveIntegerField(
+        verbose_name='Задержка перед повтором в секундах',
+        help_text='Удваивается после каждой неудачной попытки',
+        default=DEFAULT_RETRY_DELAY
+    )
+
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True
+    )
+
+    run_at = models.DateTimeField(
+        verbose_name='Время запуска',
+        default=timezone.now
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name='Время создания',
+        auto_now_add=True
+    )
+
+    started_at = models.DateTimeField(
+        verbose_name='Время начала выполнения',
+        null=True,
+        blank=True
+    )
+
+    finished_at = models.DateTimeField(
+        verbose_name='Время завершения',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        """Job model settings."""
+
+        ordering = ('-id',)
+        indexes = [
+            models.Index(
+                fields=['status', 'run_at'],
+                name='job_status_run_at_idx'
+            )
+        ]
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+
+    def __str__(self) -> str:
+        """String representation of the class"""
+
+        return f'{self.name} ({self.get_status_display()})'
@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+from jobs.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Serializer for processing GET requests from the JobViewSet"""
+
+    class Meta:
+        """Setting input and output fields"""
+
+        fields = (
+            'id', 'name', 'args', 'status', 'attempts', 'max_attempts',
+            'last_error', 'run_at', 'created_at', 'started_at',
+            'finished_at'
+        )
+        model = Job
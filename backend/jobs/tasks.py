@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from jobs.models import DEFAULT_MAX_ATTEMPTS, DEFAULT_RETRY_DELAY, Job
+
+
+class Task:
+    """
+    Function that can be run by the background worker,
+    the job stores the import path of the task and its arguments
+    """
+
+    def __init__(self, func, max_attempts, retry_delay):
+        self.func = func
+        self.name = f'{func.__module__}.{func.__qualname__}'
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+    def __call__(self, *args):
+        return self.func(*args)
+
+    def enqueue(self, *args, delay=0):
+        """Adding the job to the queue, arguments must be JSON serializable"""
+
+        return Job.objects.create(
+            name=self.name,
+            args=list(args),
+            max_attempts=self.max_attempts,
+            retry_delay=self.retry_delay,
+            run_at=timezone.now() + timedelta(seconds=delay)
+        )
+
+    def enqueue_on_commit(self, *args, delay=0):
+        """Adding the job to the queue after the transaction is committed"""
+
+        transaction.on_commit(lambda: self.enqueue(*args, delay=delay))
+
+
+def task(max_attempts=DEFAULT_MAX_ATTEMPTS, retry_delay=DEFAULT_RETRY_DELAY):
+    """Decorator turning the module level function into a task"""
+
+    def decorator(func):
+        return Task(func, max_attempts, retry_delay)
+
+    return decorator
+
+
+def get_task(name):
+    """Getting the task by its import path"""
+
+    task_object = import_string(name)
+
+    if not isinstance(task_object, Task):
+        raise TypeError(f'{name} is not a task')
+
+    return task_object
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.tasks import task
+from jobs.worker import claim_job, run_job, run_worker
+
+CALLS = []
+
+
+@task(max_attempts=2, retry_delay=60)
+def record(value):
+    CALLS.append(value)
+
+
+@task(max_attempts=2, retry_delay=60)
+def fail(value):
+    raise ValueError(value)
+
+
+@override_settings(JOBS_STALE_TIMEOUT=60)
+class WorkerTests(TestCase):
+    """The worker runs due jobs, retries failures and reclaims stale ones"""
+
+    def setUp(self):
+        CALLS.clear()
+
+    def make_stale(self, job, attempts):
+        """Marking the job as left running by a stopped worker"""
+
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.RUNNING,
+            attempts=attempts,
+            started_at=timezone.now() - timedelta(seconds=120)
+        )
+
+    def test_run(self):
+        """Due jobs are run in order, delayed ones are left queued"""
+
+        first = record.enqueue('first')
+        record.enqueue('second')
+        delayed = record.enqueue('delayed', delay=60)
+
+        self.assertEqual(run_worker(0, burst=True), 2)
+        self.assertEqual(CALLS, ['first', 'second'])
+
+        first.refresh_from_db()
+        delayed.refresh_from_db()
+        self.assertEqual(first.status, Job.DONE)
+        self.assertEqual(first.attempts, 1)
+        self.assertEqual(delayed.status, Job.QUEUED)
+
+    def test_retry(self):
+        """A failed job is retried with a delay until out of attempts"""
+
+        job = fail.enqueue('error')
+
+        run_job(claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('ValueError', job.last_error)
+        self.assertIsNone(claim_job())
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        run_job(claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNone(claim_job())
+
+    def test_stale_reclaimed(self):
+        """A stale job with attempts left is taken again"""
+
+        job = record.enqueue('stale')
+        self.make_stale(job, attempts=1)
+
+        claimed = claim_job()
+
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.attempts, 2)
+
+    def test_stale_exhausted(self):
+        """A stale job without attempts left is failed, not run again"""
+
+        job = record.enqueue('stale')
+        self.make_stale(job, attempts=2)
+
+        self.assertIsNone(claim_job())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.finished_at)
+        self.assertTrue(job.last_error)
+        self.assertEqual(CALLS, [])
+
+    def test_running_not_stale(self):
+        """A job running within the timeout is not taken"""
+
+        job = record.enqueue('running')
+        claim_job()
+
+        self.assertIsNone(claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
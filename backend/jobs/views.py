@@ -0,0 +1,40 @@
+from django.db.models import Count
+from django_filters.rest_framework import DjangoFilterBackend
+
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from jobs.models import Job
+from jobs.serializers import JobSerializer
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Viewset for processing requests:
+    a list of background jobs GET /api/jobs/?status=failed&name=name
+    get job status by id GET /api/jobs/id/
+    number of jobs by status GET /api/jobs/stats/
+    """
+
+    serializer_class = JobSerializer
+    permission_classes = [IsAdminUser, ]
+    queryset = Job.objects.all()
+    filter_backends = (DjangoFilterBackend,)
+    filterset_fields = ('status', 'name')
+
+    @action(detail=False)
+    def stats(self, request):
+        """Method for counting the jobs in every status"""
+
+        counts = dict(
+            Job.objects.order_by().values_list('status').annotate(
+                count=Count('id')
+            )
+        )
+
+        return Response({
+            status: counts.get(status, 0)
+            for status, _ in Job.STATUS_CHOICES
+        })
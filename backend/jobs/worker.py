@@ -0,0 +1,104 @@
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.tasks import get_task
+
+STALE_JOB_ERROR = 'Задача не завершилась за {timeout} секунд'
+
+
+def claim_job():
+    """
+    Taking the next due job, running jobs left by a stopped worker
+    are taken again after JOBS_STALE_TIMEOUT while they have attempts
+    left and marked as failed otherwise.
+    Locked rows are skipped, so several workers can run at once
+    """
+
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.JOBS_STALE_TIMEOUT)
+    stale_jobs = Q(status=Job.RUNNING, started_at__lt=stale)
+
+    with transaction.atomic():
+        Job.objects.filter(
+            stale_jobs, attempts__gte=F('max_attempts')
+        ).update(
+            status=Job.FAILED,
+            finished_at=now,
+            last_error=STALE_JOB_ERROR.format(
+                timeout=settings.JOBS_STALE_TIMEOUT
+            )
+        )
+        job = Job.objects.select_for_update(skip_locked=True).filter(
+            Q(status=Job.QUEUED, run_at__lte=now)
+            | stale_jobs & Q(attempts__lt=F('max_attempts'))
+        ).order_by('run_at', 'id').first()
+
+        if job is None:
+            return None
+
+        job.status = Job.RUNNING
+        job.attempts += 1
+        job.started_at = now
+        job.save(update_fields=('status', 'attempts', 'started_at'))
+
+    return job
+
+
+def run_job(job):
+    """Running the job and retrying it with a delay if it fails"""
+
+    try:
+        get_task(job.name)(*job.args)
+    except Exception:
+        job.last_error = traceback.format_exc()
+
+        if job.attempts < job.max_attempts:
+            job.status = Job.QUEUED
+            job.run_at = timezone.now() + timedelta(
+                seconds=job.retry_delay * 2 ** (job.attempts - 1)
+            )
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+    else:
+        job.status = Job.DONE
+        job.finished_at = timezone.now()
+
+    job.save(
+        update_fields=('status', 'last_error', 'run_at', 'finished_at')
+    )
+
+    return job
+
+
+def run_worker(poll_interval, burst=False, should_stop=lambda: False):
+    """
+    Running the queued jobs one by one until stopped,
+    in burst mode the worker exits when the queue is empty.
+    Returns the number of the processed jobs
+    """
+
+    processed = 0
+
+    while not should_stop():
+        close_old_connections()
+        job = claim_job()
+
+        if job is None:
+            if burst:
+                break
+
+            time.sleep(poll_interval)
+            continue
+
+        run_job(job)
+        processed += 1
+
+    return processed
@@ -92,6 +92,7 @@ class UserAdmin(admin.ModelAdmin):
     display_subscriptions.short_description = 'Подписки'
     display_userfavorite.short_description = 'Избранные рецепты'
     display_usershoppingcart.short_description = 'Рецепты в корзине'
+    readonly_fields = ('recipes_count', 'subscribers_count')
     search_fields = ('username', 'email', 'first_name',)
     list_filter = ('username', 'email', 'first_name',)
     empty_value_display = 'пусто'
@@ -0,0 +1,246 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header
+)
+from rest_framework.authtoken.models import Token
+
+TOKEN_CACHE_KEY = 'auth_token:{key}'
+
+
+class TokenUserCache:
+    """
+    LRU cache of the users by their token keys kept in the memory
+    of the worker, entries expire after TOKEN_CACHE_TIMEOUT,
+    so changes made in other workers are seen within it.
+    The users are also kept in the cache of TOKEN_CACHE_ALIAS
+    for TOKEN_SHARED_CACHE_TIMEOUT, so a new worker does not query
+    the database, or for TOKEN_CACHE_TIMEOUT if that cache
+    is kept in the memory of the worker too.
+    Every lookup gets its own copy of the user,
+    so changes made while handling one request do not leak into others
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = OrderedDict()
+
+    @property
+    def shared_cache(self):
+        """Getting the shared cache of the users"""
+
+        return caches[settings.TOKEN_CACHE_ALIAS]
+
+    @property
+    def shared_timeout(self):
+        """Getting the timeout of the users in the shared cache"""
+
+        if isinstance(self.shared_cache, LocMemCache):
+            return settings.TOKEN_CACHE_TIMEOUT
+
+        return settings.TOKEN_SHARED_CACHE_TIMEOUT
+
+    def _get_local(self, key):
+        """Getting a copy of the user from the local cache"""
+
+        with self._lock:
+            entry = self._users.get(key)
+
+            if entry is None:
+                return None
+
+            user, expires_at = entry
+
+            if expires_at <= time.monotonic():
+                del self._users[key]
+                return None
+
+            self._users.move_to_end(key)
+
+        return copy.copy(user)
+
+    def _set_local(self, key, user):
+        """Adding a copy of the user, the oldest one is evicted"""
+
+        user = copy.copy(user)
+
+        with self._lock:
+            self._users[key] = (
+                user, time.monotonic() + settings.TOKEN_CACHE_TIMEOUT
+            )
+            self._users.move_to_end(key)
+
+            while len(self._users) > settings.TOKEN_CACHE_SIZE:
+                self._users.popitem(last=False)
+
+    def get(self, key):
+        """Getting the user by the token key, None if it is not cached"""
+
+        user = self._get_local(key)
+
+        if user is None:
+            user = self.shared_cache.get(TOKEN_CACHE_KEY.format(key=key))
+
+            if user is not None:
+                self._set_local(key, user)
+
+        return user
+
+    async def aget(self, key):
+        """Getting the user by the token key in the async views"""
+
+        user = self._get_local(key)
+
+        if user is None:
+            user = await self.shared_cache.aget(
+                TOKEN_CACHE_KEY.format(key=key)
+            )
+
+            if user is not None:
+                self._set_local(key, user)
+
+        return user
+
+    def set(self, key, user):
+        """Caching the user of the token"""
+
+        self._set_local(key, user)
+        self.shared_cache.set(
+            TOKEN_CACHE_KEY.format(key=key), user, self.shared_timeout
+        )
+
+    async def aset(self, key, user):
+        """Caching the user of the token in the async views"""
+
+        self._set_local(key, user)
+        await self.shared_cache.aset(
+            TOKEN_CACHE_KEY.format(key=key), user, self.shared_timeout
+        )
+
+    def delete(self, *keys):
+        """Removing the tokens from the cache"""
+
+        with self._lock:
+            for key in keys:
+                self._users.pop(key, None)
+
+        self.shared_cache.delete_many(
+            [TOKEN_CACHE_KEY.format(key=key) for key in keys]
+        )
+
+    def delete_user(self, user_id):
+        """Removing the tokens of the user from the cache"""
+
+        keys = list(
+            Token.objects.filter(user_id=user_id).values_list(
+                'key', flat=True
+            )
+        )
+
+        with self._lock:
+            keys.extend(
+                key for key, (user, _) in self._users.items()
+                if user.pk == user_id
+            )
+
+        if keys:
+            self.delete(*keys)
+
+
+token_user_cache = TokenUserCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that looks up the user of the token
+    in the cache before querying the database.
+    The cache is invalidated when the token is deleted
+    and when the user is changed or deactivated
+    """
+
+    def authenticate_credentials(self, key):
+        user = token_user_cache.get(key)
+
+        if user is None:
+            user, token = super().authenticate_credentials(key)
+            token_user_cache.set(key, user)
+
+            return user, token
+
+        return self.get_cached_credentials(key, user)
+
+    def get_cached_credentials(self, key, user):
+        """Method for checking the cached user of the token"""
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+
+        return user, Token(key=key, user=user)
+
+    def get_key(self, request):
+        """Method for getting the token key from the Authorization header"""
+
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header. No credentials provided.')
+                if len(auth) == 1 else
+                _('Invalid token header. '
+                  'Token string should not contain spaces.')
+            )
+
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header. '
+                  'Token string should not contain invalid characters.')
+            )
+
+    async def aauthenticate(self, request):
+        """
+        Method for authenticating the request in the async views
+        with the async ORM, None if the request has no token
+        """
+
+        key = self.get_key(request)
+
+        if key is None:
+            return None
+
+        user = await token_user_cache.aget(key)
+
+        if user is not None:
+            return self.get_cached_credentials(key, user)
+
+        token = await Token.objects.select_related('user').filter(
+            key=key
+        ).afirst()
+
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+
+        await token_user_cache.aset(key, token.user)
+
+        return token.user, token
@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from utils.benchmark import run_concurrently, send_request, summarize
+
+DEFAULT_URL = 'http://localhost:8000/api/auth/token/login/'
+
+
+class Command(BaseCommand):
+    """
+    Measuring the login throughput of the running server
+    under concurrent requests
+    """
+
+    help = 'Benchmarks the login endpoint of the running server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default=DEFAULT_URL)
+        parser.add_argument('--email', required=True)
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=20)
+
+    def handle(self, *args, **options):
+        data = {'email': options['email'], 'password': options['password']}
+
+        def login():
+            status_code, _ = send_request(options['url'], 'POST', data)
+            return status_code
+
+        summary = summarize(*run_concurrently(
+            login, options['requests'], options['concurrency']
+        ))
+        summary['concurrency'] = options['concurrency']
+
+        self.stdout.write(json.dumps(summary, indent=4))
@@ -85,6 +85,17 @@ class User(AbstractUser):
         help_text='Список покупок'
     )
 
+    recipes_count = models.PositiveIntegerField(
+        verbose_name='Количество рецептов',
+        default=0
+    )
+
+    subscribers_count = models.PositiveIntegerField(
+        verbose_name='Количество подписчиков',
+        default=0,
+        db_index=True
+    )
+
     class Meta:
         """User model settings."""
 
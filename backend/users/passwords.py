@@ -0,0 +1,22 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASHING_WORKERS,
+    thread_name_prefix='password-hashing'
+)
+
+
+async def acheck_password(password, encoded):
+    """
+    Checking the password in the bounded thread pool,
+    so a burst of logins does not block the event loop
+    and the threads serving other requests
+    """
+
+    return await asyncio.get_running_loop().run_in_executor(
+        password_executor, check_password, password, encoded
+    )
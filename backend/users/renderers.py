@@ -0,0 +1,50 @@
+from rest_framework import renderers
+
+
+class ShoppingCartRenderer(renderers.BaseRenderer):
+    """
+    Base renderer of the shopping list formats.
+    The file itself is generated by the DownloadShoppingCartView,
+    the renderer selects the format and renders error messages
+    """
+
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Method for rendering error messages as plain text"""
+
+        if data is None:
+            return b''
+
+        if isinstance(data, dict) and 'detail' in data:
+            data = data['detail']
+
+        return str(data).encode('utf-8')
+
+
+class ShoppingCartTextRenderer(ShoppingCartRenderer):
+    """Shopping list in the text format"""
+
+    media_type = 'text/plain'
+    format = 'txt'
+
+
+class ShoppingCartCSVRenderer(ShoppingCartRenderer):
+    """Shopping list in the csv format"""
+
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class ShoppingCartJSONRenderer(ShoppingCartRenderer):
+    """Shopping list in the json format"""
+
+    media_type = 'application/json'
+    format = 'json'
+
+
+class ShoppingCartPDFRenderer(ShoppingCartRenderer):
+    """Shopping list in the pdf format"""
+
+    media_type = 'application/pdf'
+    format = 'pdf'
@@ -2,11 +2,14 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
 from foodgram.models import Recipe
+from foodgram.utils.images import get_image_urls
 from users.models import Subscription
 from utils.validators import password_slug_username_validation
 
 User = get_user_model()
 
+BULK_RECIPES_MAX_LENGTH = 100
+
 
 class CreateUserTokenSerializer(serializers.Serializer):
     """
@@ -18,6 +21,19 @@ class CreateUserTokenSerializer(serializers.Serializer):
     password = serializers.CharField()
 
 
+class RecipeIdsSerializer(serializers.Serializer):
+    """
+    Serializer for processing bulk requests
+    from the BulkFavoriteView and BulkShoppingCartView
+    """
+
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_RECIPES_MAX_LENGTH
+    )
+
+
 class ChangeUserPasswordSerializer(serializers.Serializer):
     """
     Serializer for processing POST requests
@@ -44,14 +60,24 @@ class RecipeMinifiedSerializer(serializers.ModelSerializer):
     request from the SubscriptionSerializer.
     """
 
+    image_sizes = serializers.SerializerMethodField()
+
     class Meta:
         """Setting input and output fields."""
 
         fields = (
-            'id', 'name', 'image', 'cooking_time'
+            'id', 'name', 'image', 'image_sizes', 'cooking_time'
         )
         model = Recipe
 
+    def get_image_sizes(self, obj):
+        """
+        Method for getting an additional field
+        with the urls of the resized recipe images
+        """
+
+        return get_image_urls(obj, self.context.get('request'))
+
 
 class UserGetSerializer(serializers.ModelSerializer):
     """Serializer for processing GET requests from the UserViewSet"""
@@ -74,6 +100,9 @@ class UserGetSerializer(serializers.ModelSerializer):
         for the user's subscription to the author
         """
 
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
+
         request = self.context.get('request')
         user = request.user
 
@@ -146,10 +175,16 @@ class SubscriptionSerializer(serializers.ModelSerializer):
     def get_recipes(self, obj):
         """
         Method for getting recipes of the author
-        the user is subscribed.
+        the user is subscribed,
+        limited by the recipes_limit parameter.
         """
 
-        recipes = Recipe.objects.filter(author=obj)
+        if hasattr(obj, 'limited_recipes'):
+            recipes = obj.limited_recipes
+        else:
+            recipes = Recipe.objects.filter(author=obj).order_by('-id')
+            recipes = recipes[:self.context.get('recipes_limit')]
+
         serializer = RecipeMinifiedSerializer(recipes, many=True)
 
         return serializer.data
@@ -160,16 +195,19 @@ class SubscriptionSerializer(serializers.ModelSerializer):
         of the author the user is following.
         """
 
-        recipes = Recipe.objects.filter(author=obj)
-        recipes_count = recipes.count()
+        if hasattr(obj, 'recipes_count'):
+            return obj.recipes_count
 
-        return recipes_count
+        return Recipe.objects.filter(author=obj).count()
 
     def get_is_subscribed(self, obj):
         """
         Method shows if the user is subscribed to the author.
         """
 
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
+
         request = self.context.get('request')
         user = request.user
 
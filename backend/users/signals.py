@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from foodgram.models import Recipe
+from users.authentication import token_user_cache
+
+User = get_user_model()
+
+RECIPE_AUTHOR_FIELDS = {'email', 'username', 'first_name', 'last_name'}
+
+
+@receiver(post_delete, sender=Token)
+def delete_token(sender, instance, **kwargs):
+    """Removing the deleted token from the authentication cache"""
+
+    token_user_cache.delete(instance.key)
+
+
+@receiver(post_save, sender=User)
+def change_user(sender, instance, created, update_fields, **kwargs):
+    """
+    Removing the tokens of the changed user from the authentication cache,
+    so a new password or deactivation takes effect at once.
+    The recipes of the user are marked as changed, which moves
+    the keys of their cached fragments with the author,
+    unless only the fields not shown with them were saved
+    """
+
+    if created:
+        return
+
+    token_user_cache.delete_user(instance.pk)
+
+    if update_fields is None or RECIPE_AUTHOR_FIELDS & set(update_fields):
+        Recipe.objects.filter(author_id=instance.pk).update(
+            updated_at=timezone.now()
+        )
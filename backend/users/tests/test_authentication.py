@@ -0,0 +1,115 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+
+from foodgram.tests.factories import create_user
+from users.authentication import CachedTokenAuthentication, token_user_cache
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """
+    The users of the tokens are cached in the memory of the worker
+    and in the shared cache, every request gets its own copy
+    and changes are seen at once
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user('user')
+        self.token = Token.objects.create(user=self.user)
+        self.authentication = CachedTokenAuthentication()
+
+    def authenticate(self):
+        """Authenticating by the token, returning the user"""
+
+        user, token = self.authentication.authenticate_credentials(
+            self.token.key
+        )
+        self.assertEqual(token.key, self.token.key)
+        return user
+
+    def test_cached(self):
+        """The second lookup makes no queries"""
+
+        self.authenticate()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate().pk, self.user.pk)
+
+    def test_local(self):
+        """The user is found in the memory of the worker until it expires"""
+
+        self.authenticate()
+        cache.clear()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate().pk, self.user.pk)
+
+        expired = time.monotonic() + settings.TOKEN_CACHE_TIMEOUT + 1
+        cache.clear()
+
+        with mock.patch('time.monotonic', return_value=expired):
+            with self.assertNumQueries(1):
+                self.authenticate()
+
+    def test_shared_timeout(self):
+        """
+        The users are kept in a cache local to the worker
+        no longer than in the memory of the worker
+        """
+
+        self.assertEqual(
+            token_user_cache.shared_timeout, settings.TOKEN_CACHE_TIMEOUT
+        )
+
+        with override_settings(
+            CACHES={
+                **settings.CACHES,
+                'shared': {
+                    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                    'LOCATION': 'redis://localhost:6379/0',
+                },
+            },
+            TOKEN_CACHE_ALIAS='shared'
+        ):
+            self.assertEqual(
+                token_user_cache.shared_timeout,
+                settings.TOKEN_SHARED_CACHE_TIMEOUT
+            )
+
+    def test_copy_per_request(self):
+        """Changes of the user in one request do not leak into another"""
+
+        self.authenticate()
+        first = self.authenticate()
+        first.first_name = 'Изменено'
+        second = self.authenticate()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.first_name, self.user.first_name)
+
+    def test_deleted_token(self):
+        """A deleted token is rejected at once"""
+
+        self.authenticate()
+        self.token.delete()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate()
+
+    def test_deactivated_user(self):
+        """A deactivated user is rejected at once"""
+
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertIsNone(token_user_cache.get(self.token.key))
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate()
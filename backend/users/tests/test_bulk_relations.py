@@ -0,0 +1,118 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from foodgram.models import Recipe
+from foodgram.tests.factories import create_recipe, create_user
+from users.models import UserFavorite, UserShoppingCart
+
+BULK_FAVORITE_URL = '/api/recipes/favorite/'
+BULK_SHOPPING_CART_URL = '/api/recipes/shopping_cart/'
+CLEAR_SHOPPING_CART_URL = '/api/recipes/shopping_cart/clear/'
+MISSING_ID = 10 ** 6
+
+
+class BulkRelationTests(TestCase):
+    """
+    Every recipe gets the status of the change made by the request
+    and the counters follow the rows that were actually changed
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        author = create_user('author')
+        cls.recipes = [
+            create_recipe(author, name=f'Рецепт {index}')
+            for index in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def request(self, method, url, recipe_ids):
+        """Sending the recipe ids, returning the status of each of them"""
+
+        response = getattr(self.client, method)(
+            url, {'recipes': recipe_ids}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        return {
+            result['id']: result['status']
+            for result in response.json()['results']
+        }
+
+    def get_counts(self, field):
+        """Getting the counter of every recipe"""
+
+        return list(
+            Recipe.objects.filter(
+                id__in=[recipe.id for recipe in self.recipes]
+            ).order_by('id').values_list(field, flat=True)
+        )
+
+    def test_add(self):
+        """Existing rows are reported and not counted again"""
+
+        first, second, third = self.recipes
+        UserFavorite.objects.create(user=self.user, recipe=second)
+
+        statuses = self.request(
+            'post', BULK_FAVORITE_URL,
+            [first.id, second.id, first.id, MISSING_ID]
+        )
+
+        self.assertEqual(statuses, {
+            first.id: 'created',
+            second.id: 'exists',
+            MISSING_ID: 'not_found',
+        })
+        self.assertEqual(self.get_counts('favorites_count'), [1, 0, 0])
+        self.assertEqual(
+            UserFavorite.objects.filter(user=self.user).count(), 2
+        )
+
+    def test_delete(self):
+        """Only the deleted rows drop the counters"""
+
+        first, second, third = self.recipes
+        self.request(
+            'post', BULK_SHOPPING_CART_URL, [first.id, second.id]
+        )
+        UserShoppingCart.objects.filter(
+            user=self.user, recipe=second
+        ).delete()
+
+        statuses = self.request(
+            'delete', BULK_SHOPPING_CART_URL,
+            [first.id, second.id, third.id, MISSING_ID]
+        )
+
+        self.assertEqual(statuses, {
+            first.id: 'deleted',
+            second.id: 'not_found',
+            third.id: 'not_found',
+            MISSING_ID: 'not_found',
+        })
+        self.assertEqual(
+            self.get_counts('shopping_carts_count'), [0, 1, 0]
+        )
+
+    def test_clear(self):
+        """Clearing the cart drops the counters of its recipes once"""
+
+        self.request(
+            'post', BULK_SHOPPING_CART_URL,
+            [recipe.id for recipe in self.recipes[:2]]
+        )
+
+        response = self.client.delete(CLEAR_SHOPPING_CART_URL)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(
+            UserShoppingCart.objects.filter(user=self.user).exists()
+        )
+        self.assertEqual(
+            self.get_counts('shopping_carts_count'), [0, 0, 0]
+        )
@@ -0,0 +1,121 @@
+import json
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase
+from rest_framework.test import APIClient, force_authenticate
+
+from foodgram.models import RecipeIngredient
+from foodgram.tests.factories import (
+    create_ingredient,
+    create_recipe,
+    create_user
+)
+from users.models import UserShoppingCart
+from users.views import DownloadShoppingCartView
+
+DOWNLOAD_URL = '/api/recipes/download_shopping_cart/?format=json'
+
+
+class ShoppingCartDownloadTests(TestCase):
+    """
+    The cached shopping list follows the cart rows in the database,
+    so changes made without the signals of this process are seen too
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('buyer')
+        cls.salt = create_ingredient('Соль')
+        cls.sugar = create_ingredient('Сахар')
+        cls.soup = create_recipe(cls.user, 'Суп', ingredients=[(cls.salt, 5)])
+        cls.cake = create_recipe(
+            cls.user, 'Торт', ingredients=[(cls.sugar, 100), (cls.salt, 1)]
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def download(self):
+        """Getting the shopping list as name: amount"""
+
+        response = self.client.get(DOWNLOAD_URL)
+        self.assertEqual(response.status_code, 200)
+
+        return {
+            item['name']: item['amount']
+            for item in json.loads(b''.join(response))
+        }
+
+    def test_streamed_then_cached(self):
+        """A new list is streamed, the cached one is sent at once"""
+
+        UserShoppingCart.objects.create(user=self.user, recipe=self.soup)
+
+        response = self.client.get(DOWNLOAD_URL)
+        self.assertTrue(response.streaming)
+        self.assertEqual(json.loads(b''.join(response))[0]['amount'], 5)
+
+        response = self.client.get(DOWNLOAD_URL)
+        self.assertFalse(response.streaming)
+
+    def test_streamed_by_async_iterator(self):
+        """Under ASGI the list is streamed by an async iterator"""
+
+        UserShoppingCart.objects.create(user=self.user, recipe=self.cake)
+        request = AsyncRequestFactory().get(DOWNLOAD_URL)
+        force_authenticate(request, self.user)
+
+        response = DownloadShoppingCartView.as_view()(request)
+        self.assertTrue(response.is_async)
+        content = async_to_sync(self.consume)(response.streaming_content)
+        self.assertEqual(
+            {item['name']: item['amount'] for item in json.loads(content)},
+            {'Сахар': 100, 'Соль': 1}
+        )
+
+        response = self.client.get(DOWNLOAD_URL)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.content, content)
+
+    @staticmethod
+    async def consume(streaming_content):
+        """Joining the chunks of an async iterator"""
+
+        return b''.join([chunk async for chunk in streaming_content])
+
+    def test_rows_added_without_signals(self):
+        """Rows changed without the signals change the cached list"""
+
+        UserShoppingCart.objects.bulk_create(
+            [UserShoppingCart(user=self.user, recipe=self.soup)]
+        )
+        self.assertEqual(self.download(), {'Соль': 5})
+        self.assertEqual(self.download(), {'Соль': 5})
+
+        UserShoppingCart.objects.bulk_create(
+            [UserShoppingCart(user=self.user, recipe=self.cake)]
+        )
+        self.assertEqual(self.download(), {'Сахар': 100, 'Соль': 6})
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {UserShoppingCart._meta.db_table} '
+                'WHERE recipe_id = %s',
+                [self.soup.id]
+            )
+        self.assertEqual(self.download(), {'Сахар': 100, 'Соль': 1})
+
+    def test_recipe_ingredients_changed(self):
+        """Changing the ingredients of a recipe in the cart changes the list"""
+
+        UserShoppingCart.objects.create(user=self.user, recipe=self.soup)
+        self.assertEqual(self.download(), {'Соль': 5})
+
+        RecipeIngredient.objects.create(
+            recipe=self.soup, ingredient=self.sugar, amount=7
+        )
+        self.assertEqual(self.download(), {'Сахар': 7, 'Соль': 5})
@@ -1,29 +1,69 @@
+import json
+from copy import copy
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import check_password
-from django.http import HttpResponse
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import (
+    BooleanField,
+    Exists,
+    OuterRef,
+    Prefetch,
+    Value
+)
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 
-from rest_framework import status, viewsets
+from rest_framework import mixins, status, viewsets
 from rest_framework.authtoken.models import Token
 from rest_framework.exceptions import NotFound
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from foodgram.mixins import AsyncReadMixin
 from foodgram.models import Recipe
+from foodgram.paginations import RecipePageNumberPagination
+from foodgram.utils.relations import (
+    add_relation,
+    add_relations,
+    delete_relation,
+    delete_relations
+)
+from foodgram.utils.shopping_cart import (
+    SHOPPING_CART_GENERATORS,
+    acache_shopping_cart_content,
+    cache_shopping_cart_content,
+    get_shopping_cart_cache_key,
+    get_shopping_cart_ingredients
+)
 from users.models import Subscription, UserFavorite, UserShoppingCart
+from users.passwords import acheck_password
+from users.renderers import (
+    ShoppingCartCSVRenderer,
+    ShoppingCartJSONRenderer,
+    ShoppingCartPDFRenderer,
+    ShoppingCartTextRenderer
+)
 from users.serializers import (
     ChangeUserPasswordSerializer,
     CreateUserTokenSerializer,
+    RecipeIdsSerializer,
     SubscriptionSerializer,
     UserGetSerializer,
     UserCreateSerializer
 )
+from utils.async_views import render_json
+from utils.validators import positive_integer_query_param
 
 
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(AsyncReadMixin, viewsets.ModelViewSet):
     """
     Viewset for processing requests:
     a list of users GET /api/users/
@@ -33,6 +73,23 @@ class UserViewSet(viewsets.ModelViewSet):
 
     queryset = User.objects.all()
 
+    def get_queryset(self):
+        """
+        Method for getting users with the current user's subscription
+        annotated, so that serializing them makes no extra queries
+        """
+
+        user = self.request.user
+
+        if user.is_authenticated:
+            is_subscribed = Exists(
+                Subscription.objects.filter(user=user, author=OuterRef('pk'))
+            )
+        else:
+            is_subscribed = Value(False, output_field=BooleanField())
+
+        return self.queryset.annotate(is_subscribed=is_subscribed)
+
     def get_permissions(self):
         """Selecting a permissions depending on the request"""
 
@@ -58,54 +115,63 @@ class UserViewSet(viewsets.ModelViewSet):
         user.save()
 
 
-class CreateUserTokenView(APIView):
+@method_decorator(csrf_exempt, name='dispatch')
+class CreateUserTokenView(View):
     """
     View for processing requests:
     to get user token POST 'api/auth/token/login/'
+    The view is asynchronous: under ASGI the password hash is checked
+    in the bounded thread pool instead of the thread shared
+    by the synchronous views
     """
 
-    permission_classes = [AllowAny, ]
-
-    def post(self, request):
+    async def post(self, request):
         """" Method for getting and saving a token for a user"""
 
-        serializer = CreateUserTokenSerializer(data=request.data)
-
-        if serializer.is_valid():
-            validated_data = serializer.validated_data
-            password = validated_data['password']
-            email = validated_data['email']
-
+        if request.content_type == 'application/json':
             try:
-                user = User.objects.get(email=email)
-            except User.DoesNotExist:
-                return Response(
-                    {'message': 'Пользователь не найден'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-
-            if not check_password(password, user.password):
-                return Response(
-                    {'message': 'Неверный пароль'},
+                data = json.loads(request.body or b'{}')
+            except ValueError:
+                return JsonResponse(
+                    {'detail': 'Некорректный JSON'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+        else:
+            data = request.POST
 
-            try:
-                old_token = Token.objects.get(user=user)
-                if old_token:
-                    return Response(
-                        {'auth_token': old_token.key},
-                        status=status.HTTP_200_OK
-                    )
-            except Token.DoesNotExist:
-                token = Token.objects.create(user=user)
-                return Response(
-                    {'auth_token': token.key},
-                    status=status.HTTP_200_OK
-                )
-        return Response(
-            serializer.errors,
-            status=status.HTTP_400_BAD_REQUEST
+        serializer = CreateUserTokenSerializer(data=data)
+
+        if not serializer.is_valid():
+            return JsonResponse(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        validated_data = serializer.validated_data
+
+        try:
+            user = await User.objects.only('id', 'password').aget(
+                email=validated_data['email']
+            )
+        except User.DoesNotExist:
+            return JsonResponse(
+                {'message': 'Пользователь не найден'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        if not await acheck_password(
+            validated_data['password'], user.password
+        ):
+            return JsonResponse(
+                {'message': 'Неверный пароль'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        token, _ = await Token.objects.aget_or_create(user=user)
+
+        return JsonResponse(
+            {'auth_token': token.key},
+            status=status.HTTP_200_OK
         )
 
 
@@ -178,6 +244,14 @@ class UserMeAPIView(APIView):
         serializer = UserGetSerializer(user, context={'request': request})
         return Response(serializer.data)
 
+    async def aget(self, request):
+        """Method for getting the current user in the async views"""
+
+        user = copy(request.user)
+        user.is_subscribed = False
+        serializer = UserGetSerializer(user, context={'request': request})
+        return render_json(serializer.data)
+
 
 class FavoriteView(APIView):
     """
@@ -189,43 +263,37 @@ class FavoriteView(APIView):
     def post(self, request, id):
         """Method adds recipe in favorite"""
 
-        try:
-            recipe = Recipe.objects.get(id=id)
-        except Recipe.DoesNotExist:
-            raise NotFound(detail='Рецепт не найден')
+        recipe_exists, added = add_relation(
+            UserFavorite, 'recipe', 'favorites_count', request.user.id, id
+        )
 
-        user = self.request.user
+        if not recipe_exists:
+            raise NotFound(detail='Рецепт не найден')
 
-        try:
-            UserFavorite.objects.get(recipe=recipe, user=user)
+        if not added:
             return Response(
                 {'message': 'Рецепт уже в избранном'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        except UserFavorite.DoesNotExist:
-            UserFavorite.objects.create(recipe=recipe, user=user)
 
-            return Response(
-                {'message': 'Рецепт успешно добавлен в избранное'},
-                status=status.HTTP_201_CREATED
-            )
+        return Response(
+            {'message': 'Рецепт успешно добавлен в избранное'},
+            status=status.HTTP_201_CREATED
+        )
 
     def delete(self, request, id):
         """Method deletes recipe from favorite"""
 
-        try:
-            recipe = Recipe.objects.get(id=id)
-        except Recipe.DoesNotExist:
-            raise NotFound(detail='Рецепт не найден')
+        recipe_exists, deleted = delete_relation(
+            UserFavorite, 'recipe', 'favorites_count', request.user.id, id
+        )
 
-        user = self.request.user
+        if not recipe_exists:
+            raise NotFound(detail='Рецепт не найден')
 
-        try:
-            favorite = UserFavorite.objects.get(recipe=recipe, user=user)
-        except UserFavorite.DoesNotExist:
+        if not deleted:
             raise NotFound(detail='Рецепт не найден в избранном')
 
-        favorite.delete()
         return Response(
             {'message': 'Рецепт успешно удален из избранного'},
             status=status.HTTP_204_NO_CONTENT
@@ -242,93 +310,216 @@ class AddDeleteRecipesShoppingCartView(APIView):
     def post(self, request, id):
         """Method adds recipe in shopping cart"""
 
-        try:
-            recipe = Recipe.objects.get(id=id)
-        except Recipe.DoesNotExist:
+        user = self.request.user
+        recipe_exists, added = add_relation(
+            UserShoppingCart, 'recipe', 'shopping_carts_count', user.id, id
+        )
+
+        if not recipe_exists:
             return Response(
                 {'message': 'Рецепт не найден'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        user = self.request.user
-
-        try:
-            UserShoppingCart.objects.get(recipe=recipe, user=user)
+        if not added:
             return Response(
                 {'message': 'Рецепт уже в избранном'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        except UserShoppingCart.DoesNotExist:
-            UserShoppingCart.objects.create(recipe=recipe, user=user)
 
-            return Response(
-                {'message': 'Рецепт успешно добавлен в избранное'},
-                status=status.HTTP_201_CREATED
-            )
+        return Response(
+            {'message': 'Рецепт успешно добавлен в избранное'},
+            status=status.HTTP_201_CREATED
+        )
 
     def delete(self, request, id):
         """Method deletes recipe from shopping cart"""
 
-        try:
-            recipe = Recipe.objects.get(id=id)
-        except Recipe.DoesNotExist:
-            raise NotFound(detail='Рецепт не найден')
-
         user = self.request.user
+        recipe_exists, deleted = delete_relation(
+            UserShoppingCart, 'recipe', 'shopping_carts_count', user.id, id
+        )
 
-        try:
-            shopping_cart = UserShoppingCart.objects.get(
-                recipe=recipe, user=user
-            )
-        except UserShoppingCart.DoesNotExist:
+        if not recipe_exists:
+            raise NotFound(detail='Рецепт не найден')
+
+        if not deleted:
             raise NotFound(detail='Рецепт не найден в корзине')
 
-        shopping_cart.delete()
         return Response(
             {'message': 'Рецепт успешно удален из корзины'},
             status=status.HTTP_204_NO_CONTENT
         )
 
 
+class BulkUserRecipeView(APIView):
+    """
+    Base view for adding and removing many recipes
+    of the user's list in one request,
+    every recipe id gets its own result
+    """
+
+    model = None
+    counter_field = None
+
+    def get_recipe_ids(self, request):
+        """Method for validating the list of recipe ids"""
+
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        return list(dict.fromkeys(serializer.validated_data['recipes']))
+
+    def get_response(self, recipe_ids, results, changed, unchanged):
+        """
+        Method for reporting every recipe id with the status
+        of the change made by this request, missing recipes are not_found
+        """
+
+        return Response({
+            'results': [
+                {
+                    'id': recipe_id,
+                    'status': (
+                        'not_found' if recipe_id not in results
+                        else changed if results[recipe_id]
+                        else unchanged
+                    )
+                }
+                for recipe_id in recipe_ids
+            ]
+        })
+
+    def post(self, request):
+        """Method adds recipes to the user's list"""
+
+        recipe_ids = self.get_recipe_ids(request)
+        results = add_relations(
+            self.model, 'recipe', self.counter_field,
+            request.user.id, recipe_ids
+        )
+
+        return self.get_response(recipe_ids, results, 'created', 'exists')
+
+    def delete(self, request):
+        """Method removes recipes from the user's list"""
+
+        recipe_ids = self.get_recipe_ids(request)
+        results = delete_relations(
+            self.model, 'recipe', self.counter_field,
+            request.user.id, recipe_ids
+        )
+
+        return self.get_response(
+            recipe_ids, results, 'deleted', 'not_found'
+        )
+
+
+class BulkFavoriteView(BulkUserRecipeView):
+    """
+    View for processing requests:
+    add recipes in favorite POST /api/recipes/favorite/
+    delete recipes from favorite DEL /api/recipes/favorite/
+    Request body: {"recipes": [1, 2, 3]}
+    """
+
+    model = UserFavorite
+    counter_field = 'favorites_count'
+
+
+class BulkShoppingCartView(BulkUserRecipeView):
+    """
+    View for processing requests:
+    add recipes in shopping cart POST /api/recipes/shopping_cart/
+    delete recipes from shopping cart DEL /api/recipes/shopping_cart/
+    Request body: {"recipes": [1, 2, 3]}
+    """
+
+    model = UserShoppingCart
+    counter_field = 'shopping_carts_count'
+
+
+class ClearShoppingCartView(APIView):
+    """
+    View for processing requests:
+    clear shopping cart DEL /api/recipes/shopping_cart/clear/
+    """
+
+    def delete(self, request):
+        """
+        Method deletes all recipes from the shopping cart,
+        the counters drop only for the rows deleted by this request
+        """
+
+        user = request.user
+        recipe_ids = list(
+            UserShoppingCart.objects.filter(user=user).values_list(
+                'recipe_id', flat=True
+            )
+        )
+
+        if recipe_ids:
+            delete_relations(
+                UserShoppingCart, 'recipe', 'shopping_carts_count',
+                user.id, recipe_ids
+            )
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class DownloadShoppingCartView(APIView):
     """
     View for processing requests:
     download shopping cart GET recipes/download_shopping_cart/
+    The format is selected by the format parameter
+    or the Accept header: txt, csv, json, pdf
     """
 
+    renderer_classes = [
+        ShoppingCartTextRenderer,
+        ShoppingCartCSVRenderer,
+        ShoppingCartJSONRenderer,
+        ShoppingCartPDFRenderer,
+    ]
+
     def get(self, request):
         """
         Method for generating and sending
-        a text file with a list of recipes
+        a file with the summed up ingredients
+        of the recipes in the shopping cart.
+        The file is streamed with an async iterator under ASGI
+        and a sync one under WSGI, so neither server buffers it,
+        and cached until the shopping cart changes
         """
 
-        user = request.user
-        shopping_list = UserShoppingCart.objects.filter(user=user)
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
 
-        shopping_cart_content = ""
+        if renderer.format != 'pdf':
+            content_type += f'; charset={renderer.charset}'
 
-        for recipe_cart in shopping_list:
-            recipe = recipe_cart.recipe
-            shopping_cart_content += f'Recipe: {recipe.name}\n'
-            shopping_cart_content += 'Ingredients:\n'
-
-            for recipe_ingredient in recipe.recipeingredient_set.all():
-                ingredient = recipe_ingredient.ingredient
-                shopping_cart_content += (
-                    f' - {ingredient.name} {recipe_ingredient.amount}'
-                    f'{ingredient.measurement_unit}\n'
-                )
-
-            shopping_cart_content += (
-                f'Cooking Time: {recipe.cooking_time} minutes\n'
+        cache_key = get_shopping_cart_cache_key(
+            request.user.id, renderer.format
+        )
+        content = cache.get(cache_key)
+
+        if content is None:
+            ingredients = get_shopping_cart_ingredients(request.user)
+            chunks = SHOPPING_CART_GENERATORS[renderer.format](ingredients)
+            stream = (
+                acache_shopping_cart_content
+                if isinstance(request._request, ASGIRequest)
+                else cache_shopping_cart_content
+            )
+            response = StreamingHttpResponse(
+                stream(chunks, cache_key), content_type=content_type
             )
-            shopping_cart_content += f'Description: {recipe.text}\n\n'
+        else:
+            response = HttpResponse(content, content_type=content_type)
 
-        response = HttpResponse(content_type='text/plain')
         response['Content-Disposition'] = (
-            'attachment; filename="shopping_cart.txt"'
+            f'attachment; filename="shopping_cart.{renderer.format}"'
         )
-        response.write(shopping_cart_content)
         return response
 
 
@@ -342,72 +533,89 @@ class AddDeleteUserSubscribeView(APIView):
     def post(self, request, id):
         """Method adds a subscription to the author"""
 
-        try:
-            author = User.objects.get(id=id)
-        except User.DoesNotExist:
+        user = self.request.user
+        recipes_limit = positive_integer_query_param(request, 'recipes_limit')
+
+        if id == user.id:
             return Response(
-                {'message': 'Автор не найден'},
-                status=status.HTTP_404_NOT_FOUND
+                {'message': 'Невозможно подписаться на самого себя'},
+                status=status.HTTP_400_BAD_REQUEST
             )
 
-        seralizer = SubscriptionSerializer(
-            author, context={'request': request}
+        author_exists, added = add_relation(
+            Subscription, 'author', 'subscribers_count', user.id, id
         )
-        user = self.request.user
 
-        if author == user:
+        if not author_exists:
             return Response(
-                {'message': 'Невозможно подписаться на самого себя'},
-                status=status.HTTP_400_BAD_REQUEST
+                {'message': 'Автор не найден'},
+                status=status.HTTP_404_NOT_FOUND
             )
 
-        try:
-            Subscription.objects.get(author=author, user=user)
+        if not added:
             return Response(
                 {'message': 'Вы уже подписаны на автора'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        except Subscription.DoesNotExist:
-            Subscription.objects.create(author=author, user=user)
 
-            return Response(seralizer.data)
+        seralizer = SubscriptionSerializer(
+            User.objects.annotate(
+                is_subscribed=Value(True, output_field=BooleanField())
+            ).get(id=id),
+            context={'request': request, 'recipes_limit': recipes_limit}
+        )
+
+        return Response(seralizer.data)
 
     def delete(self, request, id):
         """Method delete a subscription to the author"""
 
-        try:
-            author = User.objects.get(id=id)
-        except User.DoesNotExist:
-            raise NotFound(detail='Автор не найден')
+        author_exists, deleted = delete_relation(
+            Subscription, 'author', 'subscribers_count', request.user.id, id
+        )
 
-        user = self.request.user
+        if not author_exists:
+            raise NotFound(detail='Автор не найден')
 
-        try:
-            subscription = Subscription.objects.get(
-                author=author, user=user
-            )
-        except Subscription.DoesNotExist:
+        if not deleted:
             raise NotFound(detail='Вы ещё не подписаны на этого автора')
 
-        subscription.delete()
         return Response(
             {'message': 'Вы больше не подписаны на этого автора'},
             status=status.HTTP_204_NO_CONTENT
         )
 
 
-class SubscriptionViewSet(viewsets.ModelViewSet):
+class SubscriptionViewSet(
+    AsyncReadMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
     """
     Viewset for processing requests:
     a list of Subscriptions GET /api/users/subscriptions/
     """
 
     serializer_class = SubscriptionSerializer
+    pagination_class = RecipePageNumberPagination
 
     def get_queryset(self):
-        """Method for getting user's subscriptions"""
+        """
+        Method for getting the authors the user is subscribed to
+        with their latest recipes,
+        limited by the recipes_limit parameter
+        """
 
-        user = self.request.user
-        queryset = user.subscriptions_follower.all()
-        queryset = [subscription.author for subscription in queryset]
-        return queryset
+        recipes = Recipe.objects.order_by('-id')
+        recipes_limit = positive_integer_query_param(
+            self.request, 'recipes_limit'
+        )
+
+        if recipes_limit:
+            recipes = recipes[:recipes_limit]
+
+        return User.objects.filter(
+            subscriptions_following__user=self.request.user
+        ).annotate(
+            is_subscribed=Value(True, output_field=BooleanField())
+        ).prefetch_related(
+            Prefetch('recipe_set', queryset=recipes, to_attr='limited_recipes')
+        ).order_by('username', 'id')
@@ -0,0 +1,187 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.paginator import InvalidPage
+from django.http import HttpResponse
+from django.utils.cache import cc_delim_re, patch_vary_headers
+
+from rest_framework import exceptions
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+
+from utils.metrics import serialization_timer
+
+ASYNC_ACTIONS = {'list': 'alist', 'retrieve': 'aretrieve', 'get': 'aget'}
+
+
+def render_json(data, status=200):
+    """Rendering the data the same way as the DRF json renderer"""
+
+    with serialization_timer():
+        content = JSONRenderer().render(data)
+
+    return HttpResponse(
+        content, content_type='application/json', status=status
+    )
+
+
+def accepts_json(request):
+    """
+    Checking if the request can be answered by the async view,
+    the browsable API and the format suffixes stay with DRF
+    """
+
+    return (
+        'format' not in request.GET
+        and 'text/html' not in request.META.get('HTTP_ACCEPT', '')
+    )
+
+
+async def apaginate_queryset(paginator, queryset, request, view):
+    """
+    Getting the page of the queryset with the async ORM,
+    the page number paginator gets the count and the page
+    without blocking the event loop
+    """
+
+    if not isinstance(paginator, PageNumberPagination):
+        return await sync_to_async(paginator.paginate_queryset)(
+            queryset, request, view=view
+        )
+
+    page_size = paginator.get_page_size(request)
+    django_paginator = paginator.django_paginator_class(queryset, page_size)
+    django_paginator.count = await queryset.acount()
+    page_number = paginator.get_page_number(request, django_paginator)
+
+    try:
+        page = django_paginator.page(page_number)
+    except InvalidPage as error:
+        raise exceptions.NotFound(
+            paginator.invalid_page_message.format(
+                page_number=page_number, message=str(error)
+            )
+        )
+
+    page.object_list = [obj async for obj in page.object_list]
+    paginator.page = page
+    paginator.request = request
+
+    return list(page)
+
+
+async def aauthenticate(request):
+    """
+    Authenticating the request with the authenticators of the view,
+    the ones without the async method run in a thread
+    """
+
+    for authenticator in request.authenticators:
+        try:
+            if hasattr(authenticator, 'aauthenticate'):
+                credentials = await authenticator.aauthenticate(request)
+            else:
+                credentials = await sync_to_async(
+                    authenticator.authenticate
+                )(request)
+        except exceptions.APIException:
+            request.user, request.auth = AnonymousUser(), None
+            raise
+
+        if credentials is not None:
+            return credentials
+
+    return AnonymousUser(), None
+
+
+def exception_response(view, error):
+    """
+    Answering the error like APIView.handle_exception does,
+    the response is rendered to json with the headers it got
+    """
+
+    response = view.handle_exception(error)
+    async_response = render_json(response.data, response.status_code)
+
+    for header, value in response.items():
+        if header != 'Content-Type':
+            async_response[header] = value
+
+    return async_response
+
+
+def finalize_response(view, response):
+    """Adding the headers of the view like APIView.finalize_response"""
+
+    headers = dict(view.headers)
+    vary_headers = headers.pop('Vary', None)
+
+    if vary_headers is not None:
+        patch_vary_headers(response, cc_delim_re.split(vary_headers))
+
+    for header, value in headers.items():
+        response[header] = value
+
+    return response
+
+
+async def run_async_action(view_class, actions, request, args, kwargs):
+    """
+    Running the async handler of the DRF view: the request is
+    authenticated with the async ORM, then APIView.initial checks
+    the permissions and throttles and negotiates the content.
+    Errors and headers are handled like in APIView.dispatch
+    """
+
+    view = view_class()
+    action = actions['get'] if actions else 'get'
+
+    if actions:
+        view.action_map = actions
+
+        for method, handler in actions.items():
+            setattr(view, method, getattr(view, handler))
+
+    if hasattr(view, 'get') and not hasattr(view, 'head'):
+        view.head = view.get
+
+    view.action = action
+    view.args = args
+    view.kwargs = kwargs
+    view.format_kwarg = None
+    drf_request = view.initialize_request(request, *args, **kwargs)
+    view.request = drf_request
+    view.headers = view.default_response_headers
+
+    try:
+        drf_request.user, drf_request.auth = await aauthenticate(drf_request)
+        await sync_to_async(view.initial)(drf_request, *args, **kwargs)
+        response = await getattr(view, ASYNC_ACTIONS[action])(
+            drf_request, *args, **kwargs
+        )
+    except Exception as error:
+        response = exception_response(view, error)
+
+    return finalize_response(view, response)
+
+
+def async_read_view(view_class, actions=None):
+    """
+    View answering GET requests with the async handler of the view class
+    (alist, aretrieve or aget) and other requests with the DRF view
+    """
+
+    sync_view = (
+        view_class.as_view(actions) if actions else view_class.as_view()
+    )
+
+    async def view(request, *args, **kwargs):
+        if request.method == 'GET' and accepts_json(request):
+            return await run_async_action(
+                view_class, actions, request, args, kwargs
+            )
+
+        return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+
+    return view
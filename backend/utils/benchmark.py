@@ -0,0 +1,195 @@
+import json
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.test import Client
+
+PERCENTILES = (50, 95, 99)
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+HIGHER_IS_BETTER_METRICS = ('throughput_rps',)
+
+
+def open_request(url, method='GET', data=None, headers=None):
+    """
+    Sending the HTTP request,
+    returns the status code, the headers and the body
+    """
+
+    body = None
+    headers = dict(headers or {})
+
+    if data is not None:
+        body = json.dumps(data).encode()
+        headers['Content-Type'] = 'application/json'
+
+    request = urllib.request.Request(
+        url, data=body, headers=headers, method=method
+    )
+
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.headers, error.read()
+
+
+def send_request(url, method='GET', data=None, headers=None):
+    """Sending the HTTP request, returns the status code and the body"""
+
+    status_code, _, body = open_request(url, method, data, headers)
+
+    return status_code, body
+
+
+class HTTPBenchmarkClient:
+    """Client sending the benchmark requests to a running server"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, data=None, headers=None):
+        """Sending the request, returns the status, headers and body"""
+
+        return open_request(self.base_url + path, method, data, headers)
+
+
+class InProcessBenchmarkClient:
+    """
+    Client calling the application in the current process
+    through the Django test client, every middleware is applied.
+    Every thread gets its own test client
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        host = next(
+            (
+                host.lstrip('.') for host in settings.ALLOWED_HOSTS
+                if host != '*'
+            ),
+            'localhost'
+        )
+        self.server_name = host
+
+    def request(self, method, path, data=None, headers=None):
+        """Calling the application, returns the status, headers and body"""
+
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client(
+                raise_request_exception=False, SERVER_NAME=self.server_name
+            )
+
+        response = self.local.client.generic(
+            method,
+            path,
+            json.dumps(data) if data is not None else '',
+            content_type='application/json',
+            headers=headers
+        )
+
+        return response.status_code, response.headers, response.getvalue()
+
+
+def get_query_count(headers):
+    """Getting the number of sql queries from the Server-Timing header"""
+
+    match = SERVER_TIMING_QUERIES.search(headers.get('Server-Timing') or '')
+
+    return int(match.group(1)) if match else None
+
+
+def percentile(values, percent):
+    """Getting the percentile of the sorted values"""
+
+    if not values:
+        return None
+
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+
+    return values[index]
+
+
+def run_concurrently(func, total, concurrency):
+    """
+    Calling the function total times from concurrency threads,
+    returns the latencies in milliseconds, the status codes
+    and the elapsed time in seconds
+    """
+
+    def timed_call(_):
+        started_at = time.perf_counter()
+        status_code = func()
+
+        return (time.perf_counter() - started_at) * 1000, status_code
+
+    started_at = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed_call, range(total)))
+
+    elapsed = time.perf_counter() - started_at
+
+    return (
+        [latency for latency, _ in results],
+        [status_code for _, status_code in results],
+        elapsed
+    )
+
+
+def summarize(latencies, status_codes, elapsed):
+    """Getting the latency percentiles, throughput and errors"""
+
+    latencies = sorted(latencies)
+    summary = {
+        f'p{percent}_ms': round(percentile(latencies, percent), 2)
+        if latencies else None
+        for percent in PERCENTILES
+    }
+    summary['requests'] = len(latencies)
+    summary['errors'] = sum(
+        1 for status_code in status_codes if status_code >= 400
+    )
+    summary['throughput_rps'] = (
+        round(len(latencies) / elapsed, 2) if elapsed else None
+    )
+
+    return summary
+
+
+def find_regressions(baseline, results, metric, threshold, names=None):
+    """
+    Comparing the results of the endpoints with the baseline,
+    returns the endpoints whose metric got worse by more than
+    the threshold percent
+    """
+
+    regressions = {}
+
+    for name in names or baseline:
+        if name not in baseline or name not in results:
+            continue
+
+        before = baseline[name].get(metric)
+        after = results[name].get(metric)
+
+        if not before or after is None:
+            continue
+
+        change = (after - before) / before * 100
+
+        if metric in HIGHER_IS_BETTER_METRICS:
+            change = -change
+
+        if change > threshold:
+            regressions[name] = {
+                'baseline': before,
+                'current': after,
+                'change_percent': round(change, 2),
+            }
+
+    return regressions
@@ -0,0 +1,191 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+UNMATCHED_ROUTE = 'unmatched'
+REQUEST_LABELS = ('method', 'route')
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+request_metrics = ContextVar('request_metrics', default=None)
+
+REQUESTS_TOTAL = Counter(
+    'foodgram_http_requests_total',
+    'Number of the handled requests',
+    REQUEST_LABELS + ('status',)
+)
+REQUEST_DURATION = Histogram(
+    'foodgram_http_request_duration_seconds',
+    'Total time of the request handling',
+    REQUEST_LABELS
+)
+SQL_DURATION = Histogram(
+    'foodgram_sql_duration_seconds',
+    'Time of the sql queries made by the request',
+    REQUEST_LABELS
+)
+SQL_QUERIES = Histogram(
+    'foodgram_sql_queries',
+    'Number of the sql queries made by the request',
+    REQUEST_LABELS,
+    buckets=QUERY_COUNT_BUCKETS
+)
+SERIALIZATION_DURATION = Histogram(
+    'foodgram_serialization_duration_seconds',
+    'Time of rendering the response body',
+    REQUEST_LABELS
+)
+
+
+class RequestMetrics:
+    """
+    Timings of the current request, shared through the context
+    with the threads that run the sync code of the async views
+    """
+
+    def __init__(self):
+        """Starting the request timer"""
+
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serialization_time = 0.0
+
+    @property
+    def total_time(self):
+        """Time since the request was started"""
+
+        return time.perf_counter() - self.started
+
+    def get_server_timing(self):
+        """Getting the value of the Server-Timing header"""
+
+        return ', '.join((
+            f'sql;dur={self.sql_time * 1000:.1f};'
+            f'desc="{self.sql_count} queries"',
+            f'serialization;dur={self.serialization_time * 1000:.1f}',
+            f'total;dur={self.total_time * 1000:.1f}',
+        ))
+
+    def observe(self, method, route, status):
+        """Adding the request timings to the histograms"""
+
+        labels = {'method': method, 'route': route}
+
+        REQUESTS_TOTAL.labels(status=str(status), **labels).inc()
+        REQUEST_DURATION.labels(**labels).observe(self.total_time)
+        SQL_DURATION.labels(**labels).observe(self.sql_time)
+        SQL_QUERIES.labels(**labels).observe(self.sql_count)
+        SERIALIZATION_DURATION.labels(**labels).observe(
+            self.serialization_time
+        )
+
+
+def record_sql(execute, sql, params, many, context):
+    """Database execute wrapper counting the queries of the request"""
+
+    metrics = request_metrics.get()
+
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.sql_count += 1
+        metrics.sql_time += time.perf_counter() - started
+
+
+def install_sql_recorder(sender, connection, **kwargs):
+    """Adding the execute wrapper to every new database connection"""
+
+    if record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_sql)
+
+
+def install_sql_recorders():
+    """
+    Adding the execute wrapper to the connections opened
+    before the metrics were loaded, new ones get it on creation
+    """
+
+    for connection in connections.all(initialized_only=True):
+        install_sql_recorder(None, connection)
+
+    connection_created.connect(install_sql_recorder)
+
+
+@contextmanager
+def serialization_timer():
+    """Adding the time of the block to the request serialization time"""
+
+    metrics = request_metrics.get()
+    started = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.serialization_time += time.perf_counter() - started
+
+
+def get_route(request):
+    """Getting the url pattern of the request to use as a label"""
+
+    match = getattr(request, 'resolver_match', None)
+
+    if match is None or not match.route:
+        return UNMATCHED_ROUTE
+
+    return '/' + match.route
+
+
+def get_registry():
+    """
+    Getting the registry to export, with PROMETHEUS_MULTIPROC_DIR set
+    the metrics of all the gunicorn workers are read from the directory
+    """
+
+    if not os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """
+    Exporting the metrics in the Prometheus text format
+    to the clients sending the METRICS_TOKEN as the bearer token,
+    nobody gets them while the token is not set
+    """
+
+    token = settings.METRICS_TOKEN
+
+    if not token or not constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {token}'
+    ):
+        return HttpResponse(status=401)
+
+    return HttpResponse(
+        generate_latest(get_registry()),
+        content_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,81 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from utils.metrics import (
+    RequestMetrics,
+    get_route,
+    install_sql_recorders,
+    request_metrics
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Middleware measuring the sql queries, serialization and total time
+    of every request, the timings are returned in the Server-Timing
+    header and collected into the histograms of the metrics endpoint
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Saving the next handler, async if the handler is async"""
+
+        self.get_response = get_response
+        install_sql_recorders()
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Handling the request with the sync handler"""
+
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = request_metrics.set(metrics)
+
+        try:
+            response = self.get_response(request)
+        finally:
+            request_metrics.reset(token)
+
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        """Handling the request with the async handler"""
+
+        metrics = RequestMetrics()
+        token = request_metrics.set(metrics)
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_metrics.reset(token)
+
+        return self.finish(request, response, metrics)
+
+    def process_template_response(self, request, response):
+        """Measuring the rendering of the DRF responses"""
+
+        metrics = request_metrics.get()
+
+        if metrics is not None:
+            started = metrics.total_time
+
+            def stop_timer(response):
+                metrics.serialization_time += metrics.total_time - started
+
+            response.add_post_render_callback(stop_timer)
+
+        return response
+
+    def finish(self, request, response, metrics):
+        """Adding the Server-Timing header and observing the request"""
+
+        response['Server-Timing'] = metrics.get_server_timing()
+        metrics.observe(
+            request.method, get_route(request), response.status_code
+        )
+        return response
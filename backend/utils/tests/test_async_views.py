@@ -0,0 +1,131 @@
+import asyncio
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.throttling import AnonRateThrottle
+
+from foodgram.tests.factories import create_recipe, create_tag, create_user
+from foodgram.views import TagViewSet
+
+TAGS_URL = '/api/tags/'
+RECIPES_URL = '/api/recipes/'
+USER_ME_URL = '/api/users/me/'
+
+
+def on_event_loop():
+    """Checking if the code runs in the thread of the event loop"""
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+
+    return True
+
+
+class OneRequestThrottle(AnonRateThrottle):
+    """Throttle letting one anonymous request a minute through"""
+
+    rate = '1/min'
+
+
+class AsyncReadViewTests(TestCase):
+    """
+    GET requests answered by the async handlers go through
+    APIView.initial and get the same answers as the DRF views
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        cls.token = Token.objects.create(user=cls.user)
+        tag = create_tag('breakfast')
+        create_recipe(cls.user, name='Блины', tags=[tag])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_same_as_sync(self):
+        """The async and the DRF views return the same data and headers"""
+
+        for url in (TAGS_URL, RECIPES_URL, USER_ME_URL):
+            with self.subTest(url=url):
+                headers = {
+                    'HTTP_AUTHORIZATION': f'Token {self.token.key}'
+                }
+                async_response = self.client.get(url, **headers)
+                sync_response = self.client.get(
+                    url, {'format': 'json'}, **headers
+                )
+
+                self.assertEqual(async_response.status_code, 200)
+                self.assertEqual(
+                    async_response.json(), sync_response.json()
+                )
+
+                self.assertEqual(
+                    async_response['Allow'], sync_response['Allow']
+                )
+                self.assertLessEqual(
+                    set(sync_response['Vary'].split(', ')),
+                    set(async_response['Vary'].split(', '))
+                )
+
+    def test_not_acceptable(self):
+        """The content is negotiated before the handler runs"""
+
+        response = self.client.get(TAGS_URL, HTTP_ACCEPT='application/xml')
+
+        self.assertEqual(response.status_code, 406)
+
+    def test_throttled(self):
+        """The throttles of the view are checked"""
+
+        with mock.patch.object(
+            TagViewSet, 'throttle_classes', [OneRequestThrottle]
+        ):
+            self.assertEqual(self.client.get(TAGS_URL).status_code, 200)
+            response = self.client.get(TAGS_URL)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_authentication_errors(self):
+        """Authentication errors carry the WWW-Authenticate header"""
+
+        response = self.client.get(USER_ME_URL)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+        response = self.client.get(
+            USER_ME_URL, HTTP_AUTHORIZATION='Token invalid'
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+    def test_cache_off_event_loop(self):
+        """The cache is never queried by blocking calls on the event loop"""
+
+        blocking_calls = []
+
+        def watch(name):
+            method = getattr(LocMemCache, name)
+
+            def watched(*args, **kwargs):
+                if on_event_loop():
+                    blocking_calls.append(name)
+                return method(*args, **kwargs)
+
+            return mock.patch.object(LocMemCache, name, watched)
+
+        with watch('get'), watch('get_many'), watch('set'), watch('add'):
+            for url in (TAGS_URL, USER_ME_URL, USER_ME_URL):
+                response = self.client.get(
+                    url, HTTP_AUTHORIZATION=f'Token {self.token.key}'
+                )
+                self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(blocking_calls, [])
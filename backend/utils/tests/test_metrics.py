@@ -0,0 +1,37 @@
+from django.test import TestCase, override_settings
+
+METRICS_URL = '/api/metrics/'
+
+
+class MetricsViewTests(TestCase):
+    """The metrics are only exported to the holders of METRICS_TOKEN"""
+
+    @override_settings(METRICS_TOKEN='')
+    def test_denied_without_token(self):
+        """Nobody gets the metrics while the token is not set"""
+
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 401)
+        self.assertEqual(
+            self.client.get(
+                METRICS_URL, HTTP_AUTHORIZATION='Bearer '
+            ).status_code,
+            401
+        )
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_bearer_token(self):
+        """The metrics are exported for the right bearer token only"""
+
+        for authorization in ('', 'Bearer wrong', 'Token secret'):
+            with self.subTest(authorization=authorization):
+                response = self.client.get(
+                    METRICS_URL, HTTP_AUTHORIZATION=authorization
+                )
+                self.assertEqual(response.status_code, 401)
+
+        response = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION='Bearer secret'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'http_request', response.content)
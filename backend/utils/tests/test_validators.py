@@ -0,0 +1,63 @@
+from django.test import SimpleTestCase, TestCase
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from foodgram.tests.factories import create_user
+from utils.validators import (
+    positive_integer_list_query_param,
+    positive_integer_query_param
+)
+
+INVALID_INTEGERS = ('0', '-1', '1.5', 'abc', '²', '٣', '１')
+
+
+def get_request(query):
+    """Building the DRF request with the query string"""
+
+    return Request(APIRequestFactory().get(f'/?{query}'))
+
+
+class PositiveIntegerQueryParamTests(SimpleTestCase):
+    """Only positive integers of ascii digits are accepted"""
+
+    def test_valid(self):
+        """The missing parameter is None, integers are parsed"""
+
+        self.assertIsNone(positive_integer_query_param(get_request(''), 'a'))
+        self.assertEqual(
+            positive_integer_query_param(get_request('a=12'), 'a'), 12
+        )
+        self.assertEqual(
+            positive_integer_list_query_param(
+                get_request('a=1,2&a=3'), 'a'
+            ),
+            [1, 2, 3]
+        )
+
+    def test_invalid(self):
+        """Anything else is a validation error, never a ValueError"""
+
+        for value in INVALID_INTEGERS:
+            with self.subTest(value=value):
+                request = Request(APIRequestFactory().get('/', {'a': value}))
+
+                with self.assertRaises(serializers.ValidationError):
+                    positive_integer_query_param(request, 'a')
+
+                with self.assertRaises(serializers.ValidationError):
+                    positive_integer_list_query_param(request, 'a')
+
+
+class RecipesLimitTests(TestCase):
+    """Invalid recipes_limit of the subscriptions is answered with 400"""
+
+    def test_unicode_digit(self):
+        client = APIClient()
+        client.force_authenticate(create_user('reader'))
+
+        response = client.get(
+            '/api/users/subscriptions/', {'recipes_limit': '²'}
+        )
+
+        self.assertEqual(response.status_code, 400)
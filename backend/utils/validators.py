@@ -2,6 +2,11 @@ from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 
 import webcolors
+from rest_framework import serializers
+
+POSITIVE_INTEGER_ERROR_MESSAGE = (
+    'Можно ввести только целое, положительное число'
+)
 
 
 def password_slug_username_validation(value):
@@ -29,3 +34,52 @@ def hex_name_color_validator(value):
         raise ValidationError(
             'Цвета с таким кодом нет в базе данных.'
         ) from error
+
+
+def is_positive_integer(value):
+    """
+    Checking that the string is a positive integer of ascii digits,
+    other unicode digits like '²' are not accepted by int
+    """
+
+    return value.isascii() and value.isdigit() and int(value) > 0
+
+
+def positive_integer_query_param(request, name):
+    """
+    Getting an optional positive integer query parameter,
+    None if the parameter is not passed
+    """
+
+    value = request.query_params.get(name)
+
+    if not value:
+        return None
+
+    if not is_positive_integer(value):
+        raise serializers.ValidationError(
+            {name: POSITIVE_INTEGER_ERROR_MESSAGE}
+        )
+
+    return int(value)
+
+
+def positive_integer_list_query_param(request, name):
+    """
+    Getting a list of positive integers passed as repeated
+    or comma separated query parameters
+    """
+
+    values = [
+        value.strip()
+        for param in request.query_params.getlist(name)
+        for value in param.split(',')
+        if value.strip()
+    ]
+
+    if not all(is_positive_integer(value) for value in values):
+        raise serializers.ValidationError(
+            {name: POSITIVE_INTEGER_ERROR_MESSAGE}
+        )
+
+    return [int(value) for value in values]